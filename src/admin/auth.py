@@ -36,7 +36,7 @@ class AdminAuth(AuthenticationBackend):
                 detail="Could not validate user.",
             )
 
-        password_valid = verify_password(password, user.password)
+        password_valid = await verify_password(password, user.password)
         if password_valid:
             if user.is_superuser:
                 token = create_access_token(
@@ -1,5 +1,11 @@
+from typing import Any
+
 from sqladmin import ModelView
+from starlette.requests import Request
 
+from api.exams.cache import exam_cache
+from api.exams.scheduler import exam_scheduler
+from core.database.db import async_session_maker
 from core.database.models import (
     Answer,
     Exam,
@@ -9,6 +15,7 @@ from core.database.models import (
     Question,
     TextQuestion,
 )
+from core.database.repositories import QuestionRepository
 
 
 class ExamAdmin(ModelView, model=Exam):
@@ -32,6 +39,16 @@ class ExamAdmin(ModelView, model=Exam):
     name_plural = "Экзамены"
     icon = "fa-solid fa-pen"
 
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await exam_cache.invalidate(model.id)
+        await exam_scheduler.schedule(model)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await exam_cache.invalidate(model.id)
+        await exam_scheduler.unschedule(model.id)
+
 
 class ChoiseQuestionAdmin(ModelView, model=Question):
     column_list = [
@@ -46,6 +63,14 @@ class ChoiseQuestionAdmin(ModelView, model=Question):
     name_plural = "Вопросы"
     icon = "fa-solid fa-circle-question"
 
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await exam_cache.invalidate(model.exam_id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await exam_cache.invalidate(model.exam_id)
+
 
 class TextQuestionAdmin(ModelView, model=TextQuestion):
     column_list = [
@@ -60,6 +85,14 @@ class TextQuestionAdmin(ModelView, model=TextQuestion):
     name_plural = "Текстовые вопросы"
     icon = "fa-solid fa-circle-question"
 
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await exam_cache.invalidate(model.exam_id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await exam_cache.invalidate(model.exam_id)
+
 
 class AnswerAdmin(ModelView, model=Answer):
     column_list = [
@@ -73,6 +106,21 @@ class AnswerAdmin(ModelView, model=Answer):
     name_plural = "Ответы"
     icon = "fa fa-check-circle"
 
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await self.invalidate_exam(model)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await self.invalidate_exam(model)
+
+    @staticmethod
+    async def invalidate_exam(answer: Answer) -> None:
+        async with async_session_maker() as session:
+            exam_id = await QuestionRepository(session).get_exam_id(answer.question_id)
+        if exam_id is not None:
+            await exam_cache.invalidate(exam_id)
+
 
 class ResultAdmin(ModelView, model=ExamResult):
     column_list = [
@@ -1,5 +1,9 @@
+from typing import Any
+
 from sqladmin import ModelView
+from starlette.requests import Request
 
+from core.auth.cache import identity_cache
 from core.database.models import User
 
 
@@ -28,3 +32,11 @@ class UserAdmin(ModelView, model=User):
     name = "Пользователь"
     name_plural = "Пользователи"
     icon = "fa-solid fa-user"
+
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await identity_cache.invalidate(model.id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await identity_cache.invalidate(model.id)
@@ -0,0 +1,53 @@
+"""unique exam result per student
+
+Revision ID: 5c2e8d4a91b3
+Revises: 0a77acf7b77e
+Create Date: 2026-10-18 12:40:11.204816
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8d4a91b3"
+down_revision: Union[str, None] = "0a77acf7b77e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT exam_id, student_id, count(*) AS results
+                FROM examresults
+                GROUP BY exam_id, student_id
+                HAVING count(*) > 1
+                ORDER BY exam_id, student_id
+                """
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        conflicts = ", ".join(
+            f"exam_id={exam_id} student_id={student_id} ({results} results)"
+            for exam_id, student_id, results in duplicates
+        )
+        raise RuntimeError(
+            "Cannot add uq_exam_result_student: students have several results "
+            f"for the same exam. Resolve these rows first: {conflicts}"
+        )
+    op.create_unique_constraint(
+        "uq_exam_result_student", "examresults", ["exam_id", "student_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_exam_result_student", "examresults", type_="unique")
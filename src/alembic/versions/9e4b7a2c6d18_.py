@@ -0,0 +1,66 @@
+"""exam submission queue
+
+Revision ID: 9e4b7a2c6d18
+Revises: 5c2e8d4a91b3
+Create Date: 2026-10-18 14:05:52.630114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b7a2c6d18"
+down_revision: Union[str, None] = "5c2e8d4a91b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "examsubmissions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("exam_id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "status", sa.String(length=16), server_default="pending", nullable=False
+        ),
+        sa.Column("result_id", sa.Integer(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("graded_at", sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(["exam_id"], ["exams.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["result_id"], ["examresults.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("exam_id", "student_id", name="uq_exam_submission_student"),
+    )
+    op.create_index(
+        op.f("ix_examsubmissions_id"), "examsubmissions", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_examsubmissions_pending",
+        "examsubmissions",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_examsubmissions_pending",
+        table_name="examsubmissions",
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.drop_index(op.f("ix_examsubmissions_id"), table_name="examsubmissions")
+    op.drop_table("examsubmissions")
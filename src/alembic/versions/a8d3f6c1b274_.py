@@ -0,0 +1,32 @@
+"""notification retention index
+
+Revision ID: a8d3f6c1b274
+Revises: f41c8a7d2e95
+Create Date: 2026-10-18 20:41:07.518233
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6c1b274"
+down_revision: Union[str, None] = "f41c8a7d2e95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_created",
+        "notifications",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_created", table_name="notifications")
@@ -0,0 +1,39 @@
+"""chat history keyset indexes
+
+Revision ID: b5e19c7d3f82
+Revises: a8d3f6c1b274
+Create Date: 2026-10-18 21:26:54.902617
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e19c7d3f82"
+down_revision: Union[str, None] = "a8d3f6c1b274"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_groupmessages_group_created",
+        "groupmessages",
+        ["group_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_privatemessages_room_created",
+        "privatemessages",
+        ["room_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_privatemessages_room_created", table_name="privatemessages")
+    op.drop_index("ix_groupmessages_group_created", table_name="groupmessages")
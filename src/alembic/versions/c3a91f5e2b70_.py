@@ -0,0 +1,41 @@
+"""pending exam schedule indexes
+
+Revision ID: c3a91f5e2b70
+Revises: 9e4b7a2c6d18
+Create Date: 2026-10-18 15:31:47.118203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a91f5e2b70"
+down_revision: Union[str, None] = "9e4b7a2c6d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_exams_pending_start",
+        "exams",
+        ["start_time"],
+        unique=False,
+        postgresql_where=sa.text("is_started = false AND is_ended = false"),
+    )
+    op.create_index(
+        "ix_exams_pending_end",
+        "exams",
+        ["end_time"],
+        unique=False,
+        postgresql_where=sa.text("is_ended = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_exams_pending_end", table_name="exams")
+    op.drop_index("ix_exams_pending_start", table_name="exams")
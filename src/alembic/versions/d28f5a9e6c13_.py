@@ -0,0 +1,92 @@
+"""group read watermarks
+
+Revision ID: d28f5a9e6c13
+Revises: b5e19c7d3f82
+Create Date: 2026-10-18 22:03:18.264590
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d28f5a9e6c13"
+down_revision: Union[str, None] = "b5e19c7d3f82"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "groupreadmarks",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("last_read_message_id", sa.INTEGER(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "group_id"),
+    )
+    op.create_index(
+        "ix_groupreadmarks_group_read",
+        "groupreadmarks",
+        ["group_id", "last_read_message_id"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO groupreadmarks (user_id, group_id, last_read_message_id, updated_at)
+        SELECT checks.user_id, messages.group_id, MAX(checks.message_id),
+               MAX(checks.created_at)
+        FROM groupmessagechecks AS checks
+        JOIN groupmessages AS messages ON messages.id = checks.message_id
+        GROUP BY checks.user_id, messages.group_id
+        """
+    )
+    op.drop_index("ix_groupmessagechecks_id", table_name="groupmessagechecks")
+    op.drop_table("groupmessagechecks")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "groupmessagechecks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("message_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["message_id"], ["groupmessages.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "message_id", name="uq_user_message_check"),
+    )
+    op.create_index(
+        "ix_groupmessagechecks_id", "groupmessagechecks", ["id"], unique=False
+    )
+    op.execute(
+        """
+        INSERT INTO groupmessagechecks (user_id, message_id, created_at)
+        SELECT marks.user_id, messages.id, marks.updated_at
+        FROM groupreadmarks AS marks
+        JOIN groupmessages AS messages
+          ON messages.group_id = marks.group_id
+         AND messages.id <= marks.last_read_message_id
+         AND messages.sender_id != marks.user_id
+        """
+    )
+    op.drop_index("ix_groupreadmarks_group_read", table_name="groupreadmarks")
+    op.drop_table("groupreadmarks")
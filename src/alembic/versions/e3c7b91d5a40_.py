@@ -0,0 +1,30 @@
+"""exam submission attempts
+
+Revision ID: e3c7b91d5a40
+Revises: d28f5a9e6c13
+Create Date: 2026-10-18 23:10:42.771305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3c7b91d5a40"
+down_revision: Union[str, None] = "d28f5a9e6c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "examsubmissions",
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("examsubmissions", "attempts")
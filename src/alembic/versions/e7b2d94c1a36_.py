@@ -0,0 +1,57 @@
+"""coalesced conversation notifications
+
+Revision ID: e7b2d94c1a36
+Revises: c3a91f5e2b70
+Create Date: 2026-10-18 17:02:11.640285
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b2d94c1a36"
+down_revision: Union[str, None] = "c3a91f5e2b70"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notifications", sa.Column("conversation", sa.VARCHAR(length=32), nullable=True)
+    )
+    op.add_column(
+        "notifications",
+        sa.Column("message_count", sa.INTEGER(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "notifications", sa.Column("last_message_id", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "updated_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.add_column(
+        "notifications", sa.Column("emailed_at", sa.TIMESTAMP(), nullable=True)
+    )
+    op.create_index(
+        "uq_notifications_unread_conversation",
+        "notifications",
+        ["user_id", "conversation"],
+        unique=True,
+        postgresql_where=sa.text("is_read = false AND conversation IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_notifications_unread_conversation", table_name="notifications")
+    op.drop_column("notifications", "emailed_at")
+    op.drop_column("notifications", "updated_at")
+    op.drop_column("notifications", "last_message_id")
+    op.drop_column("notifications", "message_count")
+    op.drop_column("notifications", "conversation")
@@ -0,0 +1,40 @@
+"""notification inbox indexes
+
+Revision ID: f41c8a7d2e95
+Revises: e7b2d94c1a36
+Create Date: 2026-10-18 19:12:40.385172
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f41c8a7d2e95"
+down_revision: Union[str, None] = "e7b2d94c1a36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_updated",
+        "notifications",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_unread_user",
+        "notifications",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("is_read = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_unread_user", table_name="notifications")
+    op.drop_index("ix_notifications_user_updated", table_name="notifications")
@@ -1,17 +1,19 @@
 from fastapi import Depends, Query
 from jose import JWTError
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette.authentication import AuthenticationError
 from starlette.websockets import WebSocket
 
-from api.users.service import UserService, user_service_factory
+from api.users.service import user_service_factory
 from core.auth.jwt import decode_token
+from core.database import get_session_maker
 from core.database.models import User
 
 
 async def authorize_websocket(
     websocket: WebSocket,
     token: str = Query(None),
-    user_service: UserService = Depends(user_service_factory),
+    session_maker: async_sessionmaker = Depends(get_session_maker),
 ) -> User | None:
     if not token:
         await websocket.close(code=4001)
@@ -19,7 +21,8 @@ async def authorize_websocket(
     try:
         decoded_token = decode_token(token)
         user_id = decoded_token.get("user_id")
-        user = await user_service.get_user_by_id(user_id)
+        async with session_maker() as session:
+            user = await user_service_factory(session).get_user_by_id(user_id)
         if not user:
             raise AuthenticationError("User not found.")
         return user
@@ -1,19 +1,23 @@
 import logging
 from json import JSONDecodeError
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, WebSocketException, status
+from fastapi import APIRouter, Depends, Query, WebSocketException, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from api.chats.dependencies import authorize_websocket
 from api.groups.service import GroupService, group_service_factory
-from api.notifications.service import NotificationService, notification_service_factory
+from api.notifications.service import notification_service_factory
 from api.users.routers import get_current_user
+from config import settings
+from core.database import get_session_maker, session_scope
 from core.database.models import User
 from core.managers.group_websocket_manager import GroupConnectionManager
+from core.managers.read_receipts import ReadReceiptBuffer
 
 from .schemas import (
-    GroupMessageCheckRead,
+    GroupMessageChecksRead,
     GroupMessageCreate,
     GroupMessageRead,
     GroupMessageUpdate,
@@ -30,22 +34,31 @@ async def group_chat_websocket(
     group_id: int,
     websocket: WebSocket,
     user: User = Depends(authorize_websocket),
-    chat_service: GroupChatService = Depends(group_chat_service_factory),
-    group_service: GroupService = Depends(group_service_factory),
-    notification_service: NotificationService = Depends(notification_service_factory),
+    session_maker: async_sessionmaker = Depends(get_session_maker),
 ):
-    group = await group_service.get_group(group_id)
-    if not group:
-        raise WebSocketException(
-            code=status.WS_1008_POLICY_VIOLATION, reason="Group not found."
-        )
-    if user not in group.members:
-        raise WebSocketException(
-            code=status.WS_1008_POLICY_VIOLATION,
-            reason="User not member of this group.",
-        )
+    if not user:
+        return
+    async with session_scope(session_maker, user) as session:
+        group = await group_service_factory(session).get_group(group_id)
+        if not group:
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION, reason="Group not found."
+            )
+        if user.id not in [member.id for member in group.members]:
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="User not member of this group.",
+            )
+        await group_chat_service_factory(session).update_online_status(user)
+
+    async def write_receipts(message_ids: List[int]) -> None:
+        async with session_maker() as session:
+            await group_chat_service_factory(session).set_incoming_messages_as_read(
+                user.id, group_id, message_ids
+            )
+
+    receipts = ReadReceiptBuffer(write_receipts, settings.websocket.read_receipt_window)
     await manager.connect(group_id, user.username, websocket)
-    await chat_service.update_online_status(user)
     try:
         while True:
             try:
@@ -58,22 +71,18 @@ async def group_chat_websocket(
                     )
                     continue
                 if "action" in message_data and message_data["action"] == "read":
-                    message_ids = message_data.get("message_ids", [])
-                    await chat_service.set_incoming_messages_as_read(
-                        user.id, message_ids
-                    )
+                    receipts.add(message_data.get("message_ids", []))
                     continue
-
-                message_data = GroupMessageCreate(**message_data)
-                message = await chat_service.create_message(
-                    message_data, user, group_id
-                )
-                await notification_service.create_group_message_notification(
-                    message, chat_service
-                )
-                message = GroupMessageRead.model_validate(message).model_dump(
-                    mode="json"
-                )
+                async with session_scope(session_maker, user) as session:
+                    chat_service = group_chat_service_factory(session)
+                    message_data = GroupMessageCreate(**message_data)
+                    message = await chat_service.create_message(
+                        message_data, user, group_id
+                    )
+                    await notification_service_factory(
+                        session
+                    ).create_group_message_notification(message)
+                    message = GroupMessageRead.model_validate(message).model_dump_json()
                 await manager.broadcast(group_id, message, user.username)
             except (JSONDecodeError, AttributeError) as e:
                 logger.exception(f"Websocket error, detail: {e}")
@@ -85,9 +94,12 @@ async def group_chat_websocket(
                     "Could not validate incoming message", websocket
                 )
     except WebSocketDisconnect:
-        await chat_service.update_online_status(user)
+        async with session_scope(session_maker, user) as session:
+            await group_chat_service_factory(session).update_online_status(user)
         logging.info("Websocket is disconnected")
-        manager.disconnect(group_id, user.username)
+        await manager.disconnect(group_id, user.username)
+    finally:
+        await receipts.close()
 
 
 @router.get(
@@ -97,27 +109,28 @@ async def group_chat_websocket(
 )
 async def get_messages(
     group_id: int,
-    offset: int = 0,
-    limit: int = 50,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
     user: User = Depends(get_current_user),
     chat_service: GroupChatService = Depends(group_chat_service_factory),
     group_service: GroupService = Depends(group_service_factory),
 ) -> List[GroupMessageRead]:
     group = await group_service.get_group(group_id)
-    messages = await chat_service.get_messages(group, user, offset, limit)
+    messages = await chat_service.get_messages(group, user, before, after, limit)
     return messages
 
 
 @router.get(
     "/get-checks/{message_id}",
     status_code=status.HTTP_200_OK,
-    response_model=List[GroupMessageCheckRead],
+    response_model=GroupMessageChecksRead,
 )
 async def get_users_who_check_message(
     message_id: int,
     chat_service: GroupChatService = Depends(group_chat_service_factory),
     user: User = Depends(get_current_user),
-) -> List[GroupMessageCheckRead]:
+) -> GroupMessageChecksRead:
     message = await chat_service.get_message_by_id(message_id)
     return await chat_service.get_message_checks(message, user)
 
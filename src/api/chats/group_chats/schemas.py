@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -12,12 +12,9 @@ class GroupMessageUpdate(BaseModel):
     text: Optional[str] = None
 
 
-class GroupMessageCheckRead(BaseModel):
-    id: int
-    user: "UserShort"
-    created_at: datetime
-
-    model_config = ConfigDict(from_attributes=True)
+class GroupMessageChecksRead(BaseModel):
+    read_count: int
+    readers: List["UserShort"]
 
 
 class GroupMessageRead(BaseModel):
@@ -32,4 +29,4 @@ class GroupMessageRead(BaseModel):
 from api.users.schemas import UserShort
 
 GroupMessageRead.model_rebuild()
-GroupMessageCheckRead.model_rebuild()
+GroupMessageChecksRead.model_rebuild()
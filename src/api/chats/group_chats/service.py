@@ -1,12 +1,16 @@
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from api.chats.group_chats.schemas import GroupMessageCreate, GroupMessageUpdate
+from api.chats.group_chats.schemas import (
+    GroupMessageChecksRead,
+    GroupMessageCreate,
+    GroupMessageUpdate,
+)
 from core.database import get_async_session
-from core.database.models import Group, GroupMessage, GroupMessageCheck, User
+from core.database.models import Group, GroupMessage, User
 from core.database.repositories import (
     GroupMessageRepository,
     GroupRepository,
@@ -35,7 +39,12 @@ class GroupChatService:
         return new_message
 
     async def get_messages(
-        self, group: Group, user: User, offset: int, limit: int
+        self,
+        group: Group,
+        user: User,
+        before: Optional[int],
+        after: Optional[int],
+        limit: int,
     ) -> Sequence[GroupMessage]:
         if not group:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -45,39 +54,39 @@ class GroupChatService:
                 detail="User not member of this group.",
             )
         messages = await self.group_message_repository.get_messages_by_group(
-            group, offset, limit
+            group, before, after, limit
         )
         message_ids = [m.id for m in messages if m.sender != user]
         if message_ids:
             await self.group_message_repository.set_group_message_as_read(
-                user.id, message_ids
+                user.id, group.id, message_ids
             )
         return messages
 
     async def get_message_checks(
         self, message: GroupMessage, user: User
-    ) -> Sequence[GroupMessageCheck]:
+    ) -> GroupMessageChecksRead:
         if message.sender != user:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You are not sender of this message",
             )
-        checks = await self.group_message_repository.get_checks(message)
-        return checks
+        readers = await self.group_message_repository.get_readers(message)
+        return GroupMessageChecksRead(read_count=len(readers), readers=readers)
 
     async def set_group_message_as_read_bulk(
-        self, user_id: int, message_ids: List[int]
+        self, user_id: int, group_id: int, message_ids: List[int]
     ) -> None:
         await self.group_message_repository.set_group_message_as_read(
-            user_id, message_ids
+            user_id, group_id, message_ids
         )
         return
 
     async def set_incoming_messages_as_read(
-        self, user_id: int, message_ids: List[int]
+        self, user_id: int, group_id: int, message_ids: List[int]
     ) -> None:
         await self.group_message_repository.set_group_message_as_read(
-            user_id, message_ids
+            user_id, group_id, message_ids
         )
         return
 
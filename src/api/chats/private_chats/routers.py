@@ -1,17 +1,21 @@
 import logging
 from json import JSONDecodeError
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette import status
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from api.chats.dependencies import authorize_websocket
-from api.notifications.service import NotificationService, notification_service_factory
+from api.notifications.service import notification_service_factory
 from api.users.dependencies import get_current_user
+from config import settings
+from core.database import get_session_maker, session_scope
 from core.database.models import User
 from core.managers.private_websocket_manager import PrivateConnectionManager
+from core.managers.read_receipts import ReadReceiptBuffer
 
 from .schemas import (
     PrivateMessageCreate,
@@ -31,12 +35,26 @@ async def private_chat_websocket(
     receiver_id: int,
     websocket: WebSocket,
     user: User = Depends(authorize_websocket),
-    chat_service: PrivateChatService = Depends(private_chat_service_factory),
-    notification_service: NotificationService = Depends(notification_service_factory),
+    session_maker: async_sessionmaker = Depends(get_session_maker),
 ):
-    room = await chat_service.get_or_create_room(user_id1=user.id, user_id2=receiver_id)
-    await manager.connect(room.id, user.username, websocket)
-    await chat_service.update_online_status(user)
+    if not user:
+        return
+    async with session_scope(session_maker, user) as session:
+        chat_service = private_chat_service_factory(session)
+        room = await chat_service.get_or_create_room(
+            user_id1=user.id, user_id2=receiver_id
+        )
+        room_id = room.id
+        await chat_service.update_online_status(user)
+
+    async def write_receipts(message_ids: List[int]) -> None:
+        async with session_maker() as session:
+            await private_chat_service_factory(
+                session
+            ).set_incoming_messages_is_read_bulk(user.id, message_ids)
+
+    receipts = ReadReceiptBuffer(write_receipts, settings.websocket.read_receipt_window)
+    await manager.connect(room_id, user.username, websocket)
     try:
         while True:
             try:
@@ -45,28 +63,28 @@ async def private_chat_websocket(
                 if "action" in message_data and message_data["action"] == "typing":
                     is_typing = message_data.get("is_typing", False)
                     await manager.notify_typing_status(
-                        room.id, user.username, is_typing
+                        room_id, user.username, is_typing
                     )
                     continue
-
                 if "action" in message_data and message_data["action"] == "read":
-                    message_ids = message_data.get("message_ids", [])
-                    await chat_service.set_incoming_messages_is_read_bulk(
-                        user.id, message_ids
-                    )
+                    receipts.add(message_data.get("message_ids", []))
                     continue
 
-                message_data = PrivateMessageCreate(**message_data)
-                message = await chat_service.create_message(user, room.id, message_data)
+                async with session_scope(session_maker, user) as session:
+                    chat_service = private_chat_service_factory(session)
+                    message_data = PrivateMessageCreate(**message_data)
+                    message = await chat_service.create_message(
+                        user, room_id, message_data
+                    )
 
-                await notification_service.create_private_message_notification(
-                    message, chat_service
-                )
+                    await notification_service_factory(
+                        session
+                    ).create_private_message_notification(message)
 
-                message = PrivateMessageRead.model_validate(message).model_dump(
-                    mode="json"
-                )
-                await manager.send_message(room.id, message, exclude=user.username)
+                    message = PrivateMessageRead.model_validate(
+                        message
+                    ).model_dump_json()
+                await manager.send_message(room_id, message, exclude=user.username)
 
             except (JSONDecodeError, AttributeError) as e:
                 logger.exception(f"Websocket error, detail: {e}")
@@ -78,9 +96,12 @@ async def private_chat_websocket(
                     "Could not validate incoming message", websocket
                 )
     except WebSocketDisconnect:
-        await chat_service.update_online_status(user)
+        async with session_scope(session_maker, user) as session:
+            await private_chat_service_factory(session).update_online_status(user)
         logger.info("Websocket is disconnected")
-        manager.disconnect(room.id, user.username)
+        await manager.disconnect(room_id, user.username)
+    finally:
+        await receipts.close()
 
 
 @router.get(
@@ -101,13 +122,14 @@ async def get_my_rooms(
 )
 async def get_messages(
     receiver_id: int,
-    offset: int = 0,
-    limit: int = 50,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
     user: User = Depends(get_current_user),
     chat_service: PrivateChatService = Depends(private_chat_service_factory),
 ) -> List[PrivateMessageRead]:
     room = await chat_service.get_or_create_room(user_id1=user.id, user_id2=receiver_id)
-    messages = await chat_service.get_messages(user.id, room, offset, limit)
+    messages = await chat_service.get_messages(user.id, room, before, after, limit)
     return messages
 
 
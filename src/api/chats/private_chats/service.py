@@ -1,4 +1,4 @@
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -44,10 +44,15 @@ class PrivateChatService:
         return new_message
 
     async def get_messages(
-        self, user_id: int, room: PrivateRoom, offset: int, limit: int
+        self,
+        user_id: int,
+        room: PrivateRoom,
+        before: Optional[int],
+        after: Optional[int],
+        limit: int,
     ) -> Sequence[PrivateMessage]:
         messages = await self.private_message_repository.get_by_room(
-            room, offset, limit
+            room, before, after, limit
         )
         message_ids = [m.id for m in messages]
         await self.private_message_repository.set_messages_is_read_bulk(
@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional
+
+import orjson
+from redis.exceptions import RedisError
+
+from config import settings
+from core.cache import LRUCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    exam_id: int
+    correct_answers: Dict[int, FrozenSet[int]]
+    answer_questions: Dict[int, int]
+    text_questions: FrozenSet[int]
+
+    @classmethod
+    def from_rows(cls, exam_id: int, choice_rows, text_question_ids) -> "AnswerKey":
+        correct_answers: Dict[int, set] = {}
+        answer_questions: Dict[int, int] = {}
+        for question_id, answer_id, is_correct in choice_rows:
+            correct = correct_answers.setdefault(question_id, set())
+            if answer_id is None:
+                continue
+            answer_questions[answer_id] = question_id
+            if is_correct:
+                correct.add(answer_id)
+        return cls(
+            exam_id=exam_id,
+            correct_answers={
+                question_id: frozenset(answer_ids)
+                for question_id, answer_ids in correct_answers.items()
+            },
+            answer_questions=answer_questions,
+            text_questions=frozenset(text_question_ids),
+        )
+
+    def has_question(self, question_id: int) -> bool:
+        return question_id in self.correct_answers
+
+    def has_answer(self, question_id: int, answer_id: int) -> bool:
+        return self.answer_questions.get(answer_id) == question_id
+
+    def is_correct(self, question_id: int, answer_id: int) -> bool:
+        return answer_id in self.correct_answers.get(question_id, ())
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            {
+                "exam_id": self.exam_id,
+                "correct_answers": {
+                    str(question_id): sorted(answer_ids)
+                    for question_id, answer_ids in self.correct_answers.items()
+                },
+                "answer_questions": {
+                    str(answer_id): question_id
+                    for answer_id, question_id in self.answer_questions.items()
+                },
+                "text_questions": sorted(self.text_questions),
+            }
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> "AnswerKey":
+        payload = orjson.loads(data)
+        return cls(
+            exam_id=payload["exam_id"],
+            correct_answers={
+                int(question_id): frozenset(answer_ids)
+                for question_id, answer_ids in payload["correct_answers"].items()
+            },
+            answer_questions={
+                int(answer_id): question_id
+                for answer_id, question_id in payload["answer_questions"].items()
+            },
+            text_questions=frozenset(payload["text_questions"]),
+        )
+
+
+@dataclass(frozen=True)
+class RenderedView:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "RenderedView":
+        return cls(
+            body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        )
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+class ExamCache:
+    def __init__(self, max_size: int, ttl: int):
+        self.ttl = ttl
+        self._local = LRUCache(max_size=max_size, ttl=ttl)
+        self._versions: Dict[int, int] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _version_key(exam_id: int) -> str:
+        return f"exam:{exam_id}:version"
+
+    async def version(self, exam_id: int) -> Optional[int]:
+        redis = get_redis()
+        if redis is None:
+            return self._versions.get(exam_id, 0)
+        try:
+            value = await redis.get(self._version_key(exam_id))
+        except RedisError as e:
+            logger.warning(f"Exam cache is unavailable, detail: {e}")
+            return None
+        return int(value or 0)
+
+    async def invalidate(self, exam_id: int) -> None:
+        redis = get_redis()
+        if redis is None:
+            self._versions[exam_id] = self._versions.get(exam_id, 0) + 1
+            return
+        try:
+            await redis.incr(self._version_key(exam_id))
+        except RedisError as e:
+            logger.warning(f"Exam cache is unavailable, detail: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._versions.clear()
+
+    async def _get(
+        self,
+        exam_id: int,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ) -> Any:
+        version = await self.version(exam_id)
+        if version is None:
+            return await loader()
+        key = f"exam:{exam_id}:{version}:{name}"
+        value = self._local.get(key)
+        if value is not None:
+            return value
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, dumps, loads))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ) -> Any:
+        value = None
+        redis = get_redis()
+        if redis is not None:
+            try:
+                data = await redis.get(key)
+                if data:
+                    value = loads(data)
+            except RedisError as e:
+                logger.warning(f"Exam cache is unavailable, detail: {e}")
+        if value is None:
+            value = await loader()
+            if redis is not None:
+                try:
+                    await redis.set(key, dumps(value), ex=self.ttl)
+                except RedisError as e:
+                    logger.warning(f"Exam cache is unavailable, detail: {e}")
+        self._local.set(key, value)
+        return value
+
+    async def get_answer_key(
+        self, exam_id: int, loader: Callable[[], Awaitable[AnswerKey]]
+    ) -> AnswerKey:
+        return await self._get(
+            exam_id, "answer-key", loader, AnswerKey.dumps, AnswerKey.loads
+        )
+
+    async def get_student_view(
+        self, exam_id: int, loader: Callable[[], Awaitable[RenderedView]]
+    ) -> RenderedView:
+        return await self._get(
+            exam_id,
+            "student-view",
+            loader,
+            lambda view: view.body,
+            RenderedView.from_body,
+        )
+
+
+exam_cache = ExamCache(
+    max_size=settings.cache.exam_max_size,
+    ttl=settings.cache.exam_ttl,
+)
@@ -0,0 +1,115 @@
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from starlette import status
+
+from api.exams.schemas import PassingExamData
+from config import settings
+from core.cache import LRUCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+ENDS_AT = "ends_at"
+
+
+class DraftStore:
+    def __init__(self, grace: int, ttl: int, max_size: int):
+        self.grace = grace
+        self.ttl = ttl
+        self._local = LRUCache(max_size=max_size, ttl=ttl)
+
+    @staticmethod
+    def _key(exam_id: int, student_id: int) -> str:
+        return f"exam:{exam_id}:draft:{student_id}"
+
+    @staticmethod
+    def _unavailable(e: RedisError) -> HTTPException:
+        logger.warning(f"Draft store is unavailable, detail: {e}")
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Draft storage is unavailable.",
+        )
+
+    async def load(self, exam_id: int, student_id: int) -> Dict[str, str]:
+        key = self._key(exam_id, student_id)
+        redis = get_redis()
+        if redis is None:
+            return dict(self._local.get(key) or {})
+        try:
+            fields = await redis.hgetall(key)
+        except RedisError as e:
+            raise self._unavailable(e)
+        return {field.decode(): value.decode() for field, value in fields.items()}
+
+    async def ends_at(self, exam_id: int, student_id: int) -> Optional[float]:
+        key = self._key(exam_id, student_id)
+        redis = get_redis()
+        if redis is None:
+            value = (self._local.get(key) or {}).get(ENDS_AT)
+        else:
+            try:
+                value = await redis.hget(key, ENDS_AT)
+            except RedisError as e:
+                raise self._unavailable(e)
+        return float(value) if value else None
+
+    async def save(
+        self, exam_id: int, student_id: int, field: str, value: str, ends_at: float
+    ) -> None:
+        key = self._key(exam_id, student_id)
+        expires_at = min(ends_at + self.grace, time.time() + self.ttl)
+        redis = get_redis()
+        if redis is None:
+            fields = self._local.get(key) or {}
+            fields.update({field: value, ENDS_AT: str(ends_at)})
+            self._local.set(key, fields, expires_at)
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={field: value, ENDS_AT: str(ends_at)})
+                pipe.expireat(key, int(expires_at))
+                await pipe.execute()
+        except RedisError as e:
+            raise self._unavailable(e)
+
+    async def discard(self, exam_id: int, student_id: int) -> None:
+        key = self._key(exam_id, student_id)
+        redis = get_redis()
+        if redis is None:
+            self._local.pop(key)
+            return
+        try:
+            await redis.delete(key)
+        except RedisError as e:
+            logger.warning(f"Draft store is unavailable, detail: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    @staticmethod
+    def to_passing_data(fields: Dict[str, str]) -> PassingExamData:
+        choices, texts = [], []
+        for field, value in fields.items():
+            kind, _, question_id = field.partition(":")
+            if kind == "choice":
+                choices.append(
+                    {"question_id": int(question_id), "answer_id": int(value)}
+                )
+            elif kind == "text":
+                texts.append({"question_id": int(question_id), "text": value})
+        return PassingExamData.model_validate(
+            {
+                "choise_questions": sorted(choices, key=lambda c: c["question_id"]),
+                "text_questions": sorted(texts, key=lambda t: t["question_id"]),
+            }
+        )
+
+
+exam_drafts = DraftStore(
+    grace=settings.exams.draft_grace,
+    ttl=settings.exams.draft_ttl,
+    max_size=settings.exams.draft_max_size,
+)
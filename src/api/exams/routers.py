@@ -3,8 +3,11 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
+from api.exams.drafts import exam_drafts
 from api.exams.schemas import (
+    DraftAnswerData,
     ExamCreate,
     ExamRead,
     ExamShort,
@@ -13,10 +16,12 @@ from api.exams.schemas import (
     PassingExamData,
     ResultRead,
     ResultUpdate,
+    SubmissionRead,
 )
 from api.exams.service import ExamService, exam_service_factory
 from api.notifications.service import NotificationService, notification_service_factory
 from api.users.dependencies import get_current_user
+from config import settings
 from core.database.models import User
 
 router = APIRouter(prefix="/exams")
@@ -30,7 +35,7 @@ async def create_exam(
     notification_service: NotificationService = Depends(notification_service_factory),
 ):
     exam = await exam_service.create_exam(exam_data, user)
-    await notification_service.create_new_exam_notification(exam, exam_service)
+    await notification_service.create_new_exam_notification(exam)
     return exam
 
 
@@ -111,9 +116,16 @@ async def delete_text_question(
 @router.get("/{exam_id}", status_code=status.HTTP_200_OK)
 async def get_exam(
     exam_id: int,
+    request: Request,
     user: User = Depends(get_current_user),
     exam_service: ExamService = Depends(exam_service_factory),
 ) -> ExamStudentRead | ExamRead:
+    if not user.is_teacher:
+        view = await exam_service.get_student_view(exam_id)
+        headers = {"ETag": view.etag, "Cache-Control": "private, no-cache"}
+        if view.matches(request.headers.get("if-none-match")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(view.body, media_type="application/json", headers=headers)
     exam = await exam_service.get_exam_by_id(exam_id)
     if not exam:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -132,6 +144,28 @@ async def delete_answer(
     return
 
 
+async def submit_exam(
+    exam_id: int,
+    answers_data: PassingExamData,
+    user: User,
+    exam_service: ExamService,
+    notification_service: NotificationService,
+):
+    exam = await exam_service.get_exam_by_id(exam_id)
+    if settings.exams.queued_submissions:
+        submission = await exam_service.enqueue_submission(user, exam, answers_data)
+        await exam_drafts.discard(exam_id, user.id)
+        return JSONResponse(
+            SubmissionRead.model_validate(submission).model_dump(mode="json"),
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+    result = await exam_service.pass_exam(
+        user, exam, answers_data, notification_service
+    )
+    await exam_drafts.discard(exam_id, user.id)
+    return result
+
+
 @router.post(
     "/pass-exam/{exam_id}",
     status_code=status.HTTP_201_CREATED,
@@ -144,11 +178,62 @@ async def pass_exam(
     exam_service: ExamService = Depends(exam_service_factory),
     notification_service: NotificationService = Depends(notification_service_factory),
 ):
-    exam = await exam_service.get_exam_by_id(exam_id)
-    result = await exam_service.pass_exam(
-        user, exam, answers_data, notification_service
+    return await submit_exam(
+        exam_id, answers_data, user, exam_service, notification_service
     )
-    return result
+
+
+@router.post(
+    "/pass-exam/{exam_id}/draft",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ResultRead,
+)
+async def pass_exam_from_draft(
+    exam_id: int,
+    user: User = Depends(get_current_user),
+    exam_service: ExamService = Depends(exam_service_factory),
+    notification_service: NotificationService = Depends(notification_service_factory),
+):
+    answers_data = await exam_service.get_draft(user, exam_id)
+    return await submit_exam(
+        exam_id, answers_data, user, exam_service, notification_service
+    )
+
+
+@router.put("/{exam_id}/draft", status_code=status.HTTP_204_NO_CONTENT)
+async def save_draft_answer(
+    exam_id: int,
+    answer: DraftAnswerData,
+    user: User = Depends(get_current_user),
+    exam_service: ExamService = Depends(exam_service_factory),
+):
+    await exam_service.save_draft(user, exam_id, answer)
+    return
+
+
+@router.get(
+    "/{exam_id}/draft", status_code=status.HTTP_200_OK, response_model=PassingExamData
+)
+async def get_draft(
+    exam_id: int,
+    user: User = Depends(get_current_user),
+    exam_service: ExamService = Depends(exam_service_factory),
+):
+    return await exam_service.get_draft(user, exam_id)
+
+
+@router.get(
+    "/submissions/{submission_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=SubmissionRead,
+)
+async def get_submission(
+    submission_id: int,
+    user: User = Depends(get_current_user),
+    exam_service: ExamService = Depends(exam_service_factory),
+):
+    submission = await exam_service.get_submission(user, submission_id)
+    return submission
 
 
 @router.patch(
@@ -0,0 +1,70 @@
+import logging
+from typing import List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from core.cache import get_redis
+from core.database.models import Exam
+
+logger = logging.getLogger(__name__)
+
+START = "start"
+END = "end"
+
+
+class ExamScheduler:
+    key = "exams:schedule"
+
+    async def schedule(self, exam: Exam) -> None:
+        if exam.is_ended:
+            await self.unschedule(exam.id)
+            return
+        redis = get_redis()
+        if redis is None:
+            return
+        mapping = {f"{END}:{exam.id}": exam.end_time.timestamp()}
+        if not exam.is_started:
+            mapping[f"{START}:{exam.id}"] = exam.start_time.timestamp()
+        try:
+            await redis.zadd(self.key, mapping)
+        except RedisError as e:
+            logger.warning(f"Exam scheduler is unavailable, detail: {e}")
+
+    async def unschedule(self, exam_id: int) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.zrem(self.key, f"{START}:{exam_id}", f"{END}:{exam_id}")
+        except RedisError as e:
+            logger.warning(f"Exam scheduler is unavailable, detail: {e}")
+
+    async def claim_due(
+        self, now: float, limit: int = 100
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            members = await redis.zrangebyscore(
+                self.key, "-inf", now, start=0, num=limit
+            )
+            if not members:
+                return [], []
+            async with redis.pipeline(transaction=False) as pipe:
+                for member in members:
+                    pipe.zrem(self.key, member)
+                removed = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Exam scheduler is unavailable, detail: {e}")
+            return None
+        starting, ending = [], []
+        for member, claimed in zip(members, removed):
+            if not claimed:
+                continue
+            kind, _, exam_id = member.decode().partition(":")
+            (starting if kind == START else ending).append(int(exam_id))
+        return starting, ending
+
+
+exam_scheduler = ExamScheduler()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 
 class ExamCreate(BaseModel):
@@ -171,6 +171,18 @@ class TextAnswerData(BaseModel):
     text: str
 
 
+class DraftAnswerData(BaseModel):
+    question_id: int
+    answer_id: Optional[int] = None
+    text: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_single_answer(self) -> "DraftAnswerData":
+        if (self.answer_id is None) == (self.text is None):
+            raise ValueError("Either answer_id or text must be provided.")
+        return self
+
+
 class PassingExamData(BaseModel):
     choise_questions: Optional[List["SelectedAnswerData"]] = None
     text_questions: Optional[List["TextAnswerData"]] = None
@@ -184,6 +196,18 @@ class ResultRead(BaseModel):
     created_at: datetime
 
 
+class SubmissionRead(BaseModel):
+    id: int
+    exam_id: int
+    status: str
+    error: Optional[str] = None
+    result: Optional["ResultRead"] = None
+    created_at: datetime
+    graded_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ResultUpdate(BaseModel):
     score: int
 
@@ -1,15 +1,22 @@
+import logging
+import time
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
 
 import pytz
 from fastapi import Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from starlette.authentication import BaseUser
 
+from api.exams.cache import AnswerKey, RenderedView, exam_cache
+from api.exams.drafts import exam_drafts
+from api.exams.scheduler import exam_scheduler
 from api.exams.schemas import (
     AnswerRead,
     AnswerStudentRead,
+    DraftAnswerData,
     ExamCreate,
     ExamRead,
     ExamStudentRead,
@@ -27,11 +34,13 @@ from api.exams.utils import calculate_exam_score
 from api.groups.schemas import GroupShort
 from api.notifications.service import NotificationService
 from api.users.schemas import UserShort
+from config import settings
 from core.database import get_async_session
 from core.database.models import (
     Answer,
     Exam,
     ExamResult,
+    ExamSubmission,
     PassedChoiceAnswer,
     PassedTextAnswer,
     Question,
@@ -44,9 +53,12 @@ from core.database.repositories import (
     GroupRepository,
     QuestionRepository,
     ResultRepository,
+    SubmissionRepository,
     UserRepository,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ExamService:
     def __init__(
@@ -57,6 +69,7 @@ class ExamService:
         question_repository: QuestionRepository,
         answer_repository: AnswerRepository,
         result_repository: ResultRepository,
+        submission_repository: SubmissionRepository,
     ):
         self.exam_repository = exam_repository
         self.group_repository = group_repository
@@ -64,6 +77,7 @@ class ExamService:
         self.question_repository = question_repository
         self.answer_repository = answer_repository
         self.result_repository = result_repository
+        self.submission_repository = submission_repository
 
     async def create_exam(self, exam_data: ExamCreate, user: User) -> Exam:
         if not user.is_teacher:
@@ -87,6 +101,7 @@ class ExamService:
         new_exam = await self.exam_repository.create(
             exam_data, user, groups, self.question_repository, self.answer_repository
         )
+        await exam_scheduler.schedule(new_exam)
         return new_exam
 
     async def update_exam(
@@ -128,7 +143,10 @@ class ExamService:
         for key, value in exam_data_dict.items():
             setattr(exam, key, value)
 
-        return await self.exam_repository.update(exam)
+        exam = await self.exam_repository.update(exam)
+        await exam_cache.invalidate(exam.id)
+        await exam_scheduler.schedule(exam)
+        return exam
 
     async def get_teacher_exams(
         self, user: BaseUser, teacher_id: int
@@ -163,26 +181,28 @@ class ExamService:
             GroupShort.model_validate(group.__dict__) for group in exam.groups
         ]
         exam_data["questions"] = [
-            QuestionRead.model_validate(
-                {
-                    **question.__dict__,
-                    "answers": [
-                        AnswerRead.model_validate(answer.__dict__)
-                        for answer in question.answers
-                    ],
-                }
-            )
-            if user.is_teacher
-            else QuestionStudentRead.model_validate(
-                {
-                    **question.__dict__,
-                    "answers": [
-                        AnswerStudentRead.model_validate(
-                            {"id": answer.id, "text": answer.text}
-                        )
-                        for answer in question.answers
-                    ],
-                }
+            (
+                QuestionRead.model_validate(
+                    {
+                        **question.__dict__,
+                        "answers": [
+                            AnswerRead.model_validate(answer.__dict__)
+                            for answer in question.answers
+                        ],
+                    }
+                )
+                if user.is_teacher
+                else QuestionStudentRead.model_validate(
+                    {
+                        **question.__dict__,
+                        "answers": [
+                            AnswerStudentRead.model_validate(
+                                {"id": answer.id, "text": answer.text}
+                            )
+                            for answer in question.answers
+                        ],
+                    }
+                )
             )
             for question in exam.questions
         ]
@@ -228,6 +248,8 @@ class ExamService:
         if not exam:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
         await self.exam_repository.delete(exam)
+        await exam_cache.invalidate(exam.id)
+        await exam_scheduler.unschedule(exam.id)
 
     async def delete_question(self, user: User, question_id: int) -> None:
         question = await self.question_repository.get_question_by_id(question_id)
@@ -239,6 +261,7 @@ class ExamService:
         if not question:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
         await self.question_repository.delete_question(question)
+        await exam_cache.invalidate(question.exam_id)
 
     async def delete_text_question(self, user: User, question_id: int) -> None:
         question = await self.question_repository.get_text_question_by_id(question_id)
@@ -250,6 +273,7 @@ class ExamService:
         if not question:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
         await self.question_repository.delete_text_question(question)
+        await exam_cache.invalidate(question.exam_id)
 
     async def delete_answer(self, user: User, answer_id: int) -> None:
         answer = await self.answer_repository.get_by_id(answer_id)
@@ -261,6 +285,7 @@ class ExamService:
         if not answer:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
         await self.answer_repository.delete(answer)
+        await exam_cache.invalidate(answer.question.exam_id)
 
     async def create_result(
         self, exam_id: int, user_id: int, score: Optional[int] = None
@@ -382,17 +407,36 @@ class ExamService:
         )
         return passed_answers
 
-    async def get_correct_answer(self, answer_id: int, question: Question) -> Answer:
-        answer = await self.answer_repository.get_correct_answer(answer_id, question)
-        return answer
+    async def load_answer_key(self, exam_id: int) -> AnswerKey:
+        choice_rows, text_question_ids = (
+            await self.question_repository.get_answer_key_rows(exam_id)
+        )
+        return AnswerKey.from_rows(exam_id, choice_rows, text_question_ids)
 
-    async def pass_exam(
-        self,
-        user: User,
-        exam: Exam,
-        answers_data: PassingExamData,
-        notification_service: NotificationService,
-    ) -> ExamResult:
+    async def get_answer_key(self, exam_id: int) -> AnswerKey:
+        return await exam_cache.get_answer_key(
+            exam_id, lambda: self.load_answer_key(exam_id)
+        )
+
+    async def get_student_view(self, exam_id: int) -> RenderedView:
+        async def render() -> RenderedView:
+            exam = await self.exam_repository.get_by_id(exam_id)
+            if not exam:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+            view = ExamStudentRead.model_validate(
+                {
+                    **exam.__dict__,
+                    "text_questions": (
+                        exam.text_questions if exam.is_advanced_exam else []
+                    ),
+                },
+                from_attributes=True,
+            )
+            return RenderedView.from_body(view.model_dump_json().encode())
+
+        return await exam_cache.get_student_view(exam_id, render)
+
+    async def check_can_pass(self, user: User, exam: Exam) -> None:
         if not exam:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Exam not found."
@@ -406,50 +450,243 @@ class ExamService:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="You are not a student."
             )
-        if user not in await self.user_repository.get_by_exam(exam):
+        if not await self.user_repository.is_exam_member(user.id, exam.id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You are not in this exam's group.",
             )
-        if any(result.exam.id == exam.id for result in user.results):
+        if await self.result_repository.exists(exam.id, user.id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You have already passed this exam.",
             )
 
-        if exam.is_advanced_exam:
-            for answer in answers_data.text_questions:
-                question = await self.question_repository.get_text_question_by_id(
-                    answer.question_id
-                )
-                if not question:
-                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-                await self.answer_repository.create_passed_text_answers(
-                    user, exam, answer
+    @staticmethod
+    def build_submission(
+        answer_key: AnswerKey,
+        exam: Exam,
+        student_id: int,
+        answers_data: PassingExamData,
+    ) -> Tuple[Optional[int], List[dict], List[dict]]:
+        text_answers = answers_data.text_questions if exam.is_advanced_exam else None
+        choice_answers = answers_data.choise_questions or []
+        for answers in (choice_answers, text_answers or []):
+            question_ids = [answer.question_id for answer in answers]
+            if len(set(question_ids)) != len(question_ids):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Each question can be answered only once.",
                 )
-
-        if answers_data.choise_questions:
-            for answer in answers_data.choise_questions:
-                question = await self.question_repository.get_question_by_id(
-                    answer.question_id
+        for answer in text_answers or []:
+            if answer.question_id not in answer_key.text_questions:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        for answer in choice_answers:
+            if not answer_key.has_question(answer.question_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Question {answer.question_id} not found.",
                 )
-                if not question:
-                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-                await self.answer_repository.create_passed_choise_answers(
-                    user, exam, answer
+            if not answer_key.has_answer(answer.question_id, answer.answer_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Answer {answer.answer_id} not found.",
                 )
 
-        quantity = exam.quantity_questions
+        score = None
         if not exam.is_advanced_exam:
-            score = await calculate_exam_score(
-                self, answers_data.choise_questions, quantity
+            score = calculate_exam_score(
+                answer_key, choice_answers, exam.quantity_questions
             )
-            result = await self.create_result(exam.id, user.id, score)
-            return result
-        else:
-            result = await self.create_result(exam.id, user.id)
+        choice_rows = [
+            {
+                "user_id": student_id,
+                "exam_id": exam.id,
+                "question_id": answer.question_id,
+                "selected_answer_id": answer.answer_id,
+                "is_correct": answer_key.is_correct(
+                    answer.question_id, answer.answer_id
+                ),
+            }
+            for answer in choice_answers
+        ]
+        text_rows = [
+            {
+                "user_id": student_id,
+                "exam_id": exam.id,
+                "question_id": answer.question_id,
+                "text": answer.text,
+            }
+            for answer in text_answers or []
+        ]
+        return score, choice_rows, text_rows
+
+    async def pass_exam(
+        self,
+        user: User,
+        exam: Exam,
+        answers_data: PassingExamData,
+        notification_service: NotificationService,
+    ) -> ExamResult:
+        await self.check_can_pass(user, exam)
+        answer_key = await self.get_answer_key(exam.id)
+        score, choice_rows, text_rows = self.build_submission(
+            answer_key, exam, user.id, answers_data
+        )
+        try:
+            result = await self.result_repository.create_submission(
+                exam, user, score, choice_rows, text_rows
+            )
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You have already passed this exam.",
+            )
+        if exam.is_advanced_exam:
             await notification_service.create_result_notification(result)
-            return result
+        return result
+
+    async def enqueue_submission(
+        self, user: User, exam: Exam, answers_data: PassingExamData
+    ) -> ExamSubmission:
+        await self.check_can_pass(user, exam)
+        answer_key = await self.get_answer_key(exam.id)
+        self.build_submission(answer_key, exam, user.id, answers_data)
+        submission = await self.submission_repository.create(
+            exam.id, user.id, answers_data.model_dump(mode="json")
+        )
+        if submission is None:
+            current = await self.submission_repository.get_status(exam.id, user.id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=(
+                    "Your submission is still being graded."
+                    if current == ExamSubmission.PENDING
+                    else "You have already passed this exam."
+                ),
+            )
+        return submission
+
+    async def get_submission(self, user: User, submission_id: int) -> ExamSubmission:
+        submission = await self.submission_repository.get_by_id(submission_id)
+        if not submission:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found."
+            )
+        if submission.student_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="This is not your submission.",
+            )
+        return submission
+
+    async def save_draft(
+        self, user: User, exam_id: int, answer: DraftAnswerData
+    ) -> None:
+        ends_at = await exam_drafts.ends_at(exam_id, user.id)
+        if ends_at is None:
+            exam = await self.exam_repository.get_by_id(exam_id, profile="exam-grading")
+            await self.check_can_pass(user, exam)
+            ends_at = exam.end_time.timestamp()
+        if ends_at <= time.time():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Exam was ended."
+            )
+        answer_key = await self.get_answer_key(exam_id)
+        if answer.answer_id is not None:
+            if not answer_key.has_answer(answer.question_id, answer.answer_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Answer {answer.answer_id} not found.",
+                )
+            field, value = f"choice:{answer.question_id}", str(answer.answer_id)
+        else:
+            if answer.question_id not in answer_key.text_questions:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Question {answer.question_id} not found.",
+                )
+            field, value = f"text:{answer.question_id}", answer.text
+        await exam_drafts.save(exam_id, user.id, field, value, ends_at)
+
+    @staticmethod
+    async def get_draft(user: User, exam_id: int) -> PassingExamData:
+        fields = await exam_drafts.load(exam_id, user.id)
+        return exam_drafts.to_passing_data(fields)
+
+    async def grade_submissions(
+        self, notification_service: NotificationService, batch_size: int
+    ) -> int:
+        submissions = await self.submission_repository.claim_pending(batch_size)
+        if not submissions:
+            return 0
+        try:
+            await self._grade(submissions, notification_service)
+        except Exception as e:
+            logger.exception(f"Grading batch failed, detail: {e}")
+            await self.submission_repository.record_failure(
+                [submission.id for submission in submissions],
+                "Grading failed.",
+                settings.exams.submission_max_attempts,
+            )
+            return 0
+        return len(submissions)
+
+    async def _grade(
+        self,
+        submissions: Sequence[ExamSubmission],
+        notification_service: NotificationService,
+    ) -> None:
+        passed = await self.result_repository.get_passed_pairs(
+            [(submission.exam_id, submission.student_id) for submission in submissions]
+        )
+        exams, answer_keys = {}, {}
+        for exam_id in {submission.exam_id for submission in submissions}:
+            exams[exam_id] = await self.exam_repository.get_by_id(
+                exam_id, profile="exam-grading"
+            )
+            answer_keys[exam_id] = await self.load_answer_key(exam_id)
+        students = {
+            student.id: student
+            for student in await self.user_repository.get_by_ids(
+                [submission.student_id for submission in submissions]
+            )
+        }
+
+        graded, results, choice_rows, text_rows = [], [], [], []
+        for submission in submissions:
+            exam = exams[submission.exam_id]
+            student = students.get(submission.student_id)
+            if not exam or not student:
+                self.submission_repository.mark_failed(submission, "Not found.")
+                continue
+            if (exam.id, student.id) in passed:
+                self.submission_repository.mark_failed(
+                    submission, "You have already passed this exam."
+                )
+                continue
+            try:
+                score, choices, texts = self.build_submission(
+                    answer_keys[exam.id],
+                    exam,
+                    student.id,
+                    PassingExamData.model_validate(submission.payload),
+                )
+            except HTTPException as e:
+                self.submission_repository.mark_failed(submission, e.detail)
+                continue
+            result = ExamResult(exam=exam, student=student, score=score)
+            graded.append((submission, result))
+            results.append(result)
+            choice_rows.extend(choices)
+            text_rows.extend(texts)
+
+        await self.result_repository.add_results(results, choice_rows, text_rows)
+        for submission, result in graded:
+            self.submission_repository.mark_graded(submission, result.id)
+        await self.submission_repository.commit()
+        for _, result in graded:
+            if result.exam.is_advanced_exam:
+                await notification_service.create_result_notification(result)
 
 
 def exam_service_factory(
@@ -462,4 +699,5 @@ def exam_service_factory(
         QuestionRepository(session),
         AnswerRepository(session),
         ResultRepository(session),
+        SubmissionRepository(session),
     )
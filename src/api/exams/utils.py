@@ -1,42 +1,23 @@
 from typing import TYPE_CHECKING, List
 
-from fastapi import HTTPException
-from starlette import status
-
 from api.exams.schemas import SelectedAnswerData
 
 if TYPE_CHECKING:
-    from api.exams.service import ExamService
+    from api.exams.cache import AnswerKey
 
 
-async def calculate_exam_score(
-    exam_service: "ExamService",
+def calculate_exam_score(
+    answer_key: "AnswerKey",
     answers_data: List[SelectedAnswerData],
     quantity: int,
 ):
-    if quantity == 0:
+    if not quantity:
         return None
 
-    correct_answers = 0
-    for answer_data in answers_data:
-        question_id = answer_data.question_id
-        answer_id = answer_data.answer_id
-
-        question = await exam_service.get_question_by_id(question_id)
-        answer = await exam_service.get_answer_by_id(answer_id)
-        if not question:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Question {question_id} not found.",
-            )
-        if not answer:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Answer {answer_id} not found.",
-            )
-        correct_answer = await exam_service.get_correct_answer(answer_id, question)
-        if correct_answer:
-            correct_answers += 1
+    correct_answers = sum(
+        answer_key.is_correct(answer_data.question_id, answer_data.answer_id)
+        for answer_data in answers_data
+    )
 
     percentage_correct = (correct_answers / quantity) * 100
     if percentage_correct < 30:
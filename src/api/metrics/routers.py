@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from api.chats.group_chats.routers import manager as group_manager
+from api.chats.private_chats.routers import manager as private_manager
+from api.users.dependencies import get_current_user
+from core.auth.hashing import hashing_pool
+from core.database import engine, get_async_session, pool_stats
+from core.database.models import User
+from core.database.repositories import NotificationRepository, SubmissionRepository
+from core.managers.notification_websocket_manager import notification_manager
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def get_metrics(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="You are not admin"
+        )
+    return {
+        "database": pool_stats(engine),
+        "hashing": hashing_pool.stats(),
+        "exam_submissions": await SubmissionRepository(session).stats(),
+        "notifications": await NotificationRepository(session).stats(),
+        "websockets": {
+            "groups": group_manager.stats(),
+            "private": private_manager.stats(),
+            "notifications": notification_manager.stats(),
+        },
+    }
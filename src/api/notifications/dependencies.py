@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from starlette import status
+
+from api.notifications.schemas import decode_cursor
+
+
+async def get_cursor(cursor: Optional[str] = None) -> Optional[Tuple[datetime, int]]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
@@ -0,0 +1,42 @@
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from config import settings
+from core.cache import LRUCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class DigestScheduler:
+    def __init__(self, window: int, max_size: int):
+        self.window = window
+        self._local = LRUCache(max_size=max_size, ttl=window)
+
+    @staticmethod
+    def _key(conversation: str) -> str:
+        return f"notifications:digest:{conversation}"
+
+    async def claim(self, conversation: str) -> bool:
+        key = self._key(conversation)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return bool(await redis.set(key, 1, nx=True, ex=self.window))
+            except RedisError as e:
+                logger.warning(f"Digest scheduler is unavailable, detail: {e}")
+                return False
+        if key in self._local:
+            return False
+        self._local.set(key, time.time())
+        return True
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+chat_digests = DigestScheduler(
+    window=settings.notifications.digest_window,
+    max_size=settings.notifications.digest_max_size,
+)
@@ -1,14 +1,58 @@
-from typing import List
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, WebSocketException
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette import status
+from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from api.notifications.schemas import NotificationRead
+from api.chats.dependencies import authorize_websocket
+from api.notifications.dependencies import get_cursor
+from api.notifications.schemas import (
+    MarkedRead,
+    NotificationPage,
+    NotificationRead,
+    UnreadCount,
+    decode_cursor,
+)
 from api.notifications.service import NotificationService, notification_service_factory
 from api.users.dependencies import get_current_user
+from core.database import get_session_maker
 from core.database.models import User
+from core.managers.notification_websocket_manager import notification_manager
 
 router = APIRouter(prefix="/notifications")
+logger = logging.getLogger(__name__)
+
+
+@router.websocket("/ws")
+async def notifications_websocket(
+    websocket: WebSocket,
+    cursor: Optional[str] = None,
+    user: User = Depends(authorize_websocket),
+    session_maker: async_sessionmaker = Depends(get_session_maker),
+):
+    if not user:
+        return
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Invalid cursor."
+        )
+    await notification_manager.connect(user.id, user.username, websocket)
+    try:
+        async with session_maker() as session:
+            missed = await notification_service_factory(
+                session
+            ).get_missed_notifications(user, position)
+        await notification_manager.replay(user.id, user.username, missed)
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        logger.info("Websocket is disconnected")
+        await notification_manager.disconnect(user.id, user.username)
 
 
 @router.get(
@@ -30,8 +74,39 @@ async def get_unread_notifications(
     response_model=List[NotificationRead],
 )
 async def get_all_notifications(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[Tuple[datetime, int]] = Depends(get_cursor),
     user: User = Depends(get_current_user),
     notification_service: NotificationService = Depends(notification_service_factory),
 ):
-    notifications = await notification_service.get_all_notifications(user)
+    notifications = await notification_service.get_all_notifications(
+        user, cursor, limit
+    )
     return notifications
+
+
+@router.get("/inbox", status_code=status.HTTP_200_OK, response_model=NotificationPage)
+async def get_inbox(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[Tuple[datetime, int]] = Depends(get_cursor),
+    user: User = Depends(get_current_user),
+    notification_service: NotificationService = Depends(notification_service_factory),
+):
+    return await notification_service.get_inbox(user, cursor, limit)
+
+
+@router.get("/unread-count", status_code=status.HTTP_200_OK, response_model=UnreadCount)
+async def get_unread_count(
+    user: User = Depends(get_current_user),
+    notification_service: NotificationService = Depends(notification_service_factory),
+):
+    return await notification_service.count_unread_notifications(user)
+
+
+@router.post("/mark-read", status_code=status.HTTP_200_OK, response_model=MarkedRead)
+async def mark_notifications_as_read(
+    cursor: Optional[Tuple[datetime, int]] = Depends(get_cursor),
+    user: User = Depends(get_current_user),
+    notification_service: NotificationService = Depends(notification_service_factory),
+):
+    return await notification_service.mark_notifications_as_read(user, cursor)
@@ -1,17 +1,67 @@
 from datetime import datetime
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, computed_field
+
+
+def encode_cursor(moment: datetime, notification_id: int) -> str:
+    return f"{moment.isoformat()}_{notification_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    moment, _, notification_id = cursor.rpartition("_")
+    return datetime.fromisoformat(moment), int(notification_id)
 
 
 class NotificationRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     title: str
     body: str
     user: "UserShort"
     is_read: bool
+    conversation: Optional[str] = None
+    message_count: int = 1
+    last_message_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class NotificationEvent(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int
+    title: str
+    body: str
+    is_read: bool
+    conversation: Optional[str] = None
+    message_count: int = 1
+    last_message_id: Optional[int] = None
     created_at: datetime
+    updated_at: datetime
+
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.updated_at, self.id)
+
+
+class NotificationPage(BaseModel):
+    items: List["NotificationRead"]
+    next_cursor: Optional[str] = None
+
+
+class UnreadCount(BaseModel):
+    unread: int
+
+
+class MarkedRead(BaseModel):
+    marked: List[int]
 
 
 from api.users.schemas import UserShort
 
 NotificationRead.model_rebuild()
+NotificationPage.model_rebuild()
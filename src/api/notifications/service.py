@@ -1,10 +1,22 @@
-from typing import TYPE_CHECKING, Sequence
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
 
+import pytz
 from fastapi import Depends
+from sqlalchemy import literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.chats.group_chats.service import GroupChatService
-from api.chats.private_chats.service import PrivateChatService
+from api.exams.cache import exam_cache
+from api.exams.scheduler import exam_scheduler
+from api.notifications.digests import chat_digests
+from api.notifications.schemas import (
+    MarkedRead,
+    NotificationEvent,
+    NotificationPage,
+    UnreadCount,
+    encode_cursor,
+)
 from api.users.schemas import UserShort
 from config import settings
 from core.database import get_async_session
@@ -16,24 +28,24 @@ from core.database.models import (
     Notification,
     PrivateMessage,
     User,
+    group_exams,
+    group_lectures,
+    group_members,
 )
+from core.database.models.chats import room_members
 from core.database.repositories import (
     ExamRepository,
     NotificationRepository,
     UserRepository,
 )
-from core.tasks.tasks import (
-    send_email_to_student,
-    send_email_to_teahcer,
-    send_new_exam_email,
-    send_new_group_message_email,
-    send_new_lecture_notification,
-    send_new_private_message_email,
-    send_update_result,
+from core.managers.notification_websocket_manager import notification_manager
+from core.tasks.audience_tasks import (
+    notify_new_exam,
+    notify_new_lecture,
+    send_chat_digest,
 )
-
-if TYPE_CHECKING:
-    from api.exams.service import ExamService
+from core.tasks.exam_tasks import dispatch_exam_started_emails, send_exam_ended_email
+from core.tasks.tasks import send_update_result
 
 
 class NotificationService:
@@ -47,12 +59,60 @@ class NotificationService:
         self.exam_repository = exam_repository
         self.user_repository = user_repository
 
-    async def get_all_notifications(self, user: User) -> Sequence[Notification]:
-        return await self.notification_repository.get_all(user)
+    async def get_all_notifications(
+        self, user: User, cursor: Optional[Tuple[datetime, int]], limit: int
+    ) -> Sequence[Notification]:
+        return await self.notification_repository.get_page(user.id, cursor, limit)
+
+    async def get_inbox(
+        self, user: User, cursor: Optional[Tuple[datetime, int]], limit: int
+    ) -> NotificationPage:
+        notifications = await self.notification_repository.get_page(
+            user.id, cursor, limit
+        )
+        next_cursor = None
+        if len(notifications) == limit:
+            last = notifications[-1]
+            next_cursor = encode_cursor(last.updated_at, last.id)
+        return NotificationPage(items=notifications, next_cursor=next_cursor)
+
+    async def count_unread_notifications(self, user: User) -> UnreadCount:
+        return UnreadCount(
+            unread=await self.notification_repository.count_unread(user.id)
+        )
+
+    async def mark_notifications_as_read(
+        self, user: User, cursor: Optional[Tuple[datetime, int]]
+    ) -> MarkedRead:
+        return MarkedRead(
+            marked=await self.notification_repository.mark_read(user.id, cursor)
+        )
 
     async def get_unread_notifications(self, user: User) -> Sequence[Notification]:
         return await self.notification_repository.get_unreads(user)
 
+    async def get_missed_notifications(
+        self, user: User, cursor: Optional[Tuple[datetime, int]]
+    ) -> List[dict]:
+        notifications = await self.notification_repository.get_since(
+            user.id, cursor, settings.notifications.resume_limit
+        )
+        return [self.to_event(notification) for notification in notifications]
+
+    @staticmethod
+    def to_event(notification: Notification) -> dict:
+        return NotificationEvent.model_validate(notification).model_dump(mode="json")
+
+    async def push(self, notifications: Sequence[Notification]) -> None:
+        await asyncio.gather(
+            *(
+                notification_manager.push(
+                    notification.user_id, self.to_event(notification)
+                )
+                for notification in notifications
+            )
+        )
+
     async def create_result_notification(self, result: ExamResult) -> None:
         user = result.exam.author
         title = "Кто-то прошел ваш экзамен!"
@@ -63,7 +123,10 @@ class NotificationService:
             f"exam_id: {result.exam.id}"
         )
         user = user
-        await self.notification_repository.create_notification(title, body, user)
+        notification = await self.notification_repository.create_notification(
+            title, body, user
+        )
+        await self.push([notification])
 
     async def update_result_notification(self, result: ExamResult) -> None:
         user = result.exam.author
@@ -74,7 +137,10 @@ class NotificationService:
             f"exam_id: {result.exam.id}"
         )
         user = user
-        await self.notification_repository.create_notification(title, body, user)
+        notification = await self.notification_repository.create_notification(
+            title, body, user
+        )
+        await self.push([notification])
         user_data = UserShort.model_validate(result.student).model_dump()
         send_update_result.delay(
             result.id,
@@ -83,145 +149,122 @@ class NotificationService:
             result.score,
         )
 
-    async def create_new_exam_notification(
-        self,
-        exam: Exam,
-        exam_service: "ExamService",
-    ) -> None:
-        user_list = await exam_service.get_group_users_by_exam(exam)
-        for user in user_list:
-            if not user.is_teacher:
-                title = "У вас новый экзамен!"
-                body = (
-                    f"Преподаватель {exam.author} создал новый экзамен."
-                    f"\n exam_id: {exam.id}"
-                )
-                user = user
-                await self.notification_repository.create_notification(
-                    title, body, user
-                )
-        filtered_user_list = [
-            u
-            for u in user_list
-            if u != exam.author or not u.is_teacher or not u.ignore_messages
-        ]
-        simplified_user_list = [
-            {"email": user.email, "username": user.username}
-            for user in filtered_user_list
-        ]
-        send_new_exam_email.delay(
-            exam.id,
-            exam.author.first_name,
-            exam.author.first_name,
-            simplified_user_list,
+    async def create_new_exam_notification(self, exam: Exam) -> None:
+        notifications = await self.notification_repository.create_for_audience(
+            title="У вас новый экзамен!",
+            body=(
+                f"Преподаватель {exam.author} создал новый экзамен."
+                f"\n exam_id: {exam.id}"
+            ),
+            audience=self.notification_repository.audience(
+                group_members.c.group_id,
+                select(group_exams.c.group_id).where(group_exams.c.exam_id == exam.id),
+                students_only=True,
+            ),
         )
+        await self.push(notifications)
+        notify_new_exam.delay(exam.id)
 
     async def create_lecture_notification(self, lecture: Lecture) -> None:
-        user_list = await self.user_repository.get_by_lecture(lecture)
-        for user in user_list:
-            title = "Новая лекция!"
-            body = (
-                f"Привет {user.username}"
-                f"Преподаватель выпустил новую лекцию:"
-                f"http://{settings.run.host}:{settings.run.port}/api/v1/materials/get-lecture/{lecture.id}"
-            )
-            await self.notification_repository.create_notification(title, body, user)
-        filtered_user_list = [
-            u
-            for u in user_list
-            if u != lecture.author or not u.is_teacher or not u.ignore_messages
-        ]
-        simplified_user_list = [
-            {"email": user.email, "username": user.username}
-            for user in filtered_user_list
-        ]
-        send_new_lecture_notification.delay(lecture.id, simplified_user_list)
+        notifications = await self.notification_repository.create_for_audience(
+            title="Новая лекция!",
+            body=(
+                literal("Привет ")
+                + User.username
+                + literal(
+                    f"Преподаватель выпустил новую лекцию:"
+                    f"http://{settings.run.host}:{settings.run.port}/api/v1/materials/get-lecture/{lecture.id}"
+                )
+            ),
+            audience=self.notification_repository.audience(
+                group_members.c.group_id,
+                select(group_lectures.c.group_id).where(
+                    group_lectures.c.lecture_id == lecture.id
+                ),
+                exclude_user_id=lecture.author_id,
+            ),
+        )
+        await self.push(notifications)
+        notify_new_lecture.delay(lecture.id)
 
     async def create_private_message_notification(
-        self, private_message: PrivateMessage, chat_service: PrivateChatService
+        self, private_message: PrivateMessage
     ) -> None:
-        users = await chat_service.get_users_by_message(private_message)
-        for user in users:
-            if not private_message.sender == user:
-                title = "У вас новое сообщение!"
-                body = (
-                    f"Пользователь {private_message.sender.username} написал новое сообщение."
-                    f"\n http://{settings.run.host}:{settings.run.port}/api/v1/chats/chats/{private_message.room_id}"
-                )
-                await self.notification_repository.create_notification(
-                    title, body, user
-                )
-        filtered_user_list = [
-            u for u in users if u != private_message.sender or not u.ignore_messages
-        ]
-        simplified_user_list = [
-            {"email": user.email, "username": user.username}
-            for user in filtered_user_list
-        ]
-        send_new_private_message_email.delay(
-            private_message.room_id,
-            simplified_user_list,
-            private_message.text,
-            private_message.sender.username,
+        conversation = f"room:{private_message.room_id}"
+        notifications = await self.notification_repository.upsert_for_audience(
+            conversation=conversation,
+            title="У вас новое сообщение!",
+            body=(
+                f"Пользователь {private_message.sender.username} написал новое сообщение."
+                f"\n http://{settings.run.host}:{settings.run.port}/api/v1/chats/chats/{private_message.room_id}"
+            ),
+            last_message_id=private_message.id,
+            audience=self.notification_repository.audience(
+                room_members.c.room_id,
+                [private_message.room_id],
+                exclude_user_id=private_message.sender_id,
+            ),
         )
+        await self.push(notifications)
+        await self.schedule_chat_digest(conversation)
 
     async def create_group_message_notification(
-        self, group_message: GroupMessage, chat_service: GroupChatService
+        self, group_message: GroupMessage
     ) -> None:
-        users = await chat_service.get_group_users_by_message(group_message)
-        for user in users:
-            if not user.is_teacher:
-                title = "Новое сообщение в группе!"
-                body = (
-                    f"Пользователь {group_message.sender.username} написал новое сообщение."
-                    f"\n http://{settings.run.host}:{settings.run.port}/api/v1/chats/groups/get-messages/{group_message.group_id}"
-                )
-                await self.notification_repository.create_notification(
-                    title, body, user
-                )
-        filtered_user_list = [
-            u
-            for u in users
-            if u != group_message.sender or not u.ignore_messages or not u.is_teacher
-        ]
-        simplified_user_list = [
-            {"email": user.email, "username": user.username}
-            for user in filtered_user_list
-        ]
-        send_new_group_message_email.delay(
-            group_message.group_id,
-            simplified_user_list,
-            group_message.text,
-            group_message.sender.username,
+        conversation = f"group:{group_message.group_id}"
+        notifications = await self.notification_repository.upsert_for_audience(
+            conversation=conversation,
+            title="Новое сообщение в группе!",
+            body=(
+                f"Пользователь {group_message.sender.username} написал новое сообщение."
+                f"\n http://{settings.run.host}:{settings.run.port}/api/v1/chats/groups/get-messages/{group_message.group_id}"
+            ),
+            last_message_id=group_message.id,
+            audience=self.notification_repository.audience(
+                group_members.c.group_id,
+                [group_message.group_id],
+                exclude_user_id=group_message.sender_id,
+                students_only=True,
+            ),
         )
+        await self.push(notifications)
+        await self.schedule_chat_digest(conversation)
+
+    @staticmethod
+    async def schedule_chat_digest(conversation: str) -> None:
+        if await chat_digests.claim(conversation):
+            send_chat_digest.apply_async((conversation,), countdown=chat_digests.window)
 
-    async def start_scheduled_exams(self) -> None:
-        exams = await self.exam_repository.get_exams_ready_to_start()
+    async def start_scheduled_exams(self, exam_ids: Optional[List[int]] = None) -> None:
+        exams = await self.exam_repository.get_exams_ready_to_start(exam_ids)
         for exam in exams:
-            user_list = await self.user_repository.get_by_exam(exam)
-            for user in user_list:
-                if not user.is_teacher:
-                    await self.notification_repository.create_notification(
-                        title=f"Экзамен '{exam.title}' уже можно пройти!",
-                        body=(
-                            f"Вы уже можете пройти экзамен '{exam.title}'! "
-                            f"Успейте до {exam.end_time}."
-                            f"\n http://{settings.run.host}:{settings.run.port}/api/v1/exams/{exam.id}"
-                        ),
-                        user=user,
-                    )
+            notifications = await self.notification_repository.create_for_audience(
+                title=f"Экзамен '{exam.title}' уже можно пройти!",
+                body=(
+                    f"Вы уже можете пройти экзамен '{exam.title}'! "
+                    f"Успейте до {exam.end_time}."
+                    f"\n http://{settings.run.host}:{settings.run.port}/api/v1/exams/{exam.id}"
+                ),
+                audience=self.notification_repository.audience(
+                    group_members.c.group_id,
+                    select(group_exams.c.group_id).where(
+                        group_exams.c.exam_id == exam.id
+                    ),
+                    students_only=True,
+                ),
+            )
+            await self.push(notifications)
             await self.exam_repository.mark_exam_as_started(exam)
-            for group in exam.groups:
-                students = await self.user_repository.get_by_group(group)
-                for student in set(students):
-                    await send_email_to_student(student, exam)
+            await exam_cache.invalidate(exam.id)
+            dispatch_exam_started_emails(
+                exam.id, await self.user_repository.get_student_ids_by_exam(exam.id)
+            )
 
-    async def end_scheduled_exams(self) -> None:
-        exams = await self.exam_repository.get_exams_ready_to_end()
+    async def end_scheduled_exams(self, exam_ids: Optional[List[int]] = None) -> None:
+        exams = await self.exam_repository.get_exams_ready_to_end(exam_ids)
         for exam in exams:
             user = exam.author
-            report = await self.exam_repository.create_results_report(exam)
-            await self.notification_repository.create_notification(
+            notification = await self.notification_repository.create_notification(
                 title=f"Экзамен '{exam.title}' завершен.",
                 body=(
                     f"Экзамен '{exam.title}' завершен."
@@ -230,8 +273,16 @@ class NotificationService:
                 ),
                 user=user,
             )
+            await self.push([notification])
             await self.exam_repository.mark_exam_as_ended(exam)
-            await send_email_to_teahcer(exam.author, exam, report)
+            await exam_cache.invalidate(exam.id)
+            await exam_scheduler.unschedule(exam.id)
+            send_exam_ended_email.delay(exam.id)
+
+    async def schedule_upcoming_exams(self, horizon: timedelta) -> None:
+        moment = datetime.now(pytz.UTC) + horizon
+        for exam in await self.exam_repository.get_exams_due_before(moment):
+            await exam_scheduler.schedule(exam)
 
 
 def notification_service_factory(
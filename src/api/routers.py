@@ -5,6 +5,7 @@ from api.chats.routers import router as chat_router
 from api.exams.routers import router as exams_router
 from api.groups.routers import router as groups_router
 from api.materials.routers import router as materials_router
+from api.metrics.routers import router as metrics_router
 from api.news.routers import router as news_router
 from api.notifications.routers import router as notification_router
 from api.users.routers import router as users_router
@@ -18,3 +19,4 @@ router.include_router(exams_router, tags=["exams"])
 router.include_router(notification_router, tags=["notification"])
 router.include_router(news_router, tags=["news"])
 router.include_router(categories_router, tags=["category"])
+router.include_router(metrics_router, tags=["metrics"])
@@ -10,6 +10,9 @@ async def get_current_user(
     request: Request, user_service: UserService = Depends(user_service_factory)
 ):
     if request.user.is_authenticated:
+        instance = getattr(request.user, "instance", None)
+        if instance is not None:
+            return await user_service.attach_user(instance)
         user = await user_service.get_user_by_id(request.user.id)
         return user
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
@@ -103,8 +103,11 @@ async def update_user(
 
 
 @router.get("/get-me", status_code=status.HTTP_200_OK, response_model=UserRead)
-async def get_me(user=Depends(get_current_user)):
-    return user
+async def get_me(
+    user=Depends(get_current_user),
+    user_service: UserService = Depends(user_service_factory),
+):
+    return await user_service.get_user_by_id(user.id, profile="profile")
 
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=List[UserRead])
@@ -139,7 +142,7 @@ async def set_user_ignore(
 async def get_user(
     user_id: int, user_service: UserService = Depends(user_service_factory)
 ):
-    return await user_service.get_user_by_id(user_id)
+    return await user_service.get_user_by_id(user_id, profile="profile")
 
 
 @router.post(
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from config import media_dir, settings
+from core.auth.cache import identity_cache
 from core.database import get_async_session
 from core.database.models import User
 from core.database.repositories import UserRepository
@@ -37,14 +38,21 @@ class UserService:
     def __init__(self, repository: UserRepository):
         self.repository = repository
 
-    async def get_user_by_id(self, user_id: int) -> User:
-        user = await self.repository.get_by_id(user_id)
+    async def get_user_by_id(self, user_id: int, profile: str = "auth") -> User:
+        user = await self.repository.get_by_id(user_id, profile)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
         return user
 
+    async def attach_user(self, user: User) -> User:
+        return await self.repository.merge(user)
+
+    async def save_user(self, user: User) -> None:
+        await self.repository.update(user)
+        await identity_cache.invalidate(user.id)
+
     async def get_user_by_username(self, username: str) -> User:
         user = await self.repository.get_by_username(username)
         if not user:
@@ -64,7 +72,7 @@ class UserService:
     async def get_all_users(self, user: User) -> Sequence[User]:
         if not user.is_superuser:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
-        users = await self.repository.get_all()
+        users = await self.repository.get_all(profile="profile")
         return users
 
     async def user_exists(self, username: str) -> bool:
@@ -77,7 +85,7 @@ class UserService:
         user_data_dict = user_data.model_dump()
         new_user = User(**user_data_dict)
         new_user.image = await save_file(image_file) if image_file else "user.png"
-        new_user.password = generate_passwd_hash(user_data_dict["password"])
+        new_user.password = await generate_passwd_hash(user_data_dict["password"])
         await self.repository.add(new_user)
         return new_user
 
@@ -92,7 +100,7 @@ class UserService:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="User is not activated."
             )
-        password_valid = verify_password(
+        password_valid = await verify_password(
             password=login_data.password, password_hash=user.password
         )
         if password_valid:
@@ -120,8 +128,8 @@ class UserService:
         user_data_dict = user_data.model_dump(exclude_unset=True, exclude_none=True)
         for key, value in user_data_dict.items():
             setattr(user, key, value)
-        await self.repository.update(user)
-        return user
+        await self.save_user(user)
+        return await self.get_user_by_id(user.id, profile="profile")
 
     @staticmethod
     async def _update_user_image(user: User, image_file: UploadFile) -> None:
@@ -132,7 +140,7 @@ class UserService:
         user.image = await save_file(image_file)
 
     async def activate_user(self, user_id: int) -> User:
-        user = await self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id, profile="profile")
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
@@ -143,7 +151,7 @@ class UserService:
                 detail="User is already active.",
             )
         user.is_active = True
-        await self.repository.update(user)
+        await self.save_user(user)
         return user
 
     async def change_online_status(self, user: User) -> User:
@@ -151,16 +159,16 @@ class UserService:
             user.is_online = False
         else:
             user.is_online = True
-        await self.repository.update(user)
-        return user
+        await self.save_user(user)
+        return await self.get_user_by_id(user.id, profile="profile")
 
     async def change_ignore_status(self, user: User) -> User:
         if user.ignore_messages:
             user.ignore_messages = False
         else:
             user.ignore_messages = True
-        await self.repository.update(user)
-        return user
+        await self.save_user(user)
+        return await self.get_user_by_id(user.id, profile="profile")
 
     async def send_password_reset_email(
         self, email: str
@@ -200,10 +208,10 @@ class UserService:
                     detail="User not found."
                 )
 
-            hashed_password = generate_passwd_hash(reset_data.new_password)
+            hashed_password = await generate_passwd_hash(reset_data.new_password)
 
             user.password = hashed_password
-            await self.repository.update(user)
+            await self.save_user(user)
 
             confirm_data = PasswordResetConfirmDataSchema(
                 password_changed_at=datetime.now(timezone.utc)
@@ -8,6 +8,7 @@ from passlib.context import CryptContext
 from starlette import status
 
 from config import JWT_ALGORITHM, settings
+from core.auth.hashing import HashingPoolSaturated, hashing_pool
 
 SECRET = settings.secret.secret_key
 
@@ -15,13 +16,24 @@ SECRET = settings.secret.secret_key
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def generate_passwd_hash(password: str) -> str:
-    password_hash = bcrypt_context.hash(password)
+async def hash_in_pool(func, *args):
+    try:
+        return await hashing_pool.run(func, *args)
+    except HashingPoolSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def generate_passwd_hash(password: str) -> str:
+    password_hash = await hash_in_pool(bcrypt_context.hash, password)
     return password_hash
 
 
-def verify_password(password: str, password_hash: str) -> bool:
-    return bcrypt_context.verify(password, password_hash)
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await hash_in_pool(bcrypt_context.verify, password, password_hash)
 
 
 def create_access_token(
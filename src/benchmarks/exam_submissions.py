@@ -0,0 +1,234 @@
+"""
+Exam submission benchmark.
+
+Submits an exam for N students at once through ExamService.pass_exam and
+reports latency, throughput and statements per submission. The default
+path writes all passed answers with one multi-row INSERT next to the
+result; --per-row replays the old behaviour (one INSERT per answer and a
+refresh of the result after commit).
+
+    python -m benchmarks.exam_submissions --concurrency 30 100 300
+    python -m benchmarks.exam_submissions --concurrency 30 100 300 --per-row
+    python -m benchmarks.exam_submissions --db-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import AsyncAdaptedQueuePool, event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.exams.cache import exam_cache
+from api.exams.schemas import PassingExamData
+from api.exams.service import exam_service_factory
+from api.notifications.service import notification_service_factory
+from core.database.models import (
+    Answer,
+    Base,
+    Exam,
+    ExamResult,
+    Group,
+    PassedChoiceAnswer,
+    PassedTextAnswer,
+    Question,
+    User,
+)
+from core.database.repositories import ResultRepository
+
+QUESTIONS = 40
+
+
+async def create_submission_per_row(
+    self,
+    exam: Exam,
+    student: User,
+    score: Optional[int],
+    choice_answers: List[dict],
+    text_answers: List[dict],
+) -> ExamResult:
+    for answer in choice_answers:
+        self.session.add(PassedChoiceAnswer(**answer))
+    for answer in text_answers:
+        self.session.add(PassedTextAnswer(**answer))
+    new_result = ExamResult(exam_id=exam.id, student_id=student.id, score=score)
+    self.session.add(new_result)
+    await self.session.commit()
+    await self.session.refresh(new_result)
+    return new_result
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+async def seed(session_maker: async_sessionmaker, students: int) -> int:
+    async with session_maker() as session:
+        teacher = User(
+            username="teacher",
+            first_name="teacher",
+            last_name="teacher",
+            email="teacher@example.com",
+            password="-",
+            is_teacher=True,
+        )
+        session.add(teacher)
+        await session.flush()
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "username": f"student{i}",
+                    "first_name": f"first{i}",
+                    "last_name": f"last{i}",
+                    "email": f"student{i}@example.com",
+                    "password": "-",
+                }
+                for i in range(students)
+            ],
+        )
+        members = (
+            await session.scalars(select(User).where(User.is_teacher.is_(False)))
+        ).all()
+        now = datetime.now()
+        exam = Exam(
+            title="benchmark",
+            time=60,
+            author=teacher,
+            start_time=now - timedelta(minutes=5),
+            end_time=now + timedelta(hours=1),
+            is_started=True,
+            quantity_questions=QUESTIONS,
+            groups=[
+                Group(
+                    course=1,
+                    facult="math",
+                    subgroup=1,
+                    methodist=teacher,
+                    members=list(members),
+                )
+            ],
+            questions=[
+                Question(
+                    text=f"question {i}",
+                    order=i,
+                    answers=[
+                        Answer(text=f"answer {j}", is_correct=j == 0) for j in range(4)
+                    ],
+                )
+                for i in range(QUESTIONS)
+            ],
+        )
+        session.add(exam)
+        await session.commit()
+        return exam.id
+
+
+async def run(db_url: Optional[str], concurrency: int) -> dict:
+    db_path = None
+    if db_url is None:
+        db_path = Path(tempfile.mkdtemp()) / "exam_submissions.db"
+        db_url = f"sqlite+aiosqlite:///{db_path}"
+    engine = create_async_engine(
+        db_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=0,
+        pool_timeout=300,
+        **({"connect_args": {"timeout": 300}} if db_path else {}),
+    )
+    session_maker = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    exam_cache.clear()
+    exam_id = await seed(session_maker, concurrency)
+
+    async with session_maker() as session:
+        exam = await exam_service_factory(session).get_exam_by_id(exam_id)
+        answers = {question.id: question.answers[0].id for question in exam.questions}
+        user_ids = (
+            await session.scalars(select(User.id).where(User.is_teacher.is_(False)))
+        ).all()
+    answers_data = PassingExamData.model_validate(
+        {
+            "choise_questions": [
+                {"question_id": question_id, "answer_id": answer_id}
+                for question_id, answer_id in answers.items()
+            ]
+        }
+    )
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async def submit(user_id: int, latencies: list):
+        async with session_maker() as session:
+            exam_service = exam_service_factory(session)
+            user = await session.get(User, user_id)
+            exam = await exam_service.get_exam_by_id(exam_id)
+            started_at = time.perf_counter()
+            await exam_service.pass_exam(
+                user, exam, answers_data, notification_service_factory(session)
+            )
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    latencies = []
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    started_at = time.perf_counter()
+    await asyncio.gather(*(submit(user_id, latencies) for user_id in user_ids))
+    elapsed = time.perf_counter() - started_at
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    async with session_maker() as session:
+        passed = len((await session.scalars(select(PassedChoiceAnswer.id))).all())
+    await engine.dispose()
+    if db_path:
+        db_path.unlink(missing_ok=True)
+    assert passed == concurrency * QUESTIONS
+    return {
+        "throughput": concurrency / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "inserts": sum(s.startswith("INSERT") for s in statements) / concurrency,
+        "statements": len(statements) / concurrency,
+    }
+
+
+async def main(db_url: Optional[str], sizes: list, per_row: bool):
+    if per_row:
+        ResultRepository.create_submission = create_submission_per_row
+    print(f"mode: {'per-row' if per_row else 'bulk'}, {QUESTIONS} answers each")
+    print(
+        f"{'students':>8} {'submits/s':>10} {'p50':>10} {'p99':>10}"
+        f" {'inserts':>8} {'statements':>11}"
+    )
+    for concurrency in sizes:
+        stats = await run(db_url, concurrency)
+        print(
+            f"{concurrency:>8} {stats['throughput']:>10.1f}"
+            f" {stats['p50']:>7.1f} ms {stats['p99']:>7.1f} ms"
+            f" {stats['inserts']:>8.1f} {stats['statements']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[30, 100, 300])
+    parser.add_argument("--db-url", default=None)
+    parser.add_argument(
+        "--per-row", action="store_true", help="one INSERT per answer (old behaviour)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.db_url, args.concurrency, args.per_row))
@@ -0,0 +1,140 @@
+"""
+Login storm benchmark.
+
+Fires concurrent logins at the app while a heartbeat coroutine ticks every
+10 ms on the same event loop, the way websocket handlers share it with the
+HTTP routes. Heartbeat lag is what chat users feel during the storm.
+
+    python -m benchmarks.login_storm --users 200 --concurrency 50
+    python -m benchmarks.login_storm --users 200 --concurrency 50 --inline
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.users import service as user_service
+from api.users.utils import bcrypt_context
+from app import app
+from core.auth.hashing import hashing_pool
+from core.database import get_async_session
+from core.database.models import Base, User
+
+PASSWORD = "password123"
+
+
+async def verify_inline(password: str, password_hash: str) -> bool:
+    return bcrypt_context.verify(password, password_hash)
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+async def heartbeat(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started_at - interval) * 1000)
+
+
+async def login(client: AsyncClient, username: str, latencies: list, codes: dict):
+    started_at = time.perf_counter()
+    response = await client.post(
+        "/users/login", json={"username": username, "password": PASSWORD}
+    )
+    latencies.append((time.perf_counter() - started_at) * 1000)
+    codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+
+async def main(users: int, concurrency: int, inline: bool):
+    db_path = Path(tempfile.mkdtemp()) / "login_storm.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_maker = async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_get_session
+    if inline:
+        user_service.verify_password = verify_inline
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    password_hash = bcrypt_context.hash(PASSWORD)
+    async with session_maker() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "username": f"student{i}",
+                    "first_name": f"first{i}",
+                    "last_name": f"last{i}",
+                    "email": f"student{i}@example.com",
+                    "password": password_hash,
+                    "image": "user.png",
+                    "is_active": True,
+                }
+                for i in range(users)
+            ],
+        )
+        await session.commit()
+
+    latencies, lags, codes = [], [], {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_login(client: AsyncClient, username: str):
+        async with semaphore:
+            await login(client, username, latencies, codes)
+
+    stop = asyncio.Event()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://testserver/api/v1"
+    ) as client:
+        ticker = asyncio.create_task(heartbeat(stop, lags))
+        started_at = time.perf_counter()
+        await asyncio.gather(
+            *(bounded_login(client, f"student{i}") for i in range(users))
+        )
+        elapsed = time.perf_counter() - started_at
+        stop.set()
+        await ticker
+
+    await engine.dispose()
+    db_path.unlink(missing_ok=True)
+
+    print(f"mode:              {'inline' if inline else 'pool'}")
+    print(f"logins:            {users} ({concurrency} concurrent)")
+    print(f"status codes:      {codes}")
+    print(f"throughput:        {users / elapsed:.1f} logins/s")
+    print(f"login p50:         {percentile(latencies, 50):.1f} ms")
+    print(f"login p99:         {percentile(latencies, 99):.1f} ms")
+    print(f"loop lag p50:      {percentile(lags, 50):.1f} ms")
+    print(f"loop lag p99:      {percentile(lags, 99):.1f} ms")
+    print(f"loop lag max:      {max(lags, default=0):.1f} ms")
+    if not inline:
+        print(f"hashing pool:      {hashing_pool.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--inline", action="store_true", help="verify on the event loop (old behaviour)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.concurrency, args.inline))
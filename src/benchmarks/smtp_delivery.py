@@ -0,0 +1,138 @@
+"""
+SMTP delivery benchmark.
+
+Starts a local aiosmtpd server that requires AUTH and delivers N messages
+from W worker threads. The default path goes through the pooled SMTPPool
+from core.tasks.mailer; --per-message replays the old behaviour (a new
+connection and login for every message).
+
+    pip install aiosmtpd
+    python -m benchmarks.smtp_delivery --messages 500 --workers 1 4
+    python -m benchmarks.smtp_delivery --messages 500 --workers 1 4 --per-message
+"""
+
+import argparse
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from typing import List
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from core.tasks.mailer import SMTPPool
+
+HOST = "127.0.0.1"
+PORT = 8025
+USERNAME = "bench@example.com"
+PASSWORD = "bench"
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+        self.logins = 0
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.received += 1
+        return "250 Message accepted for delivery"
+
+
+def build_controller(handler: CountingHandler) -> Controller:
+    def authenticator(server, session, envelope, mechanism, auth_data):
+        handler.logins += 1
+        return AuthResult(
+            success=auth_data.login == USERNAME.encode()
+            and auth_data.password == PASSWORD.encode()
+        )
+
+    return Controller(
+        handler,
+        hostname=HOST,
+        port=PORT,
+        authenticator=authenticator,
+        auth_require_tls=False,
+    )
+
+
+def build_messages(count: int) -> List[tuple]:
+    messages = []
+    for i in range(count):
+        recipient = f"student{i}@example.com"
+        message = MIMEText(f"Здравствуйте student{i}, новое сообщение!", "plain")
+        message["Subject"] = "Новое сообщение!"
+        message["From"] = USERNAME
+        message["To"] = recipient
+        messages.append((recipient, message.as_string()))
+    return messages
+
+
+def send_per_message(recipient: str, message: str) -> None:
+    with smtplib.SMTP(HOST, PORT) as server:
+        server.login(USERNAME, PASSWORD)
+        server.sendmail(USERNAME, recipient, message)
+
+
+def run(messages: List[tuple], workers: int, per_message: bool) -> dict:
+    handler = CountingHandler()
+    controller = build_controller(handler)
+    controller.start()
+    pool = SMTPPool(
+        host=HOST,
+        port=PORT,
+        username=USERNAME,
+        password=PASSWORD,
+        size=workers,
+        max_messages=100,
+        idle_timeout=60.0,
+        rate_limit=0,
+        connection_factory=smtplib.SMTP,
+    )
+    chunks = [messages[i::workers] for i in range(workers)]
+
+    def deliver(chunk):
+        if per_message:
+            for recipient, message in chunk:
+                send_per_message(recipient, message)
+        else:
+            pool.send_many(chunk)
+
+    try:
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(deliver, chunks))
+        elapsed = time.perf_counter() - started_at
+    finally:
+        pool.close()
+        controller.stop()
+    assert handler.received == len(messages)
+    return {
+        "throughput": len(messages) / elapsed,
+        "logins": handler.logins,
+    }
+
+
+def main(count: int, sizes: list, per_message: bool):
+    messages = build_messages(count)
+    print(f"mode: {'per-message' if per_message else 'pooled'}, {count} messages")
+    print(f"{'workers':>8} {'messages/s':>11} {'logins':>7}")
+    for workers in sizes:
+        stats = run(messages, workers, per_message)
+        print(f"{workers:>8} {stats['throughput']:>11.1f} {stats['logins']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--per-message",
+        action="store_true",
+        help="new connection and login per message (old behaviour)",
+    )
+    args = parser.parse_args()
+    main(args.messages, args.workers, args.per_message)
@@ -0,0 +1,96 @@
+"""
+Websocket fan-out benchmark.
+
+Compares CPU time per broadcast message for two ways of serializing a chat
+event: dumping the dict with stdlib json for every recipient (what
+WebSocket.send_json does) and encoding it once into a shared frame, which
+GroupConnectionManager now sends to every socket.
+
+    python -m benchmarks.websocket_fanout --members 50 200 1000 --messages 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from api.chats.group_chats.schemas import GroupMessageRead
+from core.managers.backplane import InMemoryBackplane
+from core.managers.group_websocket_manager import GroupConnectionManager
+
+
+class NullWebSocket:
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    async def send_text(self, data):
+        pass
+
+
+def make_message(i: int) -> GroupMessageRead:
+    return GroupMessageRead.model_validate(
+        {
+            "id": i,
+            "text": "Завтра контрольная по матанализу, не забудьте конспекты " * 3,
+            "sender": {
+                "id": 1,
+                "username": "teacher",
+                "first_name": "Иван",
+                "last_name": "Петров",
+                "email": "teacher@example.com",
+                "is_teacher": True,
+                "is_online": True,
+                "is_superuser": False,
+                "image": "user.png",
+                "created_at": datetime.now(),
+            },
+            "created_at": datetime.now(),
+        }
+    )
+
+
+async def per_recipient(members: int, messages: int) -> float:
+    sockets = [NullWebSocket() for _ in range(members)]
+    started_at = time.process_time()
+    for i in range(messages):
+        message = make_message(i).model_dump(mode="json")
+        for websocket in sockets:
+            await websocket.send_json(message)
+    return time.process_time() - started_at
+
+
+async def encode_once(members: int, messages: int) -> float:
+    manager = GroupConnectionManager(InMemoryBackplane(), max_queue=messages)
+    for i in range(members):
+        await manager.connect(1, f"student{i}", NullWebSocket())
+    started_at = time.process_time()
+    for i in range(messages):
+        await manager.broadcast(1, make_message(i).model_dump_json())
+    while manager.stats()["queued"]:
+        await asyncio.sleep(0)
+    elapsed = time.process_time() - started_at
+    await manager.close()
+    return elapsed
+
+
+async def main(sizes: list, messages: int):
+    print(f"{'members':>8} {'per-recipient':>15} {'encode-once':>13} {'speedup':>8}")
+    for members in sizes:
+        old = await per_recipient(members, messages)
+        new = await encode_once(members, messages)
+        print(
+            f"{members:>8} {old / messages * 1000:>12.3f} ms"
+            f" {new / messages * 1000:>10.3f} ms {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.members, args.messages))
@@ -90,9 +90,57 @@ class RedisSettings(BaseModel):
     url: str = "redis://localhost:6379" if DEBUG else "redis://redis:6379"
 
 
+class CacheSettings(BaseModel):
+    backend: Literal["redis", "memory"] = env.str("CACHE_BACKEND", "redis")
+    identity_ttl: int = 300
+    identity_max_size: int = 10_000
+    exam_ttl: int = 3600
+    exam_max_size: int = 1_000
+
+
+class HashingSettings(BaseModel):
+    workers: int = env.int("HASHING_WORKERS", 4)
+    max_pending: int = env.int("HASHING_MAX_PENDING", 64)
+    retry_after: int = 1
+
+
+class WebsocketSettings(BaseModel):
+    backplane: Literal["memory", "redis"] = env.str("WEBSOCKET_BACKPLANE", "memory")
+    send_queue_size: int = env.int("WEBSOCKET_SEND_QUEUE_SIZE", 256)
+    slow_consumer_policy: Literal["drop_oldest", "disconnect"] = env.str(
+        "WEBSOCKET_SLOW_CONSUMER_POLICY", "drop_oldest"
+    )
+    read_receipt_window: float = env.float("WEBSOCKET_READ_RECEIPT_WINDOW", 1.0)
+
+
+class ExamSettings(BaseModel):
+    queued_submissions: bool = env.bool("EXAM_QUEUED_SUBMISSIONS", False)
+    submission_batch_size: int = env.int("EXAM_SUBMISSION_BATCH_SIZE", 100)
+    submission_poll_interval: float = env.float("EXAM_SUBMISSION_POLL_INTERVAL", 2.0)
+    submission_max_attempts: int = env.int("EXAM_SUBMISSION_MAX_ATTEMPTS", 3)
+    draft_grace: int = 600
+    draft_ttl: int = env.int("EXAM_DRAFT_TTL", 86_400)
+    draft_max_size: int = 10_000
+
+
 class EmailSettings(BaseModel):
     email_host_user: str = EMAIL_HOST_USER
     email_host_password: str = EMAIL_HOST_PASSWORD
+    chunk_size: int = env.int("EMAIL_CHUNK_SIZE", 50)
+    smtp_host: str = env.str("EMAIL_SMTP_HOST", "mail.dgu.ru")
+    smtp_port: int = env.int("EMAIL_SMTP_PORT", 465)
+    pool_size: int = env.int("EMAIL_POOL_SIZE", 2)
+    max_messages_per_connection: int = env.int("EMAIL_MAX_MESSAGES_PER_CONNECTION", 100)
+    idle_timeout: float = 60.0
+    rate_limit: float = env.float("EMAIL_RATE_LIMIT", 0)
+
+
+class NotificationSettings(BaseModel):
+    digest_window: int = env.int("NOTIFICATION_DIGEST_WINDOW", 900)
+    digest_max_size: int = 10_000
+    resume_limit: int = 500
+    retention_days: int = env.int("NOTIFICATION_RETENTION_DAYS", 180)
+    purge_batch_size: int = env.int("NOTIFICATION_PURGE_BATCH_SIZE", 1000)
 
 
 static_dir = BASE_DIR / "static"
@@ -106,6 +154,11 @@ class Settings(BaseSettings):
     db: DbSettings = DbSettings()
     url: str = MEDIA_URL
     redis: RedisSettings = RedisSettings()
+    cache: CacheSettings = CacheSettings()
+    hashing: HashingSettings = HashingSettings()
+    websocket: WebsocketSettings = WebsocketSettings()
+    exams: ExamSettings = ExamSettings()
+    notifications: NotificationSettings = NotificationSettings()
     secret: SecretKey = SecretKey()
     logging: LoggingConfig = LoggingConfig()
     email: EmailSettings = EmailSettings()
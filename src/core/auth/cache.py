@@ -0,0 +1,121 @@
+import logging
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from config import settings
+from core.cache import LRUCache, get_redis
+from core.managers.backplane import Backplane, InMemoryBackplane, RedisBackplane
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityCache:
+    channel = "identity:invalidate"
+
+    def __init__(self, max_size: int, ttl: int, backplane: Optional[Backplane] = None):
+        self.ttl = ttl
+        self._local = LRUCache(max_size=max_size, ttl=ttl)
+        self._tokens_by_user = LRUCache(max_size=max_size, ttl=ttl)
+        self._backplane = backplane
+        self._listening = False
+
+    @property
+    def backplane(self) -> Backplane:
+        if self._backplane is None:
+            if get_redis() is None:
+                self._backplane = InMemoryBackplane()
+            else:
+                self._backplane = RedisBackplane(settings.redis.url)
+        return self._backplane
+
+    @staticmethod
+    def _token_key(jti: str) -> str:
+        return f"identity:jti:{jti}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"identity:user:{user_id}"
+
+    async def listen(self) -> None:
+        if not self._listening:
+            self._listening = True
+            await self.backplane.subscribe(self.channel, self._on_invalidate)
+
+    async def _on_invalidate(self, payload: dict) -> None:
+        self._forget(payload["user_id"])
+
+    async def get(self, jti: str) -> Optional[int]:
+        await self.listen()
+        user_id = self._local.get(jti)
+        if user_id is not None:
+            self._tokens_by_user.get(user_id)
+            return user_id
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            value = await redis.get(self._token_key(jti))
+            ttl = await redis.ttl(self._token_key(jti)) if value else -1
+        except RedisError as e:
+            logger.warning(f"Identity cache is unavailable, detail: {e}")
+            return None
+        if not value:
+            return None
+        user_id = int(value)
+        self._remember(jti, user_id, time.time() + max(ttl, 0))
+        return user_id
+
+    async def set(self, jti: str, user_id: int, expires_at: int) -> None:
+        ttl = int(min(self.ttl, expires_at - time.time()))
+        if ttl <= 0:
+            return
+        await self.listen()
+        self._remember(jti, user_id, expires_at)
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(self._token_key(jti), user_id, ex=ttl)
+                pipe.sadd(self._user_key(user_id), jti)
+                pipe.expire(self._user_key(user_id), self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Identity cache is unavailable, detail: {e}")
+
+    async def invalidate(self, user_id: int) -> None:
+        self._forget(user_id)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                tokens = await redis.smembers(self._user_key(user_id))
+                keys = [self._token_key(jti.decode()) for jti in tokens]
+                await redis.delete(self._user_key(user_id), *keys)
+            except RedisError as e:
+                logger.warning(f"Identity cache is unavailable, detail: {e}")
+        await self.backplane.publish(self.channel, {"user_id": user_id})
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._tokens_by_user.clear()
+
+    def _forget(self, user_id: int) -> None:
+        for jti in self._tokens_by_user.pop(user_id) or ():
+            self._local.pop(jti)
+
+    def _remember(self, jti: str, user_id: int, expires_at: float) -> None:
+        self._local.set(jti, user_id, expires_at)
+        tokens = self._tokens_by_user.get(user_id) or set()
+        tokens.difference_update(
+            [token for token in tokens if token not in self._local]
+        )
+        tokens.add(jti)
+        self._tokens_by_user.set(user_id, tokens)
+
+
+identity_cache = IdentityCache(
+    max_size=settings.cache.identity_max_size,
+    ttl=settings.cache.identity_ttl,
+)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturated(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Hashing pool is saturated.")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int, retry_after: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time = 0.0
+        self.run_time = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="hashing"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(
+                f"Hashing pool is saturated, pending: {self.pending}, "
+                f"rejected: {self.rejected}"
+            )
+            raise HashingPoolSaturated(self.retry_after)
+        self.pending += 1
+        queued_at = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor, self._call, queued_at, func, *args
+            )
+        finally:
+            self.pending -= 1
+
+    def _call(self, queued_at: float, func: Callable[..., T], *args) -> T:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.wait_time += started_at - queued_at
+                self.run_time += time.perf_counter() - started_at
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_time / completed * 1000, 2),
+            "avg_run_ms": round(self.run_time / completed * 1000, 2),
+        }
+
+
+hashing_pool = HashingPool(
+    workers=settings.hashing.workers,
+    max_pending=settings.hashing.max_pending,
+    retry_after=settings.hashing.retry_after,
+)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from jose import JWTError
 from sqlalchemy.future import select
 from starlette.authentication import (
@@ -8,13 +10,15 @@ from starlette.authentication import (
 )
 
 from api.users.utils import decode_token
+from core.auth.cache import identity_cache
 from core.database.db import async_session_maker
 from core.database.models import User
 
 
 class CustomUser(BaseUser):
-    def __init__(self, id: int):
+    def __init__(self, id: int, instance: Optional[User] = None):
         self.id = id
+        self.instance = instance
 
     @property
     def is_authenticated(self) -> bool:
@@ -39,13 +43,19 @@ class HTTPAuthenticationMiddleware(AuthenticationBackend):
             raise AuthenticationError("Invalid JWT Token.") from exc
 
         user_id: int = decoded.get("user_id")
+        jti: Optional[str] = decoded.get("jti")
 
         if not user_id:
             raise AuthenticationError("Token payload is invalid.")
 
+        if jti and await identity_cache.get(jti) == user_id:
+            return AuthCredentials(["authenticated"]), CustomUser(user_id)
+
         async with async_session_maker() as session:
             result = await session.execute(select(User).where(User.id == user_id))
             user = result.scalars().first()
         if not user:
             raise AuthenticationError("User not found.")
-        return AuthCredentials(["authenticated"]), CustomUser(user_id)
+        if jti:
+            await identity_cache.set(jti, user_id, decoded["exp"])
+        return AuthCredentials(["authenticated"]), CustomUser(user_id, user)
@@ -0,0 +1,7 @@
+from .client import get_redis
+from .lru import LRUCache
+
+__all__ = (
+    "get_redis",
+    "LRUCache",
+)
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from config import settings
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    global _redis
+    if settings.cache.backend == "memory":
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis.url)
+    return _redis
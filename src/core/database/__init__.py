@@ -1,7 +1,10 @@
 from .db import (
     engine,
     get_async_session,
+    get_session_maker,
     get_test_async_session,
+    pool_stats,
+    session_scope,
     test_async_session_maker,
     test_engine,
 )
@@ -12,4 +15,7 @@ __all__ = [
     "test_engine",
     "test_async_session_maker",
     "get_test_async_session",
+    "get_session_maker",
+    "session_scope",
+    "pool_stats",
 ]
@@ -1,7 +1,13 @@
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import NullPool, QueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from config import settings
 
@@ -16,6 +22,31 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def get_session_maker() -> async_sessionmaker:
+    return async_session_maker
+
+
+@asynccontextmanager
+async def session_scope(
+    session_maker: async_sessionmaker, *instances
+) -> AsyncGenerator[AsyncSession, None]:
+    async with session_maker() as session:
+        session.add_all(instances)
+        yield session
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
 test_engine = create_async_engine(settings.db.test_url, poolclass=NullPool)
 test_async_session_maker = async_sessionmaker(
     bind=test_engine, class_=AsyncSession, expire_on_commit=False
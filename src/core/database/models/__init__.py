@@ -1,10 +1,11 @@
 from .base import Base, TableNameMixin, timestamp_now
 from .categories import Category
-from .chats import GroupMessage, GroupMessageCheck, PrivateMessage, PrivateRoom
+from .chats import GroupMessage, GroupReadMark, PrivateMessage, PrivateRoom
 from .exams import (
     Answer,
     Exam,
     ExamResult,
+    ExamSubmission,
     PassedChoiceAnswer,
     PassedTextAnswer,
     Question,
@@ -33,12 +34,13 @@ __all__ = (
     "Question",
     "Answer",
     "ExamResult",
+    "ExamSubmission",
     "group_members",
     "Notification",
     "TextQuestion",
     "PassedChoiceAnswer",
     "PassedTextAnswer",
-    "GroupMessageCheck",
+    "GroupReadMark",
     "News",
     "Category",
 )
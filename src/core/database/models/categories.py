@@ -20,7 +20,7 @@ class Category(Base):
     )
 
     newses: Mapped[list["News"]] = relationship(
-        "News", back_populates="category", lazy="selectin"
+        "News", back_populates="category", lazy="raise"
     )
 
     def __repr__(self) -> str:
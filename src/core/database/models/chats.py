@@ -3,14 +3,16 @@ from typing import TYPE_CHECKING, List
 
 from sqlalchemy import (
     BOOLEAN,
+    INTEGER,
     TEXT,
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
     Table,
-    UniqueConstraint,
     false,
     func,
+    inspect,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,13 +29,15 @@ class PrivateRoom(TableNameMixin, Base):
     )
 
     messages: Mapped[List["PrivateMessage"]] = relationship(
-        "PrivateMessage", back_populates="room", lazy="selectin", cascade="all, delete"
+        "PrivateMessage", back_populates="room", lazy="raise", cascade="all, delete"
     )
     members: Mapped[List["User"]] = relationship(
-        "User", secondary="room_members", back_populates="rooms", lazy="selectin"
+        "User", secondary="room_members", back_populates="rooms", lazy="raise"
     )
 
     def __repr__(self):
+        if "members" in inspect(self).unloaded:
+            return f"{self.id}"
         return f"{self.members}"
 
 
@@ -50,48 +54,34 @@ class GroupMessage(TableNameMixin, Base):
         "User", back_populates="sent_group_messages", lazy="selectin"
     )
     group: Mapped["Group"] = relationship(
-        "Group", back_populates="group_messages", lazy="selectin"
+        "Group", back_populates="group_messages", lazy="raise"
     )
-    users_who_checked: Mapped[List["GroupMessageCheck"]] = relationship(
-        "GroupMessageCheck",
-        back_populates="message",
-        lazy="selectin",
-        cascade="all, delete-orphan",
-        passive_deletes=True,
+    __table_args__ = (
+        Index("ix_groupmessages_group_created", "group_id", "created_at", "id"),
     )
 
     def __repr__(self):
         return f"Сообщение от: {self.sender}"
 
 
-class GroupMessageCheck(TableNameMixin, Base):
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+class GroupReadMark(TableNameMixin, Base):
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
-    )
-    message_id: Mapped[int] = mapped_column(
-        ForeignKey("groupmessages.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
-    created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, server_default=func.timezone("UTC+3", func.now()), nullable=False
+    group_id: Mapped[int] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
     )
-
-    user: Mapped["User"] = relationship(
-        "User", back_populates="checked_messages", lazy="selectin"
-    )
-    message: Mapped["GroupMessage"] = relationship(
-        "GroupMessage",
-        back_populates="users_who_checked",
-        lazy="selectin",
-        passive_deletes=True,
+    last_read_message_id: Mapped[int] = mapped_column(INTEGER, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=func.now(), nullable=False
     )
 
     __table_args__ = (
-        UniqueConstraint("user_id", "message_id", name="uq_user_message_check"),
+        Index("ix_groupreadmarks_group_read", "group_id", "last_read_message_id"),
     )
 
     def __repr__(self):
-        return f"{self.user} | {self.created_at}"
+        return f"{self.user_id} | {self.group_id} | {self.last_read_message_id}"
 
 
 class PrivateMessage(TableNameMixin, Base):
@@ -108,7 +98,11 @@ class PrivateMessage(TableNameMixin, Base):
         "User", back_populates="sent_personal_messages", lazy="selectin"
     )
     room: Mapped["PrivateRoom"] = relationship(
-        "PrivateRoom", back_populates="messages", lazy="selectin"
+        "PrivateRoom", back_populates="messages", lazy="raise"
+    )
+
+    __table_args__ = (
+        Index("ix_privatemessages_room_created", "room_id", "created_at", "id"),
     )
 
     def __repr__(self):
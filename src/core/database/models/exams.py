@@ -3,11 +3,15 @@ from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import (
     BOOLEAN,
+    JSON,
     TIMESTAMP,
     Column,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Table,
+    UniqueConstraint,
     false,
     func,
 )
@@ -48,31 +52,44 @@ class Exam(TableNameMixin, Base):
         "Group",
         secondary="group_exams",
         back_populates="exams",
-        lazy="joined",
+        lazy="raise",
     )
     questions: Mapped[List["Question"]] = relationship(
-        "Question", back_populates="exam", lazy="joined", cascade="all, delete"
+        "Question", back_populates="exam", lazy="raise", cascade="all, delete"
     )
     text_questions: Mapped[List["TextQuestion"]] = relationship(
-        "TextQuestion", back_populates="exam", lazy="joined", cascade="all, delete"
+        "TextQuestion", back_populates="exam", lazy="raise", cascade="all, delete"
     )
 
     results: Mapped[List["ExamResult"]] = relationship(
-        "ExamResult", back_populates="exam", lazy="selectin", cascade="all, delete"
+        "ExamResult", back_populates="exam", lazy="raise", cascade="all, delete"
     )
     passed_choice_answers: Mapped[List["PassedChoiceAnswer"]] = relationship(
         "PassedChoiceAnswer",
         back_populates="exam",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     passed_text_answers: Mapped[List["PassedTextAnswer"]] = relationship(
         "PassedTextAnswer",
         back_populates="exam",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
 
+    __table_args__ = (
+        Index(
+            "ix_exams_pending_start",
+            "start_time",
+            postgresql_where=(is_started == false()) & (is_ended == false()),
+        ),
+        Index(
+            "ix_exams_pending_end",
+            "end_time",
+            postgresql_where=is_ended == false(),
+        ),
+    )
+
     def __repr__(self):
         return f"{self.title} | {self.author.username}"
 
@@ -89,7 +106,7 @@ class Question(TableNameMixin, Base):
         lazy="selectin",
     )
     answers: Mapped[List["Answer"]] = relationship(
-        "Answer", back_populates="question", lazy="joined", cascade="all, delete"
+        "Answer", back_populates="question", lazy="raise", cascade="all, delete"
     )
 
     def __repr__(self):
@@ -146,10 +163,50 @@ class ExamResult(TableNameMixin, Base):
         lazy="selectin",
     )
 
+    __table_args__ = (
+        UniqueConstraint("exam_id", "student_id", name="uq_exam_result_student"),
+    )
+
     def __repr__(self):
         return f"{self.exam.title} | {self.student.username} | {self.score}"
 
 
+class ExamSubmission(TableNameMixin, Base):
+    PENDING = "pending"
+    GRADED = "graded"
+    FAILED = "failed"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    exam_id: Mapped[int] = mapped_column(ForeignKey("exams.id", ondelete="CASCADE"))
+    student_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    payload: Mapped[dict] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(16), server_default=PENDING)
+    result_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("examresults.id", ondelete="SET NULL"), nullable=True
+    )
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, server_default="0")
+    created_at: Mapped[func.now()] = mapped_column(
+        TIMESTAMP, server_default=func.now(), nullable=False
+    )
+    graded_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+
+    result: Mapped[Optional["ExamResult"]] = relationship("ExamResult", lazy="raise")
+
+    __table_args__ = (
+        UniqueConstraint("exam_id", "student_id", name="uq_exam_submission_student"),
+        Index(
+            "ix_examsubmissions_pending",
+            "id",
+            postgresql_where=status == PENDING,
+            sqlite_where=status == PENDING,
+        ),
+    )
+
+    def __repr__(self):
+        return f"Submission {self.id} | {self.status}"
+
+
 class PassedChoiceAnswer(TableNameMixin, Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -42,22 +42,22 @@ class Group(TableNameMixin, Base):
         "Lecture",
         back_populates="groups",
         secondary="group_lectures",
-        lazy="selectin",
+        lazy="raise",
     )
     members: Mapped[List["User"]] = relationship(
         "User",
         secondary="group_members",
         back_populates="member_groups",
-        lazy="selectin",
+        lazy="raise",
     )
     group_messages = relationship(
-        "GroupMessage", back_populates="group", lazy="selectin", cascade="all, delete"
+        "GroupMessage", back_populates="group", lazy="raise", cascade="all, delete"
     )
     exams: Mapped[List["Exam"]] = relationship(
         "Exam",
         secondary="group_exams",
         back_populates="groups",
-        lazy="selectin",
+        lazy="raise",
     )
 
     __table_args__ = (
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import TEXT, TIMESTAMP, Column, ForeignKey, String, Table, func
+from sqlalchemy import TEXT, TIMESTAMP, Column, ForeignKey, String, Table, func, inspect
 from sqlalchemy.dialects.mysql import VARCHAR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,10 +27,12 @@ class Lecture(TableNameMixin, Base):
         "Group",
         secondary="group_lectures",
         back_populates="lectures",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self):
+        if "groups" in inspect(self).unloaded:
+            return f"{self.title}"
         return f"{self.title} | {self.groups}"
 
 
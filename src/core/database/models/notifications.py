@@ -1,6 +1,16 @@
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import BOOLEAN, TIMESTAMP, VARCHAR, ForeignKey, false, func
+from sqlalchemy import (
+    BOOLEAN,
+    INTEGER,
+    TIMESTAMP,
+    VARCHAR,
+    ForeignKey,
+    Index,
+    false,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.database.models import Base, TableNameMixin
@@ -15,13 +25,38 @@ class Notification(TableNameMixin, Base):
     title: Mapped[str] = mapped_column(VARCHAR(255))
     body: Mapped[str] = mapped_column(VARCHAR())
     is_read: Mapped[bool] = mapped_column(BOOLEAN, server_default=false())
+    conversation: Mapped[Optional[str]] = mapped_column(VARCHAR(32), nullable=True)
+    message_count: Mapped[int] = mapped_column(INTEGER, server_default="1")
+    last_message_id: Mapped[Optional[int]] = mapped_column(nullable=True)
     created_at: Mapped[func.now()] = mapped_column(
         TIMESTAMP, server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, server_default=func.now(), nullable=False
+    )
+    emailed_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
 
     user: Mapped["User"] = relationship(
         "User", back_populates="notifications", lazy="selectin"
     )
 
+    __table_args__ = (
+        Index(
+            "uq_notifications_unread_conversation",
+            "user_id",
+            "conversation",
+            unique=True,
+            postgresql_where=(is_read == false()) & conversation.is_not(None),
+            sqlite_where=(is_read == false()) & conversation.is_not(None),
+        ),
+        Index("ix_notifications_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_notifications_created", "created_at", "id"),
+        Index(
+            "ix_notifications_unread_user",
+            "user_id",
+            postgresql_where=is_read == false(),
+        ),
+    )
+
     def __repr__(self):
         return f"{self.title} | {self.user}"
@@ -11,7 +11,6 @@ if TYPE_CHECKING:
         ExamResult,
         Group,
         GroupMessage,
-        GroupMessageCheck,
         Lecture,
         Notification,
         PassedChoiceAnswer,
@@ -45,67 +44,64 @@ class User(TableNameMixin, Base):
     created_groups: Mapped[List["Group"]] = relationship(
         "Group",
         back_populates="methodist",
-        lazy="selectin",
+        lazy="raise",
     )
     lectures: Mapped[List["Lecture"]] = relationship(
         "Lecture",
         back_populates="author",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     member_groups: Mapped[List["Group"]] = relationship(
         "Group",
         secondary="group_members",
         back_populates="members",
-        lazy="selectin",
+        lazy="raise",
     )
     sent_group_messages: Mapped[List["GroupMessage"]] = relationship(
         "GroupMessage",
         back_populates="sender",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     sent_personal_messages: Mapped[List["PrivateMessage"]] = relationship(
         "PrivateMessage",
         back_populates="sender",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     rooms: Mapped[List["PrivateRoom"]] = relationship(
         "PrivateRoom",
         secondary="room_members",
         back_populates="members",
-        lazy="selectin",
+        lazy="raise",
     )
     exams: Mapped[List["Exam"]] = relationship(
         "Exam",
         back_populates="author",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     results: Mapped[List["ExamResult"]] = relationship(
         "ExamResult",
         back_populates="student",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     passed_choice_answers: Mapped[List["PassedChoiceAnswer"]] = relationship(
         "PassedChoiceAnswer",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     passed_text_answers: Mapped[List["PassedTextAnswer"]] = relationship(
         "PassedTextAnswer",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete",
     )
     notifications: Mapped[List["Notification"]] = relationship(
-        "Notification", back_populates="user", lazy="selectin", cascade="all, delete"
-    )
-    checked_messages: Mapped[List["GroupMessageCheck"]] = relationship(
-        "GroupMessageCheck", back_populates="user", lazy="selectin"
+        "Notification", back_populates="user", lazy="raise", cascade="all, delete"
     )
 
     def __repr__(self):
@@ -0,0 +1,66 @@
+from typing import Dict, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from core.database.models import (
+    Exam,
+    ExamResult,
+    ExamSubmission,
+    Group,
+    GroupMessage,
+    Lecture,
+    Notification,
+    PrivateMessage,
+    PrivateRoom,
+    Question,
+    User,
+)
+
+LOAD_PROFILES: Dict[str, Tuple[ExecutableOption, ...]] = {
+    "auth": (),
+    "profile": (
+        selectinload(User.created_groups),
+        selectinload(User.member_groups),
+    ),
+    "roster": (selectinload(Group.members),),
+    "chat-sender": (joinedload(GroupMessage.sender),),
+    "private-chat-sender": (joinedload(PrivateMessage.sender),),
+    "room": (selectinload(PrivateRoom.members),),
+    "lecture": (selectinload(Lecture.groups),),
+    "exam-short": (selectinload(Exam.groups),),
+    "exam-full": (
+        selectinload(Exam.groups),
+        selectinload(Exam.questions).selectinload(Question.answers),
+        selectinload(Exam.text_questions),
+    ),
+    "exam-grading": (),
+    "submission": (selectinload(ExamSubmission.result),),
+    "notification": (),
+    "notification-event": (raiseload(Notification.user),),
+    "exam-report": (
+        selectinload(Exam.results)
+        .selectinload(ExamResult.student)
+        .selectinload(User.member_groups),
+    ),
+}
+
+
+def load_profile(name: str) -> Tuple[ExecutableOption, ...]:
+    try:
+        return LOAD_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown load profile: {name}")
+
+
+async def refresh_profile(session: AsyncSession, instance, name: str) -> None:
+    model = type(instance)
+    statement = (
+        select(model)
+        .where(model.id == instance.id)
+        .options(*load_profile(name))
+        .execution_options(populate_existing=True)
+    )
+    await session.execute(statement)
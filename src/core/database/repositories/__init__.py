@@ -10,6 +10,7 @@ from .private_messages import PrivateMessageRepository
 from .questions import QuestionRepository
 from .results import ResultRepository
 from .rooms import RoomRepository
+from .submissions import SubmissionRepository
 from .users import UserRepository
 
 __all__ = (
@@ -20,6 +21,7 @@ __all__ = (
     "QuestionRepository",
     "AnswerRepository",
     "ResultRepository",
+    "SubmissionRepository",
     "MaterialRepository",
     "RoomRepository",
     "PrivateMessageRepository",
@@ -4,7 +4,7 @@ from sqlalchemy import Sequence, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from api.exams.schemas import ExamCreate, SelectedAnswerData, TextAnswerData
+from api.exams.schemas import ExamCreate
 from core.database.models import (
     Answer,
     Exam,
@@ -24,15 +24,6 @@ class AnswerRepository:
         result = await self.session.execute(statement)
         return result.scalars().first()
 
-    async def get_correct_answer(self, answer_id: int, question: Question) -> Answer:
-        statement = select(Answer).where(
-            Answer.id == answer_id,
-            Answer.question == question,
-            Answer.is_correct.is_(True),
-        )
-        result = await self.session.execute(statement)
-        return result.scalars().first()
-
     async def delete(self, answer: Answer) -> None:
         await self.session.delete(answer)
         await self.session.commit()
@@ -83,39 +74,6 @@ class AnswerRepository:
                 )
         return answers
 
-    async def create_passed_text_answers(
-        self, user: User, exam: Exam, answer: TextAnswerData
-    ) -> None:
-        self.session.add(
-            PassedTextAnswer(
-                user_id=user.id,
-                exam_id=exam.id,
-                question_id=answer.question_id,
-                text=answer.text,
-            )
-        )
-
-    async def create_passed_choise_answers(
-        self, user: User, exam: Exam, answer: SelectedAnswerData
-    ) -> None:
-        correct_answer = await self.session.execute(
-            select(Answer).where(
-                Answer.question_id == answer.question_id, Answer.is_correct == True
-            )
-        )
-        correct_answer = correct_answer.scalar()
-        self.session.add(
-            PassedChoiceAnswer(
-                user_id=user.id,
-                exam_id=exam.id,
-                question_id=answer.question_id,
-                selected_answer_id=answer.answer_id,
-                is_correct=answer.answer_id == correct_answer.id
-                if correct_answer
-                else False,
-            )
-        )
-
     async def update_answers(
         self, question: Question, answers_data: List[dict]
     ) -> None:
@@ -1,15 +1,15 @@
 from datetime import datetime
 from io import BytesIO
-from typing import List
+from typing import List, Optional
 
 import pytz
 from openpyxl import Workbook
-from sqlalchemy import Sequence, select
+from sqlalchemy import Sequence, and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from api.exams.schemas import ExamCreate
-from core.database.models import Exam, Group, Question, User
+from core.database.models import Exam, Group, User
+from core.database.profiles import load_profile, refresh_profile
 
 from .answers import AnswerRepository
 from .questions import QuestionRepository
@@ -19,17 +19,8 @@ class ExamRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_by_id(self, exam_id: int) -> Exam | None:
-        stmt = (
-            select(Exam)
-            .where(Exam.id == exam_id)
-            .options(
-                selectinload(Exam.author),
-                selectinload(Exam.groups),
-                selectinload(Exam.questions).selectinload(Question.answers),
-                selectinload(Exam.text_questions),
-            )
-        )
+    async def get_by_id(self, exam_id: int, profile: str = "exam-full") -> Exam | None:
+        stmt = select(Exam).where(Exam.id == exam_id).options(*load_profile(profile))
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -65,12 +56,12 @@ class ExamRepository:
         self.session.add_all(answers)
         self.session.add_all(text_questions)
         await self.session.commit()
-        await self.session.refresh(new_exam)
+        await refresh_profile(self.session, new_exam, "exam-full")
         return new_exam
 
     async def update(self, exam: Exam) -> Exam:
         await self.session.commit()
-        await self.session.refresh(exam)
+        await refresh_profile(self.session, exam, "exam-full")
         return exam
 
     async def delete(self, exam: Exam) -> None:
@@ -78,31 +69,71 @@ class ExamRepository:
         await self.session.commit()
 
     async def get_by_author(self, teacher_id: int) -> Sequence[Exam]:
-        statement = select(Exam).where(Exam.author_id == teacher_id)
+        statement = (
+            select(Exam)
+            .where(Exam.author_id == teacher_id)
+            .options(*load_profile("exam-short"))
+        )
         result = await self.session.execute(statement)
         return result.unique().scalars().all()
 
     async def get_by_group(self, group_id: int) -> Sequence[Exam]:
-        statement = select(Exam).join(Exam.groups).where(Group.id == group_id)
+        statement = (
+            select(Exam)
+            .join(Exam.groups)
+            .where(Group.id == group_id)
+            .options(*load_profile("exam-short"))
+        )
         result = await self.session.execute(statement)
         return result.unique().scalars().all()
 
-    async def get_exams_ready_to_start(self) -> Sequence[Exam]:
-        statement = select(Exam).filter(
-            Exam.start_time <= datetime.now(pytz.UTC),
-            Exam.is_ended == False,
-            Exam.is_started == False,
+    async def get_exams_ready_to_start(
+        self, exam_ids: Optional[List[int]] = None
+    ) -> Sequence[Exam]:
+        statement = (
+            select(Exam)
+            .filter(
+                Exam.start_time <= datetime.now(pytz.UTC),
+                Exam.is_ended == False,
+                Exam.is_started == False,
+            )
+            .options(*load_profile("exam-grading"))
         )
+        if exam_ids is not None:
+            statement = statement.filter(Exam.id.in_(exam_ids))
         result = await self.session.execute(statement)
         return result.unique().scalars().all()
 
-    async def get_exams_ready_to_end(self) -> Sequence[Exam]:
-        statement = select(Exam).filter(
-            Exam.end_time <= datetime.now(pytz.timezone("UTC")), Exam.is_ended == False
+    async def get_exams_ready_to_end(
+        self, exam_ids: Optional[List[int]] = None
+    ) -> Sequence[Exam]:
+        statement = (
+            select(Exam)
+            .filter(
+                Exam.end_time <= datetime.now(pytz.timezone("UTC")),
+                Exam.is_ended == False,
+            )
+            .options(*load_profile("exam-grading"))
         )
+        if exam_ids is not None:
+            statement = statement.filter(Exam.id.in_(exam_ids))
         result = await self.session.execute(statement)
         return result.unique().scalars().all()
 
+    async def get_exams_due_before(self, moment: datetime) -> Sequence[Exam]:
+        statement = select(Exam).filter(
+            or_(
+                and_(
+                    Exam.is_started == False,
+                    Exam.is_ended == False,
+                    Exam.start_time <= moment,
+                ),
+                and_(Exam.is_ended == False, Exam.end_time <= moment),
+            )
+        )
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
     async def mark_exam_as_started(self, exam: Exam) -> None:
         exam.is_started = True
         await self.session.commit()
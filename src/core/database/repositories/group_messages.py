@@ -1,10 +1,12 @@
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import Sequence, select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import ScalarSelect, Sequence, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database.models import Group, GroupMessage, GroupMessageCheck, User
+from core.database.models import Group, GroupMessage, GroupReadMark, User
+from core.database.profiles import load_profile
 
 
 class GroupMessageRepository:
@@ -17,44 +19,88 @@ class GroupMessageRepository:
         return result.scalar_one_or_none()
 
     async def get_messages_by_group(
-        self, group: Group, offset: int, limit: int
+        self,
+        group: Group,
+        before: Optional[int],
+        after: Optional[int],
+        limit: int,
     ) -> Sequence[GroupMessage]:
+        position = tuple_(GroupMessage.created_at, GroupMessage.id)
         statement = (
             select(GroupMessage)
             .where(GroupMessage.group_id == group.id)
-            .order_by(GroupMessage.created_at.desc())
-            .offset(offset)
+            .options(*load_profile("chat-sender"))
             .limit(limit)
         )
+        if after is not None:
+            statement = statement.where(
+                position > self._position(group, after)
+            ).order_by(GroupMessage.created_at, GroupMessage.id)
+        else:
+            if before is not None:
+                statement = statement.where(position < self._position(group, before))
+            statement = statement.order_by(
+                GroupMessage.created_at.desc(), GroupMessage.id.desc()
+            )
         result = await self.session.execute(statement)
-        return result.scalars().all()
+        messages = result.scalars().all()
+        return messages[::-1] if after is not None else messages
+
+    @staticmethod
+    def _position(group: Group, message_id: int) -> ScalarSelect:
+        return (
+            select(GroupMessage.created_at, GroupMessage.id)
+            .where(GroupMessage.id == message_id, GroupMessage.group_id == group.id)
+            .scalar_subquery()
+        )
 
     async def set_group_message_as_read(
-        self,
-        user_id: int,
-        message_ids: List[int],
+        self, user_id: int, group_id: int, message_ids: List[int]
     ) -> None:
-        existing_checks = await self.session.execute(
-            select(GroupMessageCheck.message_id)
-            .where(GroupMessageCheck.user_id == user_id)
-            .where(GroupMessageCheck.message_id.in_(message_ids))
+        if not message_ids:
+            return
+        last_read = (
+            select(func.max(GroupMessage.id))
+            .where(GroupMessage.group_id == group_id, GroupMessage.id.in_(message_ids))
+            .scalar_subquery()
         )
-        existing_message_ids = {row[0] for row in existing_checks.fetchall()}
-        new_checks = [
-            GroupMessageCheck(user_id=user_id, message_id=message_id)
-            for message_id in message_ids
-            if message_id not in existing_message_ids
-        ]
-        if new_checks:
-            self.session.add_all(new_checks)
-            try:
-                await self.session.commit()
-            except IntegrityError:
-                await self.session.rollback()
+        dialect_insert = (
+            sqlite_insert
+            if self.session.bind.dialect.name == "sqlite"
+            else postgresql_insert
+        )
+        statement = dialect_insert(GroupReadMark).from_select(
+            ["user_id", "group_id", "last_read_message_id"],
+            select(literal(user_id), literal(group_id), last_read).where(
+                last_read.is_not(None)
+            ),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[GroupReadMark.user_id, GroupReadMark.group_id],
+            set_={
+                "last_read_message_id": statement.excluded.last_read_message_id,
+                "updated_at": func.now(),
+            },
+            where=statement.excluded.last_read_message_id
+            > GroupReadMark.last_read_message_id,
+        )
+        try:
+            await self.session.execute(statement)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
 
-    async def get_checks(self, message: GroupMessage) -> Sequence[GroupMessageCheck]:
-        statement = select(GroupMessageCheck).where(
-            GroupMessageCheck.message_id == message.id
+    async def get_readers(self, message: GroupMessage) -> Sequence[User]:
+        statement = (
+            select(User)
+            .join(GroupReadMark, GroupReadMark.user_id == User.id)
+            .where(
+                GroupReadMark.group_id == message.group_id,
+                GroupReadMark.last_read_message_id >= message.id,
+                User.id != message.sender_id,
+            )
+            .order_by(User.id)
         )
         result = await self.session.execute(statement)
         return result.scalars().all()
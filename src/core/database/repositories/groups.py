@@ -5,30 +5,41 @@ from sqlalchemy.future import select
 from api.groups.schemas import GroupCreate
 from api.materials.schemas import LectureCreate
 from core.database.models import Group, User
+from core.database.profiles import load_profile
 
 
 class GroupRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_by_id(self, group_id: int) -> Group:
-        statement = select(Group).where(Group.id == group_id)
+    async def get_by_id(self, group_id: int, profile: str = "roster") -> Group:
+        statement = (
+            select(Group).where(Group.id == group_id).options(*load_profile(profile))
+        )
         result = await self.session.execute(statement)
         return result.scalars().first()
 
     async def get_all(self) -> Sequence[Group]:
-        statement = select(Group)
+        statement = select(Group).options(*load_profile("roster"))
         result = await self.session.execute(statement)
         return result.scalars().all()
 
     async def get_my_groups(self, user: User) -> Sequence[Group]:
-        group_ids = [group.id for group in user.member_groups]
-        statement = select(Group).where(Group.id.in_(group_ids))
+        statement = (
+            select(Group)
+            .join(Group.members)
+            .where(User.id == user.id)
+            .options(*load_profile("roster"))
+        )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
     async def get_by_curator(self, user: User) -> Sequence[Group]:
-        statement = select(Group).where(Group.methodist == user)
+        statement = (
+            select(Group)
+            .where(Group.methodist == user)
+            .options(*load_profile("roster"))
+        )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
@@ -38,7 +49,11 @@ class GroupRepository:
         return result.scalars().all()
 
     async def get_by_invite_token(self, invite_token: str) -> Group:
-        statement = select(Group).where(Group.invite_token == invite_token)
+        statement = (
+            select(Group)
+            .where(Group.invite_token == invite_token)
+            .options(*load_profile("roster"))
+        )
         result = await self.session.execute(statement)
         return result.scalars().first()
 
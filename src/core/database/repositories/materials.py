@@ -2,9 +2,9 @@ from typing import List
 
 from sqlalchemy import Sequence, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased
 
 from core.database.models import Group, Lecture, User, group_lectures
+from core.database.profiles import load_profile, refresh_profile
 
 
 class MaterialRepository:
@@ -12,7 +12,11 @@ class MaterialRepository:
         self.session = session
 
     async def get_by_id(self, lecture_id: int) -> Lecture:
-        statement = select(Lecture).where(Lecture.id == lecture_id)
+        statement = (
+            select(Lecture)
+            .where(Lecture.id == lecture_id)
+            .options(*load_profile("lecture"))
+        )
         result = await self.session.execute(statement)
         return result.scalars().first()
 
@@ -20,27 +24,33 @@ class MaterialRepository:
         statement = (
             select(Lecture)
             .where(Lecture.author == user)
+            .options(*load_profile("lecture"))
             .order_by(Lecture.created_at.desc())
         )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
     async def get_by_author(self, author_id: int, group_id: int) -> Sequence[Lecture]:
-        lecture_alias = aliased(Lecture)
         statement = (
-            select(lecture_alias)
-            .join(group_lectures, lecture_alias.id == group_lectures.c.lecture_id)
+            select(Lecture)
+            .join(group_lectures, Lecture.id == group_lectures.c.lecture_id)
             .where(
-                author_id == lecture_alias.author_id,
+                author_id == Lecture.author_id,
                 group_id == group_lectures.c.group_id,
             )
-            .order_by(lecture_alias.created_at.desc())
+            .options(*load_profile("lecture"))
+            .order_by(Lecture.created_at.desc())
         )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
     async def get_by_group(self, group_id: int) -> Sequence[Lecture]:
-        statement = select(Lecture).join(Lecture.groups).where(Group.id == group_id)
+        statement = (
+            select(Lecture)
+            .join(Lecture.groups)
+            .where(Group.id == group_id)
+            .options(*load_profile("lecture"))
+        )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
@@ -53,7 +63,7 @@ class MaterialRepository:
             )
         )
         await self.session.commit()
-        await self.session.refresh(lecture)
+        await refresh_profile(self.session, lecture, "lecture")
 
     async def update(self, lecture: Lecture) -> None:
         await self.session.commit()
@@ -1,31 +1,237 @@
-from sqlalchemy import Sequence
+from datetime import datetime
+from typing import Iterable, Optional, Tuple, Union
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Insert,
+    Select,
+    Sequence,
+    Update,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from core.database.models import Notification, User
+from core.database.profiles import load_profile
 
 
 class NotificationRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self, user: User) -> Sequence[Notification]:
-        statement = select(Notification).where(Notification.user_id == user.id)
+    async def get_page(
+        self, user_id: int, before: Optional[Tuple[datetime, int]], limit: int
+    ) -> Sequence[Notification]:
+        statement = (
+            select(Notification)
+            .where(Notification.user_id == user_id)
+            .order_by(Notification.updated_at.desc(), Notification.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            statement = statement.where(
+                tuple_(Notification.updated_at, Notification.id) < tuple_(*before)
+            )
         result = await self.session.execute(statement)
         return result.scalars().all()
 
+    async def count_unread(self, user_id: int) -> int:
+        statement = select(func.count()).where(
+            Notification.user_id == user_id, Notification.is_read == false()
+        )
+        return await self.session.scalar(statement)
+
     async def get_unreads(self, user: User) -> Sequence[Notification]:
-        statement = select(Notification).where(
-            Notification.user_id == user.id, Notification.is_read == False
+        statement = (
+            update(Notification)
+            .where(Notification.user_id == user.id, Notification.is_read == false())
+            .values(is_read=True)
+        )
+        return await self._write(statement, profile="notification")
+
+    async def mark_read(
+        self, user_id: int, up_to: Optional[Tuple[datetime, int]]
+    ) -> Sequence[int]:
+        statement = (
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == false())
+            .values(is_read=True)
+            .returning(Notification.id)
+        )
+        if up_to is not None:
+            statement = statement.where(
+                tuple_(Notification.updated_at, Notification.id) <= tuple_(*up_to)
+            )
+        try:
+            result = await self.session.scalars(statement)
+            marked = result.all()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return marked
+
+    async def get_since(
+        self, user_id: int, cursor: Optional[Tuple[datetime, int]], limit: int
+    ) -> Sequence[Notification]:
+        statement = (
+            select(Notification)
+            .where(Notification.user_id == user_id)
+            .options(*load_profile("notification-event"))
+        )
+        if cursor is None:
+            statement = statement.where(Notification.is_read == false())
+        else:
+            statement = statement.where(
+                tuple_(Notification.updated_at, Notification.id) > tuple_(*cursor)
+            )
+        statement = statement.order_by(Notification.updated_at, Notification.id).limit(
+            limit
         )
         result = await self.session.execute(statement)
-        notifications = result.scalars().all()
-        for notification in notifications:
-            notification.is_read = True
-        await self.session.commit()
-        return notifications
+        return result.scalars().all()
+
+    async def create_notification(
+        self, title: str, body: str, user: User
+    ) -> Notification:
+        statement = insert(Notification).values(title=title, body=body, user_id=user.id)
+        return (await self._write(statement))[0]
 
-    async def create_notification(self, title: str, body: str, user: User) -> None:
-        notification = Notification(title=title, body=body, user_id=user.id)
-        self.session.add(notification)
-        await self.session.commit()
+    @staticmethod
+    def audience(
+        scope_column: Column,
+        scope: Union[Iterable[int], Select],
+        exclude_user_id: Optional[int] = None,
+        students_only: bool = False,
+        skip_ignoring: bool = False,
+    ) -> Select:
+        members = scope_column.table
+        statement = select(User.id).where(
+            User.id.in_(select(members.c.user_id).where(scope_column.in_(scope)))
+        )
+        if exclude_user_id is not None:
+            statement = statement.where(User.id != exclude_user_id)
+        if students_only:
+            statement = statement.where(User.is_teacher.is_(False))
+        if skip_ignoring:
+            statement = statement.where(User.ignore_messages.is_(False))
+        return statement
+
+    async def create_for_audience(
+        self, title: str, body: Union[str, ColumnElement[str]], audience: Select
+    ) -> Sequence[Notification]:
+        if isinstance(body, str):
+            body = literal(body)
+        statement = insert(Notification).from_select(
+            ["user_id", "title", "body"],
+            audience.add_columns(literal(title), body),
+        )
+        return await self._write(statement)
+
+    async def upsert_for_audience(
+        self,
+        conversation: str,
+        title: str,
+        body: str,
+        last_message_id: int,
+        audience: Select,
+    ) -> Sequence[Notification]:
+        dialect_insert = (
+            sqlite_insert
+            if self.session.bind.dialect.name == "sqlite"
+            else postgresql_insert
+        )
+        statement = dialect_insert(Notification).from_select(
+            ["user_id", "conversation", "title", "body", "last_message_id"],
+            audience.add_columns(
+                literal(conversation),
+                literal(title),
+                literal(body),
+                literal(last_message_id),
+            ),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Notification.user_id, Notification.conversation],
+            index_where=(Notification.is_read == false())
+            & Notification.conversation.is_not(None),
+            set_={
+                "body": statement.excluded.body,
+                "last_message_id": statement.excluded.last_message_id,
+                "message_count": Notification.message_count + 1,
+                "updated_at": func.now(),
+            },
+        )
+        return await self._write(statement)
+
+    async def purge_read(
+        self, before: datetime, after: Optional[Tuple[datetime, int]], limit: int
+    ) -> Tuple[Optional[Tuple[datetime, int]], int]:
+        statement = (
+            select(Notification.created_at, Notification.id)
+            .where(Notification.created_at < before)
+            .order_by(Notification.created_at, Notification.id)
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(
+                tuple_(Notification.created_at, Notification.id) > tuple_(*after)
+            )
+        window = (await self.session.execute(statement)).all()
+        if not window:
+            return None, 0
+        try:
+            result = await self.session.execute(
+                delete(Notification).where(
+                    Notification.id.in_([id for _, id in window]),
+                    Notification.is_read.is_(True),
+                )
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return tuple(window[-1]), result.rowcount
+
+    async def stats(self) -> dict:
+        statement = select(
+            func.count(),
+            func.count().filter(Notification.is_read.is_(True)),
+            func.min(Notification.created_at),
+        )
+        total, read, oldest = (await self.session.execute(statement)).one()
+        size = None
+        if self.session.bind.dialect.name == "postgresql":
+            size = await self.session.scalar(
+                select(
+                    func.pg_total_relation_size(
+                        literal_column(f"'{Notification.__table__.name}'::regclass")
+                    )
+                )
+            )
+        return {"rows": total, "read": read, "oldest": oldest, "size_bytes": size}
+
+    async def _write(
+        self, statement: Union[Insert, Update], profile: str = "notification-event"
+    ) -> Sequence[Notification]:
+        statement = statement.returning(Notification).options(*load_profile(profile))
+        try:
+            result = await self.session.scalars(
+                statement, execution_options={"populate_existing": True}
+            )
+            notifications = result.all()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return notifications
@@ -1,7 +1,10 @@
-from sqlalchemy import Sequence, desc, select, update
+from typing import Optional
+
+from sqlalchemy import ScalarSelect, Sequence, desc, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.models import PrivateMessage, PrivateRoom, User
+from core.database.profiles import load_profile
 
 
 class PrivateMessageRepository:
@@ -9,17 +12,40 @@ class PrivateMessageRepository:
         self.session = session
 
     async def get_by_room(
-        self, room: PrivateRoom, offset: int, limit: int
+        self,
+        room: PrivateRoom,
+        before: Optional[int],
+        after: Optional[int],
+        limit: int,
     ) -> Sequence[PrivateMessage]:
+        position = tuple_(PrivateMessage.created_at, PrivateMessage.id)
         statement = (
             select(PrivateMessage)
             .where(PrivateMessage.room_id == room.id)
-            .order_by(PrivateMessage.created_at.desc())
-            .offset(offset)
+            .options(*load_profile("private-chat-sender"))
             .limit(limit)
         )
+        if after is not None:
+            statement = statement.where(
+                position > self._position(room, after)
+            ).order_by(PrivateMessage.created_at, PrivateMessage.id)
+        else:
+            if before is not None:
+                statement = statement.where(position < self._position(room, before))
+            statement = statement.order_by(
+                PrivateMessage.created_at.desc(), PrivateMessage.id.desc()
+            )
         result = await self.session.execute(statement)
-        return result.scalars().all()
+        messages = result.scalars().all()
+        return messages[::-1] if after is not None else messages
+
+    @staticmethod
+    def _position(room: PrivateRoom, message_id: int) -> ScalarSelect:
+        return (
+            select(PrivateMessage.created_at, PrivateMessage.id)
+            .where(PrivateMessage.id == message_id, PrivateMessage.room_id == room.id)
+            .scalar_subquery()
+        )
 
     async def get_last_message(self, room: PrivateRoom) -> PrivateMessage:
         statement = (
@@ -1,10 +1,10 @@
-from typing import List
+from typing import List, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.exams.schemas import ExamCreate, TextQuestionUpdate
-from core.database.models import Exam, Question, TextQuestion
+from core.database.models import Answer, Exam, Question, TextQuestion
 
 from .answers import AnswerRepository
 
@@ -23,6 +23,24 @@ class QuestionRepository:
         result = await self.session.execute(statement)
         return result.scalars().first()
 
+    async def get_exam_id(self, question_id: int) -> int | None:
+        statement = select(Question.exam_id).where(Question.id == question_id)
+        result = await self.session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def get_answer_key_rows(
+        self, exam_id: int
+    ) -> Tuple[Sequence[Row], Sequence[int]]:
+        choice_rows = await self.session.execute(
+            select(Question.id, Answer.id, Answer.is_correct)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(Question.exam_id == exam_id)
+        )
+        text_question_ids = await self.session.execute(
+            select(TextQuestion.id).where(TextQuestion.exam_id == exam_id)
+        )
+        return choice_rows.all(), text_question_ids.scalars().all()
+
     @staticmethod
     async def create_questions(exam_data: ExamCreate, exam_id: int) -> List[Question]:
         if not exam_data.questions:
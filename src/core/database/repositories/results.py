@@ -1,9 +1,15 @@
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
-from sqlalchemy import Sequence, select
+from sqlalchemy import Sequence, exists, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database.models import ExamResult, User
+from core.database.models import (
+    Exam,
+    ExamResult,
+    PassedChoiceAnswer,
+    PassedTextAnswer,
+    User,
+)
 
 
 class ResultRepository:
@@ -25,6 +31,14 @@ class ResultRepository:
         result = await self.session.execute(statement)
         return result.scalars().all()
 
+    async def exists(self, exam_id: int, student_id: int) -> bool:
+        statement = select(
+            exists().where(
+                ExamResult.exam_id == exam_id, ExamResult.student_id == student_id
+            )
+        )
+        return await self.session.scalar(statement)
+
     async def create(
         self, exam_id: int, user_id: int, score: Optional[int] = None
     ) -> ExamResult:
@@ -44,6 +58,47 @@ class ResultRepository:
         await self.session.refresh(new_result)
         return new_result
 
+    async def create_submission(
+        self,
+        exam: Exam,
+        student: User,
+        score: Optional[int],
+        choice_answers: List[dict],
+        text_answers: List[dict],
+    ) -> ExamResult:
+        new_result = ExamResult(exam=exam, student=student, score=score)
+        try:
+            await self.add_results([new_result], choice_answers, text_answers)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return new_result
+
+    async def add_results(
+        self,
+        results: List[ExamResult],
+        choice_answers: List[dict],
+        text_answers: List[dict],
+    ) -> None:
+        self.session.add_all(results)
+        await self.session.flush()
+        if choice_answers:
+            await self.session.execute(insert(PassedChoiceAnswer), choice_answers)
+        if text_answers:
+            await self.session.execute(insert(PassedTextAnswer), text_answers)
+
+    async def get_passed_pairs(
+        self, pairs: List[Tuple[int, int]]
+    ) -> Set[Tuple[int, int]]:
+        if not pairs:
+            return set()
+        statement = select(ExamResult.exam_id, ExamResult.student_id).where(
+            tuple_(ExamResult.exam_id, ExamResult.student_id).in_(pairs)
+        )
+        result = await self.session.execute(statement)
+        return {(exam_id, student_id) for exam_id, student_id in result.all()}
+
     async def update(self, result: ExamResult) -> None:
         await self.session.commit()
         await self.session.refresh(result)
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.models import PrivateRoom, User
 from core.database.models.chats import room_members
+from core.database.profiles import load_profile
 
 
 class RoomRepository:
@@ -14,6 +15,7 @@ class RoomRepository:
             select(PrivateRoom)
             .join(room_members, PrivateRoom.id == room_members.c.room_id)
             .where(user.id == room_members.c.user_id)
+            .options(*load_profile("room"))
         )
         result = await self.session.execute(statement)
         return result.scalars().all()
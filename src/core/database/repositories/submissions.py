@@ -0,0 +1,153 @@
+from typing import List, Optional
+
+from sqlalchemy import TIMESTAMP, Sequence, case, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database.models import ExamSubmission
+from core.database.profiles import load_profile
+
+
+class SubmissionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(
+        self, submission_id: int, profile: str = "submission"
+    ) -> Optional[ExamSubmission]:
+        statement = (
+            select(ExamSubmission)
+            .where(ExamSubmission.id == submission_id)
+            .options(*load_profile(profile))
+        )
+        result = await self.session.execute(statement)
+        return result.scalars().first()
+
+    async def get_status(self, exam_id: int, student_id: int) -> Optional[str]:
+        statement = select(ExamSubmission.status).where(
+            ExamSubmission.exam_id == exam_id, ExamSubmission.student_id == student_id
+        )
+        return await self.session.scalar(statement)
+
+    async def create(
+        self, exam_id: int, student_id: int, payload: dict
+    ) -> Optional[ExamSubmission]:
+        dialect_insert = (
+            sqlite_insert
+            if self.session.bind.dialect.name == "sqlite"
+            else postgresql_insert
+        )
+        statement = dialect_insert(ExamSubmission).values(
+            exam_id=exam_id,
+            student_id=student_id,
+            payload=payload,
+            status=ExamSubmission.PENDING,
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                index_elements=[ExamSubmission.exam_id, ExamSubmission.student_id],
+                set_={
+                    "payload": statement.excluded.payload,
+                    "status": ExamSubmission.PENDING,
+                    "error": None,
+                    "attempts": 0,
+                    "result_id": None,
+                    "created_at": func.now(),
+                    "graded_at": None,
+                },
+                where=ExamSubmission.status == ExamSubmission.FAILED,
+            )
+            .returning(ExamSubmission)
+            .options(*load_profile("submission"))
+        )
+        try:
+            submission = await self.session.scalar(
+                statement, execution_options={"populate_existing": True}
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return submission
+
+    async def claim_pending(self, limit: int) -> Sequence[ExamSubmission]:
+        statement = (
+            select(ExamSubmission)
+            .where(ExamSubmission.status == ExamSubmission.PENDING)
+            .order_by(ExamSubmission.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
+    async def record_failure(
+        self, submission_ids: List[int], error: str, max_attempts: int
+    ) -> None:
+        await self.session.rollback()
+        attempts = ExamSubmission.attempts + 1
+        exhausted = attempts >= max_attempts
+        statement = (
+            update(ExamSubmission)
+            .where(
+                ExamSubmission.id.in_(submission_ids),
+                ExamSubmission.status == ExamSubmission.PENDING,
+            )
+            .values(
+                attempts=attempts,
+                status=case(
+                    (exhausted, ExamSubmission.FAILED), else_=ExamSubmission.status
+                ),
+                error=case((exhausted, error), else_=ExamSubmission.error),
+                graded_at=case((exhausted, func.now()), else_=ExamSubmission.graded_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            await self.session.execute(statement)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def stats(self) -> dict:
+        statement = select(
+            ExamSubmission.status,
+            func.count(),
+            func.min(ExamSubmission.created_at),
+            func.now(type_=TIMESTAMP),
+        ).group_by(ExamSubmission.status)
+        result = await self.session.execute(statement)
+        stats = {
+            ExamSubmission.PENDING: 0,
+            ExamSubmission.GRADED: 0,
+            ExamSubmission.FAILED: 0,
+            "oldest_pending_seconds": 0.0,
+        }
+        for status, count, oldest, now in result.all():
+            stats[status] = count
+            if status == ExamSubmission.PENDING and oldest is not None:
+                stats["oldest_pending_seconds"] = max(
+                    (now - oldest).total_seconds(), 0.0
+                )
+        return stats
+
+    async def commit(self) -> None:
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    @staticmethod
+    def mark_graded(submission: ExamSubmission, result_id: int) -> None:
+        submission.status = ExamSubmission.GRADED
+        submission.result_id = result_id
+        submission.graded_at = func.now()
+
+    @staticmethod
+    def mark_failed(submission: ExamSubmission, error: str) -> None:
+        submission.status = ExamSubmission.FAILED
+        submission.error = error
+        submission.graded_at = func.now()
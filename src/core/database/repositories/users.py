@@ -1,4 +1,6 @@
-from sqlalchemy import Sequence
+from typing import List
+
+from sqlalchemy import Sequence, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -10,24 +12,38 @@ from core.database.models import (
     PrivateMessage,
     PrivateRoom,
     User,
+    group_exams,
+    group_members,
 )
+from core.database.profiles import load_profile
 
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self) -> Sequence[User]:
-        statement = select(User)
+    async def get_all(self, profile: str = "auth") -> Sequence[User]:
+        statement = select(User).options(*load_profile(profile))
         result = await self.session.execute(statement)
         users = result.scalars().all()
         return users
 
-    async def get_by_id(self, user_id: int) -> User:
-        statement = select(User).where(User.id == user_id)
+    async def get_by_id(self, user_id: int, profile: str = "auth") -> User:
+        statement = (
+            select(User).where(User.id == user_id).options(*load_profile(profile))
+        )
         result = await self.session.execute(statement)
         return result.scalars().first()
 
+    async def get_by_ids(
+        self, user_ids: List[int], profile: str = "auth"
+    ) -> Sequence[User]:
+        statement = (
+            select(User).where(User.id.in_(user_ids)).options(*load_profile(profile))
+        )
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
     async def get_by_username(self, username: str) -> User:
         statement = select(User).where(User.username == username)
         result = await self.session.execute(statement)
@@ -60,6 +76,27 @@ class UserRepository:
         result = await self.session.execute(statement)
         return result.scalars().all()
 
+    async def get_student_ids_by_exam(self, exam_id: int) -> List[int]:
+        statement = (
+            select(User.id)
+            .join(group_members, group_members.c.user_id == User.id)
+            .join(group_exams, group_exams.c.group_id == group_members.c.group_id)
+            .where(group_exams.c.exam_id == exam_id, User.is_teacher.is_(False))
+            .distinct()
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def is_exam_member(self, user_id: int, exam_id: int) -> bool:
+        statement = select(
+            exists().where(
+                group_members.c.user_id == user_id,
+                group_members.c.group_id == group_exams.c.group_id,
+                group_exams.c.exam_id == exam_id,
+            )
+        )
+        return await self.session.scalar(statement)
+
     async def get_by_group(self, group: Group) -> User:
         statement = select(User).where(User.member_groups.any(Group.id == group.id))
         result = await self.session.execute(statement)
@@ -92,6 +129,9 @@ class UserRepository:
         await self.session.commit()
         await self.session.refresh(user)
 
+    async def merge(self, user: User) -> User:
+        return await self.session.merge(user, load=False)
+
     async def update(self, user: User) -> None:
         await self.session.commit()
         await self.session.refresh(user)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import orjson
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class Backplane(ABC):
+    @abstractmethod
+    async def publish(self, channel: str, payload: dict) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBackplane(Backplane):
+    def __init__(self, hub: Optional[Dict[str, List[Handler]]] = None):
+        self.hub = hub if hub is not None else {}
+        self._handlers: Dict[str, Handler] = {}
+
+    async def publish(self, channel: str, payload: dict) -> None:
+        data = orjson.dumps(payload)
+        for handler in list(self.hub.get(channel, [])):
+            await handler(orjson.loads(data))
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        self._handlers[channel] = handler
+        self.hub.setdefault(channel, []).append(handler)
+
+    async def unsubscribe(self, channel: str) -> None:
+        handler = self._handlers.pop(channel, None)
+        handlers = self.hub.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self.hub.pop(channel, None)
+
+
+class RedisBackplane(Backplane):
+    min_retry_delay = 1.0
+    max_retry_delay = 30.0
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis: Optional[Redis] = None
+        self._pubsub: Optional[PubSub] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._handlers: Dict[str, Handler] = {}
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(self.url)
+        return self._redis
+
+    @property
+    def pubsub(self) -> PubSub:
+        if self._pubsub is None:
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    async def publish(self, channel: str, payload: dict) -> None:
+        try:
+            await self.redis.publish(channel, orjson.dumps(payload))
+        except RedisError as e:
+            logger.warning(f"Backplane publish failed, detail: {e}")
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        self._handlers[channel] = handler
+        try:
+            await self.pubsub.subscribe(channel)
+        except RedisError as e:
+            logger.warning(f"Backplane subscribe failed, retrying, detail: {e}")
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._handlers.pop(channel, None)
+        if self._pubsub is None or channel.encode() not in self._pubsub.channels:
+            return
+        try:
+            await self._pubsub.unsubscribe(channel)
+        except RedisError as e:
+            logger.warning(f"Backplane unsubscribe failed, detail: {e}")
+
+    async def _read(self) -> None:
+        delay = self.min_retry_delay
+        while self._handlers:
+            try:
+                await self._sync_subscriptions()
+                message = await self.pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                logger.warning(
+                    f"Backplane connection lost, retrying in {delay}s, detail: {e}"
+                )
+                await self._reset()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            delay = self.min_retry_delay
+            if message is not None and message["type"] == "message":
+                await self._dispatch(message)
+
+    async def _sync_subscriptions(self) -> None:
+        missing = [
+            channel
+            for channel in self._handlers
+            if channel.encode() not in self.pubsub.channels
+        ]
+        if missing:
+            await self.pubsub.subscribe(*missing)
+
+    async def _dispatch(self, message: dict) -> None:
+        try:
+            handler = self._handlers.get(message["channel"].decode())
+            if handler is not None:
+                await handler(orjson.loads(message["data"]))
+        except Exception as e:
+            logger.exception(f"Backplane handler failed, detail: {e}")
+
+    async def _reset(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.aclose()
+        except Exception as e:
+            logger.warning(f"Backplane reset failed, detail: {e}")
+
+
+_backplane: Optional[Backplane] = None
+
+
+def get_backplane() -> Backplane:
+    global _backplane
+    if _backplane is None:
+        if settings.websocket.backplane == "redis":
+            _backplane = RedisBackplane(settings.redis.url)
+        else:
+            _backplane = InMemoryBackplane()
+    return _backplane
@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Dict, Optional, Union
+from uuid import uuid4
+
+import orjson
+from starlette.websockets import WebSocket
+
+from config import settings
+
+from .backplane import Backplane, get_backplane
+from .connection import Connection, ConnectionCounters
+
+
+class ConnectionManager:
+    channel_prefix: str
+
+    def __init__(
+        self,
+        backplane: Optional[Backplane] = None,
+        max_queue: int = settings.websocket.send_queue_size,
+        policy: str = settings.websocket.slow_consumer_policy,
+    ):
+        self.active_connections: Dict[int, Dict[str, Connection]] = {}
+        self.typing_status: Dict[int, Dict[str, bool]] = {}
+        self.backplane = backplane or get_backplane()
+        self.node_id = uuid4().hex
+        self.max_queue = max_queue
+        self.policy = policy
+        self.counters = ConnectionCounters()
+
+    def channel(self, room_id: int) -> str:
+        return f"{self.channel_prefix}:{room_id}"
+
+    async def connect(self, room_id: int, username: str, websocket: WebSocket):
+        await websocket.accept()
+        if room_id not in self.active_connections:
+            self.active_connections[room_id] = {}
+            await self.backplane.subscribe(self.channel(room_id), self.receive)
+        previous = self.active_connections[room_id].get(username)
+        if previous is not None:
+            previous.stop()
+        self.active_connections[room_id][username] = Connection(
+            websocket, self.max_queue, self.policy, self.counters
+        )
+
+    async def disconnect(self, room_id: int, username: str):
+        if room_id in self.active_connections:
+            user_connections = self.active_connections[room_id]
+            if username in user_connections:
+                user_connections.pop(username).stop()
+                if not user_connections:
+                    del self.active_connections[room_id]
+                    await self.backplane.unsubscribe(self.channel(room_id))
+
+    async def close(self):
+        for room_id, connections in list(self.active_connections.items()):
+            for username in list(connections):
+                await self.disconnect(room_id, username)
+
+    @staticmethod
+    def encode(message: Union[dict, str]) -> str:
+        if isinstance(message, str):
+            return message
+        return orjson.dumps(message).decode()
+
+    async def publish(
+        self, room_id: int, message: Union[dict, str], exclude: Optional[str] = None
+    ):
+        frame = self.encode(message)
+        await self.deliver(room_id, frame, exclude)
+        await self.backplane.publish(
+            self.channel(room_id),
+            {
+                "node_id": self.node_id,
+                "room_id": room_id,
+                "exclude": exclude,
+                "frame": frame,
+            },
+        )
+
+    async def receive(self, payload: dict):
+        if payload["node_id"] == self.node_id:
+            return
+        await self.deliver(payload["room_id"], payload["frame"], payload["exclude"])
+
+    async def deliver(self, room_id: int, frame: str, exclude: Optional[str] = None):
+        connections = self.active_connections.get(room_id, {})
+        for username, connection in list(connections.items()):
+            if username == exclude:
+                continue
+            if not connection.send(frame):
+                await self.disconnect(room_id, username)
+
+    def stats(self) -> dict:
+        depths = [
+            connection.depth
+            for connections in self.active_connections.values()
+            for connection in connections.values()
+        ]
+        delivered = self.counters.delivered or 1
+        return {
+            "rooms": len(self.active_connections),
+            "connections": len(depths),
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "delivered": self.counters.delivered,
+            "dropped": self.counters.dropped,
+            "disconnected": self.counters.disconnected,
+            "avg_lag_ms": round(self.counters.lag_total / delivered * 1000, 2),
+            "max_lag_ms": round(self.counters.lag_max * 1000, 2),
+        }
+
+    async def notify_deletion(self, room_id: int, message_id: int):
+        await self.publish(
+            room_id, {"action": "delete_message", "message_id": message_id}
+        )
+
+    async def notify_update(
+        self, room_id: int, message_id: int, message_text: str, created_at: datetime
+    ):
+        await self.publish(
+            room_id,
+            {
+                "action": "update_message",
+                "message_id": message_id,
+                "text": message_text,
+                "created_at": created_at.isoformat(),
+            },
+        )
+
+    async def notify_typing_status(self, room_id: int, username: str, is_typing: bool):
+        if room_id not in self.typing_status:
+            self.typing_status[room_id] = {}
+        self.typing_status[room_id][username] = is_typing
+        await self.publish(
+            room_id, {"action": "typing", "username": username, "is_typing": is_typing}
+        )
+
+    @staticmethod
+    async def send_error(message: str, websocket: WebSocket):
+        await websocket.send_json({"status": "error", "message": message})
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from starlette import status
+from starlette.websockets import WebSocket
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+class ConnectionCounters:
+    def __init__(self):
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def record_delivery(self, lag: float):
+        self.delivered += 1
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+
+class Connection:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: int,
+        policy: str,
+        counters: ConnectionCounters,
+    ):
+        self.websocket = websocket
+        self.policy = policy
+        self.counters = counters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+        self._writer = asyncio.create_task(self._write())
+        self._closer: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def send(self, frame: str) -> bool:
+        if self.closed:
+            return False
+        if self.queue.full():
+            if self.policy == DISCONNECT:
+                self.counters.disconnected += 1
+                self.abort(status.WS_1013_TRY_AGAIN_LATER)
+                return False
+            self.queue.get_nowait()
+            self.counters.dropped += 1
+        self.queue.put_nowait((time.perf_counter(), frame))
+        return True
+
+    async def _write(self):
+        while True:
+            enqueued_at, frame = await self.queue.get()
+            try:
+                await self.websocket.send_text(frame)
+            except Exception as e:
+                logger.info(f"Websocket send failed, detail: {e}")
+                self.closed = True
+                return
+            self.counters.record_delivery(time.perf_counter() - enqueued_at)
+
+    def abort(self, code: int):
+        self.stop()
+        self._closer = asyncio.create_task(self._close(code))
+
+    async def _close(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception as e:
+            logger.info(f"Websocket close failed, detail: {e}")
+
+    def stop(self):
+        self.closed = True
+        self._writer.cancel()
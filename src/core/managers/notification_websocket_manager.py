@@ -0,0 +1,22 @@
+from typing import Iterable
+
+from .base import ConnectionManager
+
+
+class NotificationConnectionManager(ConnectionManager):
+    channel_prefix = "ws:notifications"
+
+    async def push(self, user_id: int, event: dict):
+        await self.publish(user_id, event)
+
+    async def replay(self, user_id: int, username: str, events: Iterable[dict]):
+        connection = self.active_connections.get(user_id, {}).get(username)
+        if connection is None:
+            return
+        for event in events:
+            if not connection.send(self.encode(event)):
+                await self.disconnect(user_id, username)
+                return
+
+
+notification_manager = NotificationConnectionManager()
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class ReadReceiptBuffer:
+    def __init__(self, write: Callable[[List[int]], Awaitable[None]], window: float):
+        self.window = window
+        self._write = write
+        self._pending: Set[int] = set()
+        self._closing = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+    def add(self, message_ids: Iterable[int]) -> None:
+        self._pending.update(message_ids)
+        if self._pending and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            message_ids, self._pending = list(self._pending), set()
+            try:
+                await self._write(message_ids)
+            except Exception as e:
+                logger.warning(f"Read receipts flush failed, detail: {e}")
+
+    async def close(self):
+        self._closing.set()
+        if self._flusher is not None:
+            await self._flusher
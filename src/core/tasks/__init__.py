@@ -1,11 +1,25 @@
+from .audience_tasks import (
+    notify_new_exam,
+    notify_new_lecture,
+    send_chat_digest,
+    send_chat_digest_emails,
+    send_new_exam_emails,
+    send_new_lecture_emails,
+)
 from .celery import celery
-from .periodic_tasks import check_exams_for_ending, check_exams_for_starting
+from .exam_tasks import send_exam_ended_email, send_exam_started_emails
+from .periodic_tasks import (
+    check_exams_for_ending,
+    check_exams_for_starting,
+    grade_exam_submissions,
+    purge_notifications,
+    run_exam_schedule,
+)
 from .tasks import (
     send_activation_email,
+    send_chat_digest_email,
     send_new_exam_email,
-    send_new_group_message_email,
     send_new_lecture_notification,
-    send_new_private_message_email,
     send_update_result,
 )
 
@@ -13,10 +27,20 @@ __all__ = (
     "celery",
     "send_new_lecture_notification",
     "send_activation_email",
-    "send_new_group_message_email",
-    "send_new_private_message_email",
+    "send_chat_digest_email",
     "send_new_exam_email",
     "send_update_result",
     "check_exams_for_starting",
     "check_exams_for_ending",
+    "grade_exam_submissions",
+    "run_exam_schedule",
+    "purge_notifications",
+    "send_exam_started_emails",
+    "send_exam_ended_email",
+    "send_chat_digest",
+    "notify_new_exam",
+    "notify_new_lecture",
+    "send_chat_digest_emails",
+    "send_new_exam_emails",
+    "send_new_lecture_emails",
 )
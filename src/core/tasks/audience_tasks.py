@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from celery import shared_task
+from sqlalchemy import func, or_, select, update
+
+from core.database.models import (
+    Exam,
+    Lecture,
+    Notification,
+    User,
+    group_exams,
+    group_lectures,
+    group_members,
+)
+from core.database.repositories import NotificationRepository
+from core.tasks.exam_tasks import fan_out, run
+from core.tasks.periodic_tasks import get_session
+from core.tasks.tasks import (
+    send_chat_digest_email,
+    send_new_exam_email,
+    send_new_lecture_notification,
+)
+
+Recipients = List[Dict[str, str]]
+
+
+@shared_task(ignore_result=True)
+def send_chat_digest(conversation: str) -> None:
+    emailed_at, notification_ids = run(load_chat_digest(conversation))
+    fan_out(
+        notification_ids,
+        lambda chunk: send_chat_digest_emails.s(conversation, chunk, emailed_at),
+    )
+
+
+@shared_task(ignore_result=True)
+def send_chat_digest_emails(
+    conversation: str, notification_ids: List[int], emailed_at: str
+) -> None:
+    recipients = run(load_chat_digest_recipients(notification_ids))
+    if not recipients:
+        return
+    send_chat_digest_email(conversation, recipients)
+    run(
+        stamp_chat_digest(
+            [user["id"] for user in recipients], datetime.fromisoformat(emailed_at)
+        )
+    )
+
+
+@shared_task(ignore_result=True)
+def notify_new_exam(exam_id: int) -> None:
+    user_ids = run(load_exam_audience(exam_id))
+    fan_out(user_ids, lambda chunk: send_new_exam_emails.s(exam_id, chunk))
+
+
+@shared_task(ignore_result=True)
+def send_new_exam_emails(exam_id: int, user_ids: List[int]) -> None:
+    author, recipients = run(load_exam_recipients(exam_id, user_ids))
+    if author is None or not recipients:
+        return
+    first_name, last_name = author
+    send_new_exam_email(exam_id, first_name, last_name, recipients)
+
+
+@shared_task(ignore_result=True)
+def notify_new_lecture(lecture_id: int) -> None:
+    user_ids = run(load_lecture_audience(lecture_id))
+    fan_out(user_ids, lambda chunk: send_new_lecture_emails.s(lecture_id, chunk))
+
+
+@shared_task(ignore_result=True)
+def send_new_lecture_emails(lecture_id: int, user_ids: List[int]) -> None:
+    recipients = run(load_recipients(user_ids))
+    if recipients:
+        send_new_lecture_notification(lecture_id, recipients)
+
+
+async def fetch_recipients(session, user_ids: List[int]) -> Recipients:
+    result = await session.execute(
+        select(User.email, User.username).where(
+            User.id.in_(user_ids), User.ignore_messages.is_(False)
+        )
+    )
+    return [{"email": email, "username": username} for email, username in result]
+
+
+async def load_recipients(user_ids: List[int]) -> Recipients:
+    async with get_session() as session:
+        return await fetch_recipients(session, user_ids)
+
+
+async def load_chat_digest(conversation: str) -> Tuple[str, List[int]]:
+    async with get_session() as session:
+        loaded_at = await session.scalar(select(func.now()))
+        notification_ids = await session.scalars(
+            select(Notification.id)
+            .join(User, User.id == Notification.user_id)
+            .where(
+                Notification.conversation == conversation,
+                Notification.is_read.is_(False),
+                or_(
+                    Notification.emailed_at.is_(None),
+                    Notification.emailed_at < Notification.updated_at,
+                ),
+                User.ignore_messages.is_(False),
+            )
+        )
+        return loaded_at.isoformat(), list(notification_ids)
+
+
+async def load_chat_digest_recipients(notification_ids: List[int]) -> List[dict]:
+    async with get_session() as session:
+        rows = await session.execute(
+            select(
+                Notification.id, User.email, User.username, Notification.message_count
+            )
+            .join(User, User.id == Notification.user_id)
+            .where(
+                Notification.id.in_(notification_ids),
+                Notification.is_read.is_(False),
+                User.ignore_messages.is_(False),
+            )
+        )
+    return [
+        {"id": id, "email": email, "username": username, "count": count}
+        for id, email, username, count in rows
+    ]
+
+
+async def stamp_chat_digest(notification_ids: List[int], emailed_at: datetime):
+    async with get_session() as session:
+        await session.execute(
+            update(Notification)
+            .where(Notification.id.in_(notification_ids))
+            .values(emailed_at=emailed_at)
+        )
+        await session.commit()
+
+
+async def load_exam_audience(exam_id: int) -> List[int]:
+    async with get_session() as session:
+        user_ids = await session.scalars(
+            NotificationRepository.audience(
+                group_members.c.group_id,
+                select(group_exams.c.group_id).where(group_exams.c.exam_id == exam_id),
+                students_only=True,
+                skip_ignoring=True,
+            )
+        )
+        return list(user_ids)
+
+
+async def load_exam_recipients(exam_id: int, user_ids: List[int]):
+    async with get_session() as session:
+        author = (
+            await session.execute(
+                select(User.first_name, User.last_name)
+                .join(Exam, Exam.author_id == User.id)
+                .where(Exam.id == exam_id)
+            )
+        ).first()
+        if author is None:
+            return None, []
+        return author, await fetch_recipients(session, user_ids)
+
+
+async def load_lecture_audience(lecture_id: int) -> List[int]:
+    async with get_session() as session:
+        author_id = await session.scalar(
+            select(Lecture.author_id).where(Lecture.id == lecture_id)
+        )
+        if author_id is None:
+            return []
+        user_ids = await session.scalars(
+            NotificationRepository.audience(
+                group_members.c.group_id,
+                select(group_lectures.c.group_id).where(
+                    group_lectures.c.lecture_id == lecture_id
+                ),
+                exclude_user_id=author_id,
+                skip_ignoring=True,
+            )
+        )
+        return list(user_ids)
@@ -1,7 +1,9 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
 
-from config import RedisSettings
+from config import RedisSettings, settings
+from core.tasks.mailer import mailer
 
 celery = Celery(
     "personal_accounts",
@@ -12,6 +14,11 @@ celery = Celery(
 celery.autodiscover_tasks()
 
 celery.conf.beat_schedule = {
+    "run_exam_schedule": {
+        "task": "core.tasks.periodic_tasks.run_exam_schedule",
+        "schedule": 1.0,
+        "options": {"expires": 1.0},
+    },
     "check_exams_for_starting": {
         "task": "core.tasks.periodic_tasks.check_exams_for_starting",
         "schedule": crontab(minute="*/1"),
@@ -20,5 +27,20 @@ celery.conf.beat_schedule = {
         "task": "core.tasks.periodic_tasks.check_exams_for_ending",
         "schedule": crontab(minute="*/1"),
     },
+    "purge_notifications": {
+        "task": "core.tasks.periodic_tasks.purge_notifications",
+        "schedule": crontab(hour=3, minute=0),
+    },
 }
+if settings.exams.queued_submissions:
+    celery.conf.beat_schedule["grade_exam_submissions"] = {
+        "task": "core.tasks.periodic_tasks.grade_exam_submissions",
+        "schedule": settings.exams.submission_poll_interval,
+        "options": {"expires": settings.exams.submission_poll_interval},
+    }
 celery.conf.timezone = "UTC"
+
+
+@worker_process_shutdown.connect
+def close_mailer(**kwargs):
+    mailer.close()
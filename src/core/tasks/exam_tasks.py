@@ -0,0 +1,110 @@
+import asyncio
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Iterable, List
+
+from celery import group, shared_task
+from celery.canvas import Signature
+from sqlalchemy import select
+
+from config import BASE_URL, settings
+from core.database.models import Exam, User
+from core.database.repositories import ExamRepository
+from core.tasks.mailer import mailer
+from core.tasks.periodic_tasks import get_session
+from core.tasks.tasks import email_host_user
+
+
+def run(coroutine):
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coroutine)
+
+
+def fan_out(ids: Iterable[int], signature: Callable[[List[int]], Signature]) -> None:
+    ids = sorted(set(ids))
+    size = settings.email.chunk_size
+    chunks = [ids[i : i + size] for i in range(0, len(ids), size)]  # noqa: E203
+    if chunks:
+        group(signature(chunk) for chunk in chunks).apply_async()
+
+
+def dispatch_exam_started_emails(exam_id: int, student_ids: Iterable[int]) -> None:
+    fan_out(student_ids, lambda chunk: send_exam_started_emails.s(exam_id, chunk))
+
+
+@shared_task(ignore_result=True)
+def send_exam_started_emails(exam_id: int, student_ids: List[int]) -> None:
+    exam, students = run(load_exam_recipients(exam_id, student_ids))
+    if exam is None or not students:
+        return
+    title, end_time = exam
+    messages = []
+    for username, email in students:
+        body = f"""
+    Здравствуйте {username},
+    Вы уже можете пройти экзамен "{title}"!
+    Успейте до {end_time}.
+    {BASE_URL}/exams/{exam_id}
+    """
+        message = MIMEText(body, "plain")
+        message["Subject"] = "Новое сообщение!"
+        message["From"] = email_host_user
+        message["To"] = email
+        messages.append((email, message.as_string()))
+    mailer.send_many(messages)
+
+
+@shared_task(ignore_result=True)
+def send_exam_ended_email(exam_id: int) -> None:
+    report = run(load_exam_report(exam_id))
+    if report is None:
+        return
+    title, username, email, report_stream = report
+
+    message = MIMEMultipart()
+    message["Subject"] = "Новое сообщение!"
+    message["From"] = email_host_user
+    message["To"] = email
+
+    body = f"""
+    Здравствуйте {username},
+    Экзамен "{title}" завершен!
+    Отчет прикреплен к этому письму.
+    Ссылка: {BASE_URL}/exams/{exam_id}
+    """
+    message.attach(MIMEText(body, "plain"))
+
+    part = MIMEApplication(report_stream.read(), Name=f"{title}_results.xlsx")
+    part["Content-Disposition"] = f'attachment; filename="{title}_results.xlsx"'
+    message.attach(part)
+
+    mailer.send(email, message.as_string())
+
+
+async def load_exam_recipients(exam_id: int, student_ids: List[int]):
+    async with get_session() as session:
+        exam = (
+            await session.execute(
+                select(Exam.title, Exam.end_time).where(Exam.id == exam_id)
+            )
+        ).first()
+        students = (
+            await session.execute(
+                select(User.username, User.email).where(User.id.in_(student_ids))
+            )
+        ).all()
+    return exam, students
+
+
+async def load_exam_report(exam_id: int):
+    async with get_session() as session:
+        exam_repository = ExamRepository(session)
+        exam = await exam_repository.get_by_id(exam_id, profile="exam-report")
+        if exam is None:
+            return None
+        report = await exam_repository.create_results_report(exam)
+        return exam.title, exam.author.username, exam.author.email, report
@@ -0,0 +1,175 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+RECIPIENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + 1 / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PooledConnection:
+    def __init__(self):
+        self.smtp: Optional[smtplib.SMTP] = None
+        self.sent = 0
+        self.used_at = time.monotonic()
+
+
+class SMTPPool:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        size: int,
+        max_messages: int,
+        idle_timeout: float,
+        rate_limit: float,
+        connection_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP_SSL,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.connection_factory = connection_factory
+        self.rate_limiter = RateLimiter(rate_limit)
+        self._idle: "queue.LifoQueue[PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def _open(self, connection: PooledConnection) -> None:
+        smtp = self.connection_factory(self.host, self.port, timeout=30)
+        if self.username:
+            smtp.login(self.username, self.password)
+        connection.smtp = smtp
+        connection.sent = 0
+        with self._lock:
+            self.connects += 1
+
+    @staticmethod
+    def _close(connection: PooledConnection) -> None:
+        if connection.smtp is None:
+            return
+        try:
+            connection.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.smtp.close()
+        connection.smtp = None
+
+    def _acquire(self) -> PooledConnection:
+        self._slots.acquire()
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return PooledConnection()
+            if time.monotonic() - connection.used_at < self.idle_timeout:
+                return connection
+            self._close(connection)
+
+    def _release(self, connection: PooledConnection) -> None:
+        if connection.sent >= self.max_messages:
+            self._close(connection)
+        if connection.smtp is not None:
+            connection.used_at = time.monotonic()
+            self._idle.put(connection)
+        self._slots.release()
+
+    def send_many(self, messages: Iterable[Tuple[str, str]]) -> int:
+        sent = 0
+        connection = self._acquire()
+        try:
+            for recipient, message in messages:
+                try:
+                    self._send(connection, recipient, message)
+                except RECIPIENT_ERRORS as e:
+                    with self._lock:
+                        self.failed += 1
+                    logger.warning(f"Email to {recipient} was rejected, detail: {e}")
+                    continue
+                sent += 1
+        finally:
+            self._release(connection)
+        return sent
+
+    def send(self, recipient: str, message: str) -> None:
+        self.send_many([(recipient, message)])
+
+    def _send(self, connection: PooledConnection, recipient: str, message: str) -> None:
+        self.rate_limiter.wait()
+        for attempt in range(2):
+            if connection.smtp is None or connection.sent >= self.max_messages:
+                self._close(connection)
+                self._open(connection)
+            try:
+                connection.smtp.sendmail(self.username, recipient, message)
+            except RETRYABLE_ERRORS as e:
+                connection.smtp.close()
+                connection.smtp = None
+                if attempt:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                logger.warning(f"SMTP connection lost, reconnecting, detail: {e}")
+                continue
+            connection.sent += 1
+            with self._lock:
+                self.sent += 1
+            return
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def stats(self) -> dict:
+        return {
+            "idle": self._idle.qsize(),
+            "connects": self.connects,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
+
+
+mailer = SMTPPool(
+    host=settings.email.smtp_host,
+    port=settings.email.smtp_port,
+    username=settings.email.email_host_user,
+    password=settings.email.email_host_password,
+    size=settings.email.pool_size,
+    max_messages=settings.email.max_messages_per_connection,
+    idle_timeout=settings.email.idle_timeout,
+    rate_limit=settings.email.rate_limit,
+)
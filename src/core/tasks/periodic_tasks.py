@@ -1,8 +1,12 @@
 import asyncio
+import logging
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 
 from celery import shared_task
 
+from config import settings
 from core.database import get_async_session
 from core.database.repositories import (
     ExamRepository,
@@ -10,6 +14,8 @@ from core.database.repositories import (
     UserRepository,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def get_session():
@@ -35,6 +41,33 @@ def check_exams_for_starting() -> None:
     loop.run_until_complete(check_exams_for_starting_async())
 
 
+@shared_task(ignore_result=True)
+def grade_exam_submissions() -> None:
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    loop.run_until_complete(grade_exam_submissions_async())
+
+
+@shared_task(ignore_result=True)
+def run_exam_schedule() -> None:
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    loop.run_until_complete(run_exam_schedule_async())
+
+
+@shared_task(ignore_result=True)
+def purge_notifications() -> None:
+    loop = asyncio.get_event_loop()
+    if loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    loop.run_until_complete(purge_notifications_async())
+
+
 async def check_exams_for_ending_async() -> None:
     from api.notifications.service import NotificationService
 
@@ -57,3 +90,65 @@ async def check_exams_for_starting_async() -> None:
             UserRepository(session),
         )
         await notification_service.start_scheduled_exams()
+        await notification_service.schedule_upcoming_exams(timedelta(minutes=5))
+
+
+async def grade_exam_submissions_async() -> None:
+    from api.exams.service import exam_service_factory
+    from api.notifications.service import NotificationService
+
+    batch_size = settings.exams.submission_batch_size
+    async with get_session() as session:
+        exam_service = exam_service_factory(session)
+        notification_service = NotificationService(
+            NotificationRepository(session),
+            ExamRepository(session),
+            UserRepository(session),
+        )
+        while (
+            await exam_service.grade_submissions(notification_service, batch_size)
+            == batch_size
+        ):
+            pass
+
+
+async def run_exam_schedule_async() -> None:
+    from api.exams.scheduler import exam_scheduler
+    from api.notifications.service import NotificationService
+
+    due = await exam_scheduler.claim_due(time.time())
+    if due is None or not any(due):
+        return
+    starting, ending = due
+    async with get_session() as session:
+        notification_service = NotificationService(
+            NotificationRepository(session),
+            ExamRepository(session),
+            UserRepository(session),
+        )
+        if starting:
+            await notification_service.start_scheduled_exams(starting)
+        if ending:
+            await notification_service.end_scheduled_exams(ending)
+
+
+async def purge_notifications_async() -> int:
+    before = datetime.now() - timedelta(days=settings.notifications.retention_days)
+    batch_size = settings.notifications.purge_batch_size
+    purged = 0
+    async with get_session() as session:
+        repository = NotificationRepository(session)
+        position = None
+        while True:
+            position, deleted = await repository.purge_read(
+                before, position, batch_size
+            )
+            purged += deleted
+            if position is None:
+                break
+        stats = await repository.stats()
+    logger.info(
+        f"Purged {purged} read notifications older than {before:%Y-%m-%d}, "
+        f"{stats['rows']} rows left ({stats['size_bytes']} bytes)"
+    )
+    return purged
@@ -1,24 +1,19 @@
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from io import BytesIO
-from smtplib import SMTP_SSL
 from typing import Dict, List
 
 from celery import shared_task
 
 from config import settings, BASE_URL
+from core.tasks.mailer import mailer
 
-smtp_server = "mail.dgu.ru"
-smtp_port = 465
 email_host_user = settings.email.email_host_user
-email_host_password = settings.email.email_host_password
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_new_lecture_notification(
     lecture_id: int, user_list: List[Dict[str, str]]
 ) -> None:
+    messages = []
     for user in user_list:
         subject = "Новая лекция!"
         body = f"""
@@ -30,10 +25,8 @@ def send_new_lecture_notification(
         message["Subject"] = subject
         message["From"] = email_host_user
         message["To"] = user["email"]
-
-        with SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(email_host_user, email_host_password)
-            server.sendmail(email_host_user, user["email"], message.as_string())
+        messages.append((user["email"], message.as_string()))
+    mailer.send_many(messages)
 
 
 @shared_task
@@ -51,76 +44,45 @@ def send_activation_email(email: str, username: str, activation_link: str) -> No
     message["From"] = email_host_user
     message["To"] = email
 
-    with SMTP_SSL(smtp_server, smtp_port) as server:
-        server.login(email_host_user, email_host_password)
-        server.sendmail(email_host_user, email, message.as_string())
+    mailer.send(email, message.as_string())
 
 
-@shared_task
-def send_new_group_message_email(
-    group_id: int,
-    user_list: List[Dict[str, str]],
-    message_text: str,
-    sender_username: str,
-) -> None:
+@shared_task(ignore_result=True)
+def send_chat_digest_email(conversation: str, user_list: List[dict]) -> None:
+    kind, _, conversation_id = conversation.partition(":")
+    if kind == "group":
+        place = "в группе"
+        link = f"{BASE_URL}/chats/groups/get-messages/{conversation_id}"
+    else:
+        place = "в личном чате"
+        link = f"{BASE_URL}/chats/private-chats/{conversation_id}"
+    messages = []
     for user in user_list:
-        subject = "Новое сообщение!"
+        subject = "Новые сообщения!"
         body = f"""
         Привет {user["username"]},
 
-        В группе новое сообщение от {sender_username}:
+        У вас {user["count"]} непрочитанных сообщений {place}:
 
-        {message_text[:50]}...
-
-        {BASE_URL}/chats/groups/get-messages/{group_id}
+        {link}
         """
 
         message = MIMEText(body, "plain")
         message["Subject"] = subject
         message["From"] = email_host_user
         message["To"] = user["email"]
+        messages.append((user["email"], message.as_string()))
+    mailer.send_many(messages)
 
-        with SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(email_host_user, email_host_password)
-            server.sendmail(email_host_user, user["email"], message.as_string())
-
-
-@shared_task
-def send_new_private_message_email(
-    room_id: int,
-    user_list: List[Dict[str, str]],
-    message_text: str,
-    sender_username: str,
-) -> None:
-    for user in user_list:
-        subject = "Новое сообщение!"
-        body = f"""
-        Привет {user["username"]},
-
-        {sender_username} отправил(а) вам новое сообщение:
-
-        {message_text[:50]}...
 
-        {BASE_URL}/chats/private-chats/{room_id}
-        """
-
-        message = MIMEText(body, "plain")
-        message["Subject"] = subject
-        message["From"] = email_host_user
-        message["To"] = user["email"]
-
-        with SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(email_host_user, email_host_password)
-            server.sendmail(email_host_user, user["email"], message.as_string())
-
-
-@shared_task
+@shared_task(ignore_result=True)
 def send_new_exam_email(
     exam_id: int,
     teacher_first_name: str,
     teacher_last_name: str,
     user_list: List[Dict[str, str]],
 ) -> None:
+    messages = []
     for user in user_list:
         subject = "Новое сообщение!"
         body = f"""
@@ -135,10 +97,8 @@ def send_new_exam_email(
         message["Subject"] = subject
         message["From"] = email_host_user
         message["To"] = user["email"]
-
-        with SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(email_host_user, email_host_password)
-            server.sendmail(email_host_user, user["email"], message.as_string())
+        messages.append((user["email"], message.as_string()))
+    mailer.send_many(messages)
 
 
 @shared_task
@@ -157,53 +117,7 @@ def send_update_result(
     message["From"] = email_host_user
     message["To"] = user["email"]
 
-    with SMTP_SSL(smtp_server, smtp_port) as server:
-        server.login(email_host_user, email_host_password)
-        server.sendmail(email_host_user, user["email"], message.as_string())
-
-
-async def send_email_to_student(student, exam) -> None:
-    subject = "Новое сообщение!"
-    body = f"""
-    Здравствуйте {student.username},
-    Вы уже можете пройти экзамен "{exam.title}"!
-    Успейте до {exam.end_time}.
-    {BASE_URL}/exams/{exam.id}
-    """
-    message = MIMEText(body, "plain")
-    message["Subject"] = subject
-    message["From"] = email_host_user
-    message["To"] = student.email
-
-    with SMTP_SSL(smtp_server, smtp_port) as server:
-        server.login(email_host_user, email_host_password)
-        server.sendmail(email_host_user, student.email, message.as_string())
-
-
-async def send_email_to_teahcer(teacher, exam, report_stream: BytesIO) -> None:
-    subject = "Новое сообщение!"
-
-    message = MIMEMultipart()
-    message["Subject"] = subject
-    message["From"] = email_host_user
-    message["To"] = teacher.email
-
-    body = f"""
-    Здравствуйте {teacher.username},
-    Экзамен "{exam.title}" завершен!
-    Отчет прикреплен к этому письму.
-    Ссылка: {BASE_URL}/exams/{exam.id}
-    """
-    message.attach(MIMEText(body, "plain"))
-
-    report_stream.seek(0)
-    part = MIMEApplication(report_stream.read(), Name=f"{exam.title}_results.xlsx")
-    part["Content-Disposition"] = f'attachment; filename="{exam.title}_results.xlsx"'
-    message.attach(part)
-
-    with SMTP_SSL(smtp_server, smtp_port) as server:
-        server.login(email_host_user, email_host_password)
-        server.sendmail(email_host_user, teacher.email, message.as_string())
+    mailer.send(user["email"], message.as_string())
 
 
 @shared_task
@@ -223,6 +137,4 @@ def send_password_reset(
     message["From"] = email_host_user
     message["To"] = email
 
-    with SMTP_SSL(smtp_server, smtp_port) as server:
-        server.login(email_host_user, email_host_password)
-        server.sendmail(email_host_user, email, message.as_string())
+    mailer.send(email, message.as_string())
@@ -1,11 +1,24 @@
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.exams.cache import exam_cache
+from api.exams.drafts import exam_drafts
 from app import app
-from core.database import get_async_session, get_test_async_session, test_engine
+from config import settings
+from core.auth import jwt
+from core.database import (
+    get_async_session,
+    get_session_maker,
+    get_test_async_session,
+    test_async_session_maker,
+    test_engine,
+)
 from core.database.models import Base
 
+settings.cache.backend = "memory"
+
 
 @pytest_asyncio.fixture(scope="function")
 async def init_db():
@@ -16,6 +29,17 @@ async def init_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def override_auth_session(monkeypatch):
+    monkeypatch.setattr(jwt, "async_session_maker", test_async_session_maker)
+
+
+@pytest.fixture(autouse=True)
+def clear_exam_cache():
+    exam_cache.clear()
+    exam_drafts.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_session(init_db) -> AsyncSession:
     async def override_get_test_session():
@@ -23,6 +47,7 @@ async def test_session(init_db) -> AsyncSession:
             yield session
 
     app.dependency_overrides[get_async_session] = override_get_test_session
+    app.dependency_overrides[get_session_maker] = lambda: test_async_session_maker
 
     async for session in get_test_async_session():
         try:
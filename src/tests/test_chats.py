@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.testclient import TestClient
+
+from api.users.utils import create_access_token
+from app import app
+from core.database import get_session_maker, test_async_session_maker, test_engine
+from core.database.models import Base, GroupMessage
+from core.database.repositories import GroupMessageRepository
+from core.factories import UserFactory
+from tests.test_load_profiles import create_group
+
+
+async def create_users():
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with test_async_session_maker() as session:
+        UserFactory._meta.sqlalchemy_session = session
+        sender = UserFactory(first_name="sender", last_name="sender")
+        receiver = UserFactory(first_name="receiver", last_name="receiver")
+        await session.commit()
+        return sender, receiver
+
+
+async def drop_tables():
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def test_idle_websocket_does_not_hold_db_connection():
+    sender, receiver = asyncio.run(create_users())
+    token = create_access_token(sender.username, sender.id, timedelta(minutes=5))
+    checked_out = []
+
+    def on_checkout(*args):
+        checked_out.append(1)
+
+    def on_checkin(*args):
+        checked_out.pop()
+
+    event.listen(test_engine.sync_engine.pool, "checkout", on_checkout)
+    event.listen(test_engine.sync_engine.pool, "checkin", on_checkin)
+    app.dependency_overrides[get_session_maker] = lambda: test_async_session_maker
+    try:
+        with TestClient(app) as client:
+            with client.websocket_connect(
+                f"/api/v1/chats/private-chats/{receiver.id}?token={token}"
+            ) as websocket:
+                websocket.send_json({"action": "typing", "is_typing": True})
+                assert websocket.receive_json() == {
+                    "action": "typing",
+                    "username": sender.username,
+                    "is_typing": True,
+                }
+                assert checked_out == []
+    finally:
+        event.remove(test_engine.sync_engine.pool, "checkout", on_checkout)
+        event.remove(test_engine.sync_engine.pool, "checkin", on_checkin)
+        app.dependency_overrides.pop(get_session_maker)
+        asyncio.run(drop_tables())
+
+
+@pytest.mark.asyncio
+async def test_group_history_pages_by_keyset(test_session: AsyncSession):
+    teacher, members, group = await create_group(test_session, students=1)
+    messages = [
+        GroupMessage(
+            group_id=group.id,
+            sender_id=members[0].id,
+            text=f"message {i}",
+            created_at=datetime(2026, 1, 1) + timedelta(minutes=i // 2),
+        )
+        for i in range(5)
+    ]
+    test_session.add_all(messages)
+    await test_session.commit()
+    repository = GroupMessageRepository(test_session)
+
+    newest = await repository.get_messages_by_group(group, None, None, 2)
+    assert [m.text for m in newest] == ["message 4", "message 3"]
+    older = await repository.get_messages_by_group(group, newest[-1].id, None, 2)
+    assert [m.text for m in older] == ["message 2", "message 1"]
+    newer = await repository.get_messages_by_group(group, None, older[-1].id, 2)
+    assert [m.text for m in newer] == ["message 3", "message 2"]
+
+
+@pytest.mark.asyncio
+async def test_group_read_watermark_counts_readers(test_session: AsyncSession):
+    teacher, members, group = await create_group(test_session, students=3)
+    sender, reader, lagging = members
+    messages = [
+        GroupMessage(
+            group_id=group.id,
+            sender_id=sender.id,
+            text=f"message {i}",
+            created_at=datetime(2026, 1, 1),
+        )
+        for i in range(3)
+    ]
+    test_session.add_all(messages)
+    await test_session.commit()
+    repository = GroupMessageRepository(test_session)
+
+    await repository.set_group_message_as_read(
+        reader.id, group.id, [messages[0].id, messages[2].id]
+    )
+    await repository.set_group_message_as_read(lagging.id, group.id, [messages[1].id])
+    await repository.set_group_message_as_read(reader.id, group.id, [messages[0].id])
+
+    assert [u.id for u in await repository.get_readers(messages[2])] == [reader.id]
+    assert [u.id for u in await repository.get_readers(messages[1])] == [
+        reader.id,
+        lagging.id,
+    ]
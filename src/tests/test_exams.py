@@ -0,0 +1,410 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from redis.asyncio import Redis
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.exams.cache import AnswerKey, ExamCache, exam_cache
+from api.exams.drafts import DraftStore
+from api.exams.service import exam_service_factory
+from api.notifications.service import notification_service_factory
+from config import settings
+from core.database import test_async_session_maker as session_maker
+from core.database import test_engine
+from core.database.models import Answer, Exam, Group, PassedChoiceAnswer, Question
+from core.database.repositories import ExamRepository, ResultRepository
+from core.factories import UserFactory
+from tests.conftest import user_authentication_headers
+
+
+async def create_exam(session: AsyncSession, questions: int):
+    UserFactory._meta.sqlalchemy_session = session
+    teacher = UserFactory(is_teacher=True, first_name="teacher", last_name="teacher")
+    student = UserFactory(first_name="student", last_name="student")
+    group = Group(
+        course=1, facult="math", subgroup=1, methodist=teacher, members=[student]
+    )
+    now = datetime.now()
+    exam = Exam(
+        title="exam",
+        time=60,
+        author=teacher,
+        start_time=now - timedelta(minutes=5),
+        end_time=now + timedelta(hours=1),
+        is_started=True,
+        quantity_questions=questions,
+        groups=[group],
+        questions=[
+            Question(
+                text=f"question {i}",
+                order=i,
+                answers=[
+                    Answer(text=f"answer {j}", is_correct=j == 0) for j in range(4)
+                ],
+            )
+            for i in range(questions)
+        ],
+    )
+    session.add(exam)
+    await session.commit()
+    return student, exam
+
+
+@pytest.mark.asyncio
+async def test_pass_exam_scores_from_answer_key(
+    client: AsyncClient, test_session: AsyncSession
+):
+    student, exam = await create_exam(test_session, questions=10)
+    choices = [
+        {
+            "question_id": question.id,
+            "answer_id": question.answers[0 if i < 8 else 1].id,
+        }
+        for i, question in enumerate(exam.questions)
+    ]
+    headers = await user_authentication_headers(client, student.username, "password123")
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        response = await client.post(
+            f"/exams/pass-exam/{exam.id}",
+            json={"choise_questions": choices},
+            headers=headers,
+        )
+    finally:
+        event.remove(
+            test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+    assert response.status_code == 201
+    assert response.json()["score"] == 4
+    selects = [statement for statement in statements if statement.startswith("SELECT")]
+    assert len(selects) <= 13
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 2
+    passed = await test_session.execute(
+        select(PassedChoiceAnswer.is_correct).order_by(PassedChoiceAnswer.id)
+    )
+    assert passed.scalars().all() == [True] * 8 + [False] * 2
+
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}",
+        json={"choise_questions": choices},
+        headers=headers,
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_exam_result_is_unique_per_student(test_session: AsyncSession):
+    student, exam = await create_exam(test_session, questions=1)
+    exam_id, student_id = exam.id, student.id
+    repository = ResultRepository(test_session)
+    await repository.create_submission(exam, student, 5, [], [])
+    with pytest.raises(IntegrityError):
+        await repository.create_submission(exam, student, 5, [], [])
+    assert await repository.exists(exam_id, student_id)
+
+
+@pytest.mark.asyncio
+async def test_pass_exam_rejects_answer_from_another_question(
+    client: AsyncClient, test_session: AsyncSession
+):
+    student, exam = await create_exam(test_session, questions=2)
+    first, second = exam.questions
+    headers = await user_authentication_headers(client, student.username, "password123")
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}",
+        json={
+            "choise_questions": [
+                {"question_id": first.id, "answer_id": second.answers[0].id}
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_pass_exam_rejects_repeated_question(
+    client: AsyncClient, test_session: AsyncSession
+):
+    student, exam = await create_exam(test_session, questions=2)
+    first = exam.questions[0]
+    headers = await user_authentication_headers(client, student.username, "password123")
+    answer = {"question_id": first.id, "answer_id": first.answers[0].id}
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}",
+        json={"choise_questions": [answer, answer]},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert not await ResultRepository(test_session).exists(exam.id, student.id)
+
+
+@pytest.mark.asyncio
+async def test_answer_key_is_invalidated(test_session: AsyncSession):
+    _, exam = await create_exam(test_session, questions=1)
+    loads = []
+
+    async def load():
+        loads.append(exam.id)
+        return AnswerKey.from_rows(exam.id, [], [])
+
+    await exam_cache.get_answer_key(exam.id, load)
+    await exam_cache.get_answer_key(exam.id, load)
+    await exam_cache.invalidate(exam.id)
+    await exam_cache.get_answer_key(exam.id, load)
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_answer_key_is_not_cached_without_shared_version(monkeypatch):
+    monkeypatch.setattr(settings.cache, "backend", "redis")
+    monkeypatch.setattr(
+        "core.cache.client._redis", Redis.from_url("redis://127.0.0.1:1")
+    )
+    cache = ExamCache(max_size=10, ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return AnswerKey.from_rows(1, [], [])
+
+    await cache.get_answer_key(1, load)
+    await cache.get_answer_key(1, load)
+    await cache.invalidate(1)
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_student_exam_view_is_cached(
+    client: AsyncClient, test_session: AsyncSession
+):
+    student, exam = await create_exam(test_session, questions=3)
+    headers = await user_authentication_headers(client, student.username, "password123")
+    response = await client.get(f"/exams/{exam.id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["questions"]) == 3
+    assert "is_correct" not in response.json()["questions"][0]["answers"][0]
+    etag = response.headers["etag"]
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        response = await client.get(
+            f"/exams/{exam.id}", headers={**headers, "If-None-Match": etag}
+        )
+    finally:
+        event.remove(
+            test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+    assert response.status_code == 304
+    assert not [s for s in statements if "FROM exams" in s]
+
+    teacher_headers = await user_authentication_headers(
+        client, exam.author.username, "password123"
+    )
+    response = await client.delete(
+        f"/exams/delete-answer/{exam.questions[0].answers[3].id}",
+        headers=teacher_headers,
+    )
+    assert response.status_code == 204
+    response = await client.get(
+        f"/exams/{exam.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["questions"][0]["answers"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduled_start_refreshes_student_exam_view(
+    client: AsyncClient, test_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(
+        "api.notifications.service.dispatch_exam_started_emails", lambda *args: None
+    )
+    student, exam = await create_exam(test_session, questions=1)
+    exam.is_started = False
+    await test_session.commit()
+    headers = await user_authentication_headers(client, student.username, "password123")
+    response = await client.get(f"/exams/{exam.id}", headers=headers)
+    assert response.json()["is_started"] is False
+    etag = response.headers["etag"]
+
+    async with session_maker() as session:
+        await notification_service_factory(session).start_scheduled_exams([exam.id])
+
+    response = await client.get(
+        f"/exams/{exam.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["is_started"] is True
+
+
+@pytest.mark.asyncio
+async def test_queued_submission_is_graded_by_worker(
+    client: AsyncClient, test_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings.exams, "queued_submissions", True)
+    student, exam = await create_exam(test_session, questions=5)
+    choices = [
+        {"question_id": question.id, "answer_id": question.answers[0].id}
+        for question in exam.questions
+    ]
+    headers = await user_authentication_headers(client, student.username, "password123")
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}",
+        json={"choise_questions": choices},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+    submission_id = response.json()["id"]
+
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}",
+        json={"choise_questions": choices},
+        headers=headers,
+    )
+    assert response.status_code == 403
+
+    async with session_maker() as session:
+        graded = await exam_service_factory(session).grade_submissions(
+            notification_service_factory(session), batch_size=10
+        )
+    assert graded == 1
+
+    response = await client.get(f"/exams/submissions/{submission_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "graded"
+    assert response.json()["result"]["score"] == 5
+
+
+@pytest.mark.asyncio
+async def test_poison_submission_fails_and_can_be_resubmitted(
+    client: AsyncClient, test_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings.exams, "queued_submissions", True)
+    monkeypatch.setattr(settings.exams, "submission_max_attempts", 2)
+    student, exam = await create_exam(test_session, questions=1)
+    question = exam.questions[0]
+    payload = {
+        "choise_questions": [
+            {"question_id": question.id, "answer_id": question.answers[0].id}
+        ]
+    }
+    headers = await user_authentication_headers(client, student.username, "password123")
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}", json=payload, headers=headers
+    )
+    submission_id = response.json()["id"]
+
+    add_results = ResultRepository.add_results
+
+    async def broken(*args):
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(ResultRepository, "add_results", broken)
+    for _ in range(2):
+        async with session_maker() as session:
+            graded = await exam_service_factory(session).grade_submissions(
+                notification_service_factory(session), batch_size=10
+            )
+        assert graded == 0
+    response = await client.get(f"/exams/submissions/{submission_id}", headers=headers)
+    assert response.json()["status"] == "failed"
+
+    monkeypatch.setattr(ResultRepository, "add_results", add_results)
+    response = await client.post(
+        f"/exams/pass-exam/{exam.id}", json=payload, headers=headers
+    )
+    assert response.status_code == 202
+    assert response.json()["id"] == submission_id
+    async with session_maker() as session:
+        graded = await exam_service_factory(session).grade_submissions(
+            notification_service_factory(session), batch_size=10
+        )
+    assert graded == 1
+    response = await client.get(f"/exams/submissions/{submission_id}", headers=headers)
+    assert response.json()["status"] == "graded"
+
+
+@pytest.mark.asyncio
+async def test_submit_exam_from_draft(client: AsyncClient, test_session: AsyncSession):
+    student, exam = await create_exam(test_session, questions=3)
+    headers = await user_authentication_headers(client, student.username, "password123")
+    first, second, third = exam.questions
+    for question, answer in [
+        (first, first.answers[1]),
+        (second, second.answers[0]),
+        (first, first.answers[0]),
+    ]:
+        response = await client.put(
+            f"/exams/{exam.id}/draft",
+            json={"question_id": question.id, "answer_id": answer.id},
+            headers=headers,
+        )
+        assert response.status_code == 204
+    response = await client.put(
+        f"/exams/{exam.id}/draft",
+        json={"question_id": third.id, "answer_id": first.answers[0].id},
+        headers=headers,
+    )
+    assert response.status_code == 404
+
+    response = await client.get(f"/exams/{exam.id}/draft", headers=headers)
+    assert response.json()["choise_questions"] == [
+        {"question_id": first.id, "answer_id": first.answers[0].id},
+        {"question_id": second.id, "answer_id": second.answers[0].id},
+    ]
+
+    response = await client.post(f"/exams/pass-exam/{exam.id}/draft", headers=headers)
+    assert response.status_code == 201
+    assert response.json()["score"] == 3
+    response = await client.get(f"/exams/{exam.id}/draft", headers=headers)
+    assert response.json()["choise_questions"] == []
+
+
+@pytest.mark.asyncio
+async def test_drafts_are_not_kept_in_process_with_redis(monkeypatch):
+    monkeypatch.setattr(settings.cache, "backend", "redis")
+    monkeypatch.setattr(
+        "core.cache.client._redis", Redis.from_url("redis://127.0.0.1:1")
+    )
+    drafts = DraftStore(grace=60, ttl=60, max_size=10)
+    with pytest.raises(HTTPException) as error:
+        await drafts.save(1, 1, "choice:1", "1", time.time() + 60)
+    assert error.value.status_code == 503
+    assert len(drafts._local) == 0
+
+
+@pytest.mark.asyncio
+async def test_exams_ready_to_start_by_id(test_session: AsyncSession):
+    _, exam = await create_exam(test_session, questions=1)
+    exam.is_started = False
+    await test_session.commit()
+    repository = ExamRepository(test_session)
+    assert [e.id for e in await repository.get_exams_ready_to_start([exam.id])] == [
+        exam.id
+    ]
+    assert await repository.get_exams_ready_to_start([exam.id + 1]) == []
+    due = await repository.get_exams_due_before(datetime.now() + timedelta(hours=2))
+    assert exam.id in [e.id for e in due]
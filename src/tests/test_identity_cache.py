@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.users.service import UserService
+from core.auth.cache import IdentityCache
+from core.database.repositories import UserRepository
+from core.factories import UserFactory
+from core.managers.backplane import InMemoryBackplane
+
+
+@pytest.mark.asyncio
+async def test_identity_is_cached_until_it_expires():
+    cache = IdentityCache(max_size=10, ttl=60, backplane=InMemoryBackplane())
+    await cache.set("jti", 1, time.time() + 60)
+    assert await cache.get("jti") == 1
+
+    await cache.set("short", 1, time.time() + 1.5)
+    assert await cache.get("short") == 1
+    await asyncio.sleep(1.6)
+    assert await cache.get("short") is None
+    assert await cache.get("jti") == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_every_process():
+    hub = {}
+    api = IdentityCache(max_size=10, ttl=60, backplane=InMemoryBackplane(hub))
+    worker = IdentityCache(max_size=10, ttl=60, backplane=InMemoryBackplane(hub))
+    await api.set("first", 1, time.time() + 60)
+    await api.set("second", 1, time.time() + 60)
+    await api.set("other", 2, time.time() + 60)
+
+    await worker.invalidate(1)
+
+    assert await api.get("first") is None
+    assert await api.get("second") is None
+    assert await api.get("other") == 2
+
+
+@pytest.mark.asyncio
+async def test_user_update_and_deactivation_invalidate(
+    test_session: AsyncSession, monkeypatch
+):
+    cache = IdentityCache(max_size=10, ttl=60, backplane=InMemoryBackplane())
+    monkeypatch.setattr("api.users.service.identity_cache", cache)
+    UserFactory._meta.sqlalchemy_session = test_session
+    user = UserFactory(first_name="cached", last_name="cached")
+    await test_session.commit()
+    user_service = UserService(UserRepository(test_session))
+
+    await cache.set("jti", user.id, time.time() + 60)
+    user.first_name = "renamed"
+    await user_service.save_user(user)
+    assert await cache.get("jti") is None
+
+    await cache.set("jti", user.id, time.time() + 60)
+    user.is_active = False
+    await user_service.save_user(user)
+    assert await cache.get("jti") is None
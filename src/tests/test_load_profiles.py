@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import test_engine
+from core.database.models import Answer, Exam, Group, Question
+from core.factories import UserFactory
+from tests.conftest import user_authentication_headers
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(
+        test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    yield executed
+    event.remove(
+        test_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+async def create_group(session: AsyncSession, students: int = 5):
+    UserFactory._meta.sqlalchemy_session = session
+    teacher = UserFactory(is_teacher=True, first_name="teacher", last_name="teacher")
+    members = [
+        UserFactory(first_name=f"first{i}", last_name=f"last{i}")
+        for i in range(students)
+    ]
+    group = Group(
+        course=1,
+        facult="math",
+        subgroup=1,
+        methodist=teacher,
+        members=[teacher, *members],
+    )
+    session.add(group)
+    await session.commit()
+    return teacher, members, group
+
+
+@pytest.mark.asyncio
+async def test_get_me_budget(
+    client: AsyncClient, test_session: AsyncSession, statements
+):
+    _, members, _ = await create_group(test_session)
+    headers = await user_authentication_headers(
+        client, members[0].username, "password123"
+    )
+    statements.clear()
+    response = await client.get("/users/get-me", headers=headers)
+    assert response.status_code == 200
+    assert len(statements) <= 4
+
+
+@pytest.mark.asyncio
+async def test_get_group_budget(
+    client: AsyncClient, test_session: AsyncSession, statements
+):
+    _, members, group = await create_group(test_session, students=30)
+    headers = await user_authentication_headers(
+        client, members[0].username, "password123"
+    )
+    statements.clear()
+    response = await client.get(f"/groups/{group.id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["members"]) == 31
+    assert len(statements) <= 4
+
+
+@pytest.mark.asyncio
+async def test_get_my_groups_budget(
+    client: AsyncClient, test_session: AsyncSession, statements
+):
+    teacher, _, _ = await create_group(test_session)
+    test_session.add_all(
+        Group(course=2, facult="math", subgroup=i, methodist=teacher, members=[teacher])
+        for i in range(10)
+    )
+    await test_session.commit()
+    headers = await user_authentication_headers(client, teacher.username, "password123")
+    statements.clear()
+    response = await client.get("/groups/get-my-groups", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 11
+    assert len(statements) <= 4
+
+
+@pytest.mark.asyncio
+async def test_get_exam_budget(
+    client: AsyncClient, test_session: AsyncSession, statements
+):
+    teacher, members, group = await create_group(test_session)
+    now = datetime.now()
+    exam = Exam(
+        title="exam",
+        time=60,
+        author_id=teacher.id,
+        start_time=now,
+        end_time=now + timedelta(hours=1),
+        quantity_questions=20,
+        groups=[group],
+        questions=[
+            Question(
+                text=f"question {i}",
+                order=i,
+                answers=[
+                    Answer(text=f"answer {j}", is_correct=j == 0) for j in range(4)
+                ],
+            )
+            for i in range(20)
+        ],
+    )
+    test_session.add(exam)
+    await test_session.commit()
+    headers = await user_authentication_headers(
+        client, members[0].username, "password123"
+    )
+    statements.clear()
+    response = await client.get(f"/exams/{exam.id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["questions"]) == 20
+    assert len(statements) <= 8
@@ -0,0 +1,87 @@
+import smtplib
+
+from core.tasks.mailer import SMTPPool
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.logins = 0
+        self.sent = []
+        self.fail_next = False
+        self.refused = set()
+        FakeSMTP.instances.append(self)
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def sendmail(self, sender, recipient, message):
+        if self.fail_next:
+            self.fail_next = False
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        if recipient in self.refused:
+            raise smtplib.SMTPRecipientsRefused({recipient: (550, b"No such user")})
+        self.sent.append(recipient)
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_pool(max_messages: int = 3) -> SMTPPool:
+    FakeSMTP.instances = []
+    return SMTPPool(
+        host="localhost",
+        port=25,
+        username="user",
+        password="password",
+        size=1,
+        max_messages=max_messages,
+        idle_timeout=60.0,
+        rate_limit=0,
+        connection_factory=FakeSMTP,
+    )
+
+
+def test_pool_reuses_and_reconnects():
+    pool = create_pool()
+
+    assert pool.send_many((f"user{i}@example.com", "body") for i in range(2)) == 2
+    pool.send("user2@example.com", "body")
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+
+    pool.send("user3@example.com", "body")
+    assert len(FakeSMTP.instances) == 2
+
+    FakeSMTP.instances[1].fail_next = True
+    pool.send("user4@example.com", "body")
+    assert len(FakeSMTP.instances) == 3
+    assert FakeSMTP.instances[2].sent == ["user4@example.com"]
+    assert pool.stats() == {
+        "idle": 1,
+        "connects": 3,
+        "sent": 5,
+        "failed": 0,
+        "retries": 1,
+    }
+    pool.close()
+
+
+def test_refused_recipient_does_not_stop_the_batch():
+    pool = create_pool(max_messages=10)
+    pool.send("first@example.com", "body")
+    FakeSMTP.instances[0].refused.add("missing@example.com")
+
+    recipients = ["second@example.com", "missing@example.com", "third@example.com"]
+    assert pool.send_many((recipient, "body") for recipient in recipients) == 2
+    assert FakeSMTP.instances[0].sent == [
+        "first@example.com",
+        "second@example.com",
+        "third@example.com",
+    ]
+    assert pool.stats()["failed"] == 1
+    pool.close()
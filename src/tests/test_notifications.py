@@ -0,0 +1,282 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.testclient import TestClient
+
+from api.notifications.schemas import encode_cursor
+from api.users.utils import create_access_token
+from app import app
+from core.database.models import Notification, User, group_members
+from core.database.repositories import NotificationRepository
+from core.factories import UserFactory
+from core.tasks.audience_tasks import (
+    load_chat_digest,
+    load_chat_digest_recipients,
+    stamp_chat_digest,
+)
+from tests.conftest import user_authentication_headers
+from tests.test_load_profiles import create_group
+
+
+@pytest.mark.asyncio
+async def test_create_notifications_for_audience(test_session: AsyncSession):
+    teacher, members, group = await create_group(test_session, students=4)
+    sender = members[0]
+    repository = NotificationRepository(test_session)
+
+    created = await repository.create_for_audience(
+        title="Новое сообщение в группе!",
+        body=literal("Привет ") + User.username,
+        audience=repository.audience(
+            group_members.c.group_id,
+            [group.id],
+            exclude_user_id=sender.id,
+            students_only=True,
+        ),
+    )
+
+    notifications = (
+        await test_session.execute(select(Notification.user_id, Notification.body))
+    ).all()
+    assert len(created) == len(notifications) == 3
+    assert {user_id for user_id, _ in notifications} == {m.id for m in members[1:]}
+    assert {body for _, body in notifications} == {
+        f"Привет {m.username}" for m in members[1:]
+    }
+    assert await test_session.scalar(select(func.count(Notification.id))) == 3
+
+    members[1].ignore_messages = True
+    await test_session.commit()
+    emailed = await test_session.scalars(
+        repository.audience(
+            group_members.c.group_id,
+            [group.id],
+            exclude_user_id=sender.id,
+            students_only=True,
+            skip_ignoring=True,
+        )
+    )
+    assert set(emailed) == {m.id for m in members[2:]}
+
+
+@pytest.mark.asyncio
+async def test_chat_notifications_are_coalesced(test_session: AsyncSession):
+    teacher, members, group = await create_group(test_session, students=3)
+    repository = NotificationRepository(test_session)
+    audience = repository.audience(
+        group_members.c.group_id, [group.id], exclude_user_id=members[0].id
+    )
+
+    for message_id in (1, 2, 3):
+        await repository.upsert_for_audience(
+            conversation=f"group:{group.id}",
+            title="Новое сообщение в группе!",
+            body=f"message {message_id}",
+            last_message_id=message_id,
+            audience=audience,
+        )
+    notifications = (await test_session.scalars(select(Notification))).all()
+    assert len(notifications) == 3
+    assert {n.message_count for n in notifications} == {3}
+    assert {n.last_message_id for n in notifications} == {3}
+
+    await repository.get_unreads(members[1])
+    await repository.upsert_for_audience(
+        conversation=f"group:{group.id}",
+        title="Новое сообщение в группе!",
+        body="message 4",
+        last_message_id=4,
+        audience=audience,
+    )
+    unread = (
+        await test_session.execute(
+            select(Notification.user_id, Notification.message_count).where(
+                Notification.is_read.is_(False)
+            )
+        )
+    ).all()
+    assert sorted(unread) == sorted(
+        [(teacher.id, 4), (members[1].id, 1), (members[2].id, 4)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_notification_websocket_resumes_from_cursor(test_session: AsyncSession):
+    UserFactory._meta.sqlalchemy_session = test_session
+    user = UserFactory(first_name="reader", last_name="reader")
+    await test_session.commit()
+    repository = NotificationRepository(test_session)
+    first = await repository.create_notification("first", "body", user)
+    await repository.create_notification("second", "body", user)
+    await test_session.execute(
+        update(Notification)
+        .where(Notification.id == first.id)
+        .values(updated_at=datetime.now() - timedelta(minutes=1))
+    )
+    await test_session.commit()
+    token = create_access_token(user.username, user.id, timedelta(minutes=5))
+
+    with TestClient(app) as client:
+        url = f"/api/v1/notifications/ws?token={token}"
+        with client.websocket_connect(url) as websocket:
+            first = websocket.receive_json()
+            second = websocket.receive_json()
+        assert [first["title"], second["title"]] == ["first", "second"]
+
+        with client.websocket_connect(f"{url}&cursor={first['cursor']}") as websocket:
+            assert websocket.receive_json()["id"] == second["id"]
+
+
+@pytest.mark.asyncio
+async def test_inbox_pages_and_marks_read_up_to_cursor(test_session: AsyncSession):
+    UserFactory._meta.sqlalchemy_session = test_session
+    user = UserFactory(first_name="reader", last_name="reader")
+    await test_session.commit()
+    repository = NotificationRepository(test_session)
+    created = [
+        await repository.create_notification(f"title {i}", "body", user)
+        for i in range(5)
+    ]
+    for i, notification in enumerate(created):
+        await test_session.execute(
+            update(Notification)
+            .where(Notification.id == notification.id)
+            .values(updated_at=datetime(2026, 1, 1) + timedelta(minutes=i))
+        )
+    await test_session.commit()
+
+    first_page = await repository.get_page(user.id, None, 2)
+    assert [n.title for n in first_page] == ["title 4", "title 3"]
+    last = first_page[-1]
+    second_page = await repository.get_page(user.id, (last.updated_at, last.id), 2)
+    assert [n.title for n in second_page] == ["title 2", "title 1"]
+    assert await repository.count_unread(user.id) == 5
+
+    marked = await repository.mark_read(user.id, (last.updated_at, last.id))
+    assert sorted(marked) == [n.id for n in created[:4]]
+    assert await repository.count_unread(user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_inbox_keeps_conversations_coalesced_after_the_cursor_unread(
+    client: AsyncClient, test_session: AsyncSession
+):
+    teacher, members, group = await create_group(test_session, students=1)
+    reader = members[0]
+    repository = NotificationRepository(test_session)
+    conversation = f"group:{group.id}"
+    audience = repository.audience(
+        group_members.c.group_id, [group.id], exclude_user_id=teacher.id
+    )
+    chat = (
+        await repository.upsert_for_audience(
+            conversation, "Новое сообщение в группе!", "message 1", 1, audience
+        )
+    )[0]
+    exam = await repository.create_notification("Новый тест!", "body", reader)
+    for notification, minutes in ((chat, 2), (exam, 1)):
+        await test_session.execute(
+            update(Notification)
+            .where(Notification.id == notification.id)
+            .values(updated_at=datetime.now() - timedelta(minutes=minutes))
+        )
+    await test_session.commit()
+    headers = await user_authentication_headers(client, reader.username, "password123")
+
+    response = await client.get("/notifications/inbox", headers=headers)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [exam.id, chat.id]
+    cursor = encode_cursor(datetime.fromisoformat(items[0]["updated_at"]), exam.id)
+
+    await repository.upsert_for_audience(
+        conversation, "Новое сообщение в группе!", "message 2", 2, audience
+    )
+    response = await client.post(
+        "/notifications/mark-read", params={"cursor": cursor}, headers=headers
+    )
+    assert response.json()["marked"] == [exam.id]
+
+    response = await client.get("/notifications/inbox", headers=headers)
+    first = response.json()["items"][0]
+    assert first["id"] == chat.id
+    assert (first["is_read"], first["message_count"]) == (False, 2)
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_only_old_read_notifications(test_session: AsyncSession):
+    UserFactory._meta.sqlalchemy_session = test_session
+    user = UserFactory(first_name="purged", last_name="purged")
+    await test_session.commit()
+    repository = NotificationRepository(test_session)
+    cutoff = datetime(2026, 1, 1)
+    kept = []
+    for title, age, is_read in (
+        ("old read", -2, True),
+        ("old unread", -2, False),
+        ("also old read", -1, True),
+        ("new read", 1, True),
+    ):
+        notification = await repository.create_notification(title, "body", user)
+        await test_session.execute(
+            update(Notification)
+            .where(Notification.id == notification.id)
+            .values(created_at=cutoff + timedelta(days=age), is_read=is_read)
+        )
+        if title in ("old unread", "new read"):
+            kept.append(notification.id)
+    await test_session.commit()
+
+    position, purged = None, 0
+    while True:
+        position, deleted = await repository.purge_read(cutoff, position, 1)
+        purged += deleted
+        if position is None:
+            break
+
+    assert purged == 2
+    remaining = await test_session.scalars(
+        select(Notification.id).where(Notification.user_id == user.id)
+    )
+    assert sorted(remaining) == kept
+    stats = await repository.stats()
+    assert stats["rows"] >= 2 and stats["size_bytes"] is None
+
+
+@pytest.mark.asyncio
+async def test_chat_digest_is_stamped_only_after_sending(
+    test_session: AsyncSession, monkeypatch
+):
+    @asynccontextmanager
+    async def get_session():
+        yield test_session
+
+    monkeypatch.setattr("core.tasks.audience_tasks.get_session", get_session)
+    teacher, members, group = await create_group(test_session, students=2)
+    repository = NotificationRepository(test_session)
+    conversation = f"group:{group.id}"
+    await repository.upsert_for_audience(
+        conversation=conversation,
+        title="Новое сообщение в группе!",
+        body="message 1",
+        last_message_id=1,
+        audience=repository.audience(
+            group_members.c.group_id, [group.id], exclude_user_id=teacher.id
+        ),
+    )
+    await test_session.execute(
+        update(Notification).values(updated_at=datetime.now() - timedelta(minutes=1))
+    )
+    await test_session.commit()
+
+    emailed_at, notification_ids = await load_chat_digest(conversation)
+    recipients = await load_chat_digest_recipients(notification_ids)
+    assert {r["username"] for r in recipients} == {m.username for m in members}
+    assert (await load_chat_digest(conversation))[1] == notification_ids
+
+    await stamp_chat_digest(notification_ids, datetime.fromisoformat(emailed_at))
+    assert (await load_chat_digest(conversation))[1] == []
@@ -2,6 +2,7 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.auth.hashing import hashing_pool
 from core.factories import UserFactory
 from tests.conftest import user_authentication_headers
 
@@ -58,6 +59,24 @@ async def test_login_user(client: AsyncClient, test_session: AsyncSession):
     assert "refresh_token" in data
 
 
+@pytest.mark.asyncio
+async def test_login_user_when_hashing_pool_is_saturated(
+    client: AsyncClient, test_session: AsyncSession, monkeypatch
+):
+    UserFactory._meta.sqlalchemy_session = test_session
+    user = UserFactory(username="busylogin", is_active=True)
+    test_session.add(user)
+    await test_session.commit()
+
+    monkeypatch.setattr(hashing_pool, "max_pending", 0)
+    response = await client.post(
+        "/users/login",
+        json={"username": "busylogin", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
 @pytest.mark.asyncio
 async def test_update_user(client: AsyncClient, test_session: AsyncSession):
     UserFactory._meta.sqlalchemy_session = test_session
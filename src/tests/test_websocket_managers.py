@@ -0,0 +1,194 @@
+import asyncio
+import json
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core.managers.backplane import InMemoryBackplane, RedisBackplane
+from core.managers.connection import DISCONNECT, DROP_OLDEST
+from core.managers.group_websocket_manager import GroupConnectionManager
+from core.managers.read_receipts import ReadReceiptBuffer
+
+
+class FakeWebSocket:
+    def __init__(self, stalled: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not stalled:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        await self.unblocked.wait()
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int):
+        self.closed_with = code
+
+
+async def flush():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def shutdown(*managers: GroupConnectionManager):
+    for manager in managers:
+        await manager.close()
+    await flush()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_node():
+    hub = {}
+    node_a = GroupConnectionManager(InMemoryBackplane(hub))
+    node_b = GroupConnectionManager(InMemoryBackplane(hub))
+    sender, local_member, remote_member = (
+        FakeWebSocket(),
+        FakeWebSocket(),
+        FakeWebSocket(),
+    )
+    await node_a.connect(1, "sender", sender)
+    await node_a.connect(1, "local", local_member)
+    await node_b.connect(1, "remote", remote_member)
+
+    await node_a.broadcast(1, {"text": "hello"}, exclude="sender")
+    await flush()
+
+    assert sender.sent == []
+    assert local_member.sent == [{"text": "hello"}]
+    assert remote_member.sent == [{"text": "hello"}]
+    await shutdown(node_a, node_b)
+
+
+@pytest.mark.asyncio
+async def test_last_disconnect_unsubscribes_node():
+    hub = {}
+    node_a = GroupConnectionManager(InMemoryBackplane(hub))
+    node_b = GroupConnectionManager(InMemoryBackplane(hub))
+    websocket = FakeWebSocket()
+    await node_a.connect(1, "student", websocket)
+    await node_b.connect(1, "teacher", FakeWebSocket())
+
+    await node_a.disconnect(1, "student")
+    await node_b.notify_deletion(1, 42)
+    await flush()
+
+    assert websocket.sent == []
+    assert list(hub) == ["ws:group:1"]
+    assert len(hub["ws:group:1"]) == 1
+    await shutdown(node_a, node_b)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_does_not_stall_group():
+    manager = GroupConnectionManager(
+        InMemoryBackplane(), max_queue=2, policy=DROP_OLDEST
+    )
+    slow, fast = FakeWebSocket(stalled=True), FakeWebSocket()
+    await manager.connect(1, "slow", slow)
+    await manager.connect(1, "fast", fast)
+
+    for i in range(5):
+        await manager.broadcast(1, {"id": i})
+        await flush()
+
+    assert fast.sent == [{"id": i} for i in range(5)]
+    assert manager.stats()["dropped"] == 2
+    slow.unblocked.set()
+    await flush()
+    assert slow.sent == [{"id": 0}, {"id": 3}, {"id": 4}]
+    await shutdown(manager)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected():
+    manager = GroupConnectionManager(
+        InMemoryBackplane(), max_queue=1, policy=DISCONNECT
+    )
+    slow = FakeWebSocket(stalled=True)
+    await manager.connect(1, "slow", slow)
+    await manager.connect(1, "fast", FakeWebSocket())
+
+    for i in range(3):
+        await manager.broadcast(1, {"id": i})
+        await flush()
+
+    assert slow.closed_with == 1013
+    assert list(manager.active_connections[1]) == ["fast"]
+    assert manager.stats()["disconnected"] == 1
+    await shutdown(manager)
+
+
+@pytest.mark.asyncio
+async def test_read_receipts_are_coalesced_per_window():
+    batches = []
+
+    async def write(message_ids):
+        batches.append(sorted(message_ids))
+
+    receipts = ReadReceiptBuffer(write, window=0.05)
+    receipts.add([1, 2])
+    receipts.add([2, 3])
+    await asyncio.sleep(0.1)
+    assert batches == [[1, 2, 3]]
+
+    receipts.add([4])
+    await receipts.close()
+    assert batches == [[1, 2, 3], [4]]
+
+
+class FakePubSub:
+    def __init__(self, fail: bool, messages: list):
+        self.fail = fail
+        self.messages = messages
+        self.channels = {}
+
+    async def subscribe(self, *channels):
+        if self.fail:
+            raise RedisConnectionError("connection refused")
+        self.channels.update(dict.fromkeys(channel.encode() for channel in channels))
+
+    async def get_message(self, timeout):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.sleep(0.01)
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, *pubsubs: FakePubSub):
+        self.pubsubs = list(pubsubs)
+
+    def pubsub(self, ignore_subscribe_messages):
+        return self.pubsubs.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_resubscribes_and_survives_bad_messages():
+    backplane = RedisBackplane("redis://127.0.0.1:1")
+    backplane.min_retry_delay = 0.01
+    messages = [
+        {"type": "message", "channel": b"events", "data": b"not json"},
+        {"type": "message", "channel": b"events", "data": b'{"id": 1}'},
+    ]
+    backplane._redis = FakeRedis(
+        FakePubSub(fail=True, messages=[]), FakePubSub(fail=False, messages=messages)
+    )
+    received = []
+
+    async def handler(payload):
+        received.append(payload)
+
+    await backplane.subscribe("events", handler)
+    for _ in range(100):
+        if received:
+            break
+        await asyncio.sleep(0.01)
+    assert received == [{"id": 1}]
+    assert not backplane._reader.done()
+    backplane._reader.cancel()